@@ -0,0 +1,72 @@
+"""Time auto-linking of docstrings with ``matlab_auto_link = "all"``.
+
+Links the same docstrings with :meth:`MatAutoLinker.link_line`, which looks
+up all names in a single pass per line, and with
+:meth:`MatAutoLinker.link_line_sequential`, which substitutes one name after
+the other as was done before. The classes and functions are made up, no MATLAB
+files are parsed.
+
+Usage::
+
+    python benchmarks/bench_auto_link.py [--entities 8000] [--lines 200]
+"""
+
+import argparse
+import random
+import time
+
+from sphinxcontrib.mat_auto_link import MatAutoLinker
+from sphinxcontrib.mat_types import MatSymbol
+
+
+class Entity:
+    def __init__(self, role, members):
+        self.role = role
+        self.property_names = members
+        self.method_names = []
+
+    def ref_role(self):
+        return self.role
+
+
+def make_symbols(entities):
+    symbols = []
+    for i in range(entities):
+        role = "class" if i % 4 == 0 else "func"
+        members = [f"prop{j}" for j in range(5)] if role == "class" else []
+        symbols.append(MatSymbol(f"+pkg{i % 50}.Name{i}", Entity(role, members)))
+    return symbols
+
+
+def make_lines(symbols, lines):
+    rng = random.Random(0)
+    words = "the of value returns see also and with a an".split()
+    docstring = []
+    for _ in range(lines):
+        line = [rng.choice(words) for _ in range(8)]
+        line.insert(rng.randrange(8), rng.choice(symbols).target)
+        docstring.append(" ".join(line))
+    return docstring
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=8000)
+    parser.add_argument("--lines", type=int, default=200)
+    args = parser.parse_args()
+
+    symbols = make_symbols(args.entities)
+    lines = make_lines(symbols, args.lines)
+    linker = MatAutoLinker(symbols)
+    for label, link_line in [
+        ("sequential", linker.link_line_sequential),
+        ("single-pass", linker.link_line),
+    ]:
+        start = time.perf_counter()
+        linked = [link_line(line) for line in lines]
+        elapsed = time.perf_counter() - start
+        print(f"{label:12} {len(linked)} lines, {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Count the ``stat`` calls made while crawling a MATLAB source tree.
+
+Compares the crawler used by :meth:`MatModule.safe_getmembers` with the
+previous one based on ``os.listdir`` and ``os.path.isdir``/``isfile``. Only
+calls made through :func:`os.stat` are counted, the types that
+:func:`os.scandir` returns from the folder listing are free on most
+platforms.
+
+Usage::
+
+    python benchmarks/bench_crawl.py [--packages 50] [--files 40]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from unittest import mock
+
+from sphinxcontrib.mat_types import find_source_files
+
+
+def make_tree(basedir, packages, files):
+    for i in range(packages):
+        package = os.path.join(basedir, f"+pkg{i}")
+        os.makedirs(os.path.join(package, f"@Class{i}"))
+        for j in range(files):
+            with open(os.path.join(package, f"func{j}.m"), "w") as f:
+                f.write(f"function func{j}\nend\n")
+        with open(os.path.join(package, f"@Class{i}", f"Class{i}.m"), "w") as f:
+            f.write(f"classdef Class{i}\nend\n")
+        with open(os.path.join(package, "notes.txt"), "w") as f:
+            f.write("not MATLAB\n")
+
+
+def listdir_crawl(basedir):
+    # The crawler before `scan_folder`: classify each entry of the listing,
+    # then look it up again in `MatObject.matlabify`.
+    files = []
+    folders = [basedir]
+    while folders:
+        folder = folders.pop()
+        for key in os.listdir(folder):
+            path = os.path.join(folder, key)
+            if os.path.isdir(path) and key.startswith((".", "_")):
+                continue
+            if os.path.isfile(path) and not key.endswith((".m", ".mlapp")):
+                continue
+            if os.path.isfile(path):
+                key, _ = os.path.splitext(key)
+            fullpath = os.path.join(folder, key)
+            if os.path.isdir(fullpath):
+                folders.append(fullpath)
+            elif os.path.isfile(f"{fullpath}.m"):
+                files.append(f"{fullpath}.m")
+            elif os.path.isfile(f"{fullpath}.mlapp"):
+                files.append(f"{fullpath}.mlapp")
+    return files
+
+
+def count_stats(crawl, basedir):
+    calls = 0
+    stat = os.stat
+
+    def counting_stat(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return stat(*args, **kwargs)
+
+    with mock.patch("os.stat", counting_stat):
+        start = time.perf_counter()
+        files = crawl(basedir)
+        elapsed = time.perf_counter() - start
+    return len(files), calls, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=50)
+    parser.add_argument("--files", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as basedir:
+        make_tree(basedir, args.packages, args.files)
+        for label, crawl in [
+            ("listdir", listdir_crawl),
+            ("scandir", find_source_files),
+        ]:
+            nfiles, calls, elapsed = count_stats(crawl, basedir)
+            print(
+                f"{label:8} {nfiles} files, {calls} stat calls "
+                f"({calls / nfiles:.2f} per file), {elapsed * 1000:.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Time importing the extension and the work deferred to the first parse.
+
+Imports ``sphinxcontrib.matlab`` in fresh interpreters with ``-X importtime``
+and reports the median import time of the extension and of its slowest
+modules. The tree-sitter queries, the ``Language`` and the ``Parser`` are
+created when the first MATLAB file is parsed, the time that takes is reported
+separately. With ``--max-ms`` the script fails if the median import time is
+above the given budget, e.g. to guard the startup cost in CI.
+
+Usage::
+
+    python benchmarks/bench_import.py [--runs 7] [--max-ms 0]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+EXTENSION = "sphinxcontrib.matlab"
+
+
+def import_times():
+    # Return the cumulative import time of each module in microseconds.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {EXTENSION}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, cumulative_us, name = (
+            part.strip() for part in line.replace(":", "|", 1).split("|")
+        )
+        if self_us.isdigit():
+            times[name] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def first_parse():
+    # Time creating the parser and compiling the queries, as done on the
+    # first parse.
+    from sphinxcontrib import mat_tree_sitter_parser
+    from sphinxcontrib.mat_tree_sitter_parser import LazyQuery, get_parser
+
+    queries = [
+        query
+        for query in vars(mat_tree_sitter_parser).values()
+        if isinstance(query, LazyQuery)
+    ]
+    start = time.perf_counter()
+    get_parser()
+    for query in queries:
+        query.compile()
+    setup = time.perf_counter() - start
+    return len(queries), setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--max-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    total = statistics.median(times[EXTENSION][1] for times in runs) / 1000
+    modules = sorted(
+        (
+            (statistics.median(times[name][0] for times in runs) / 1000, name)
+            for name in runs[0]
+            if name.startswith("sphinxcontrib.")
+        ),
+        reverse=True,
+    )
+    print(f"import {EXTENSION}: {total:.1f} ms (median of {args.runs} runs)")
+    for self_ms, name in modules[:5]:
+        print(f"  {name:40} {self_ms:6.1f} ms")
+
+    nqueries, setup = first_parse()
+    print(f"first parse: parser and {nqueries} queries in {setup * 1000:.1f} ms")
+
+    if args.max_ms and total > args.max_ms:
+        sys.exit(f"import time {total:.1f} ms is above {args.max_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
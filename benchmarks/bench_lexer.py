@@ -0,0 +1,45 @@
+"""Time highlighting MATLAB code with the regex and tree-sitter lexers.
+
+Lexes the MATLAB files of the tests with :class:`MatlabLexer`, which tries one
+regular expression after the other at each position, and with
+:class:`TreeSitterMatlabLexer`, which makes the same tokens from a tree-sitter
+parse, and reports the throughput in lines per second.
+
+Usage::
+
+    python benchmarks/bench_lexer.py [--repeat 20] [folder]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from sphinxcontrib.mat_lexer import MatlabLexer
+from sphinxcontrib.mat_tree_sitter_lexer import TreeSitterMatlabLexer
+
+TEST_DATA = Path(__file__).parent.parent / "tests" / "test_data"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folder", nargs="?", type=Path, default=TEST_DATA)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sources = [
+        path.read_text(encoding="utf-8", errors="replace")
+        for path in sorted(args.folder.rglob("*.m"))
+    ]
+    lines = sum(source.count("\n") + 1 for source in sources) * args.repeat
+    for lexer in [MatlabLexer(), TreeSitterMatlabLexer()]:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for source in sources:
+                for _ in lexer.get_tokens(source):
+                    pass
+        elapsed = time.perf_counter() - start
+        print(f"{lexer.name:22} {lines} lines, {lines / elapsed:,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
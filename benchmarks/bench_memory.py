@@ -0,0 +1,91 @@
+"""Measure the memory used by the parsed details of MATLAB classes.
+
+Parses a generated corpus of classes with many properties, keeps all of them
+in memory like a Sphinx build does, and reports the peak RSS and the memory
+held by the model. The ``dicts`` model converts the property records back to
+the dictionaries, with one attribute dictionary per property, used before
+:class:`~sphinxcontrib.mat_tree_sitter_parser.MatRecord`. Each model is
+measured in its own process.
+
+Usage::
+
+    python benchmarks/bench_memory.py [--classes 2000] [--properties 30]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from sphinxcontrib.mat_types import MatObject
+
+ATTRIBUTES = ["", "(Access = private)", "(SetAccess = protected)", "(Constant)"]
+
+
+def make_corpus(basedir, classes, properties):
+    for i in range(classes):
+        lines = [f"classdef Class{i} < handle", f"    % Class number {i}"]
+        for j in range(properties):
+            if j % 10 == 0:
+                if j:
+                    lines.append("    end")
+                lines.append(f"    properties {ATTRIBUTES[j // 10 % len(ATTRIBUTES)]}")
+            lines.append(f"        prop{j} (1,1) double = {j} % Property {j}")
+        lines += ["    end", "end", ""]
+        with open(os.path.join(basedir, f"Class{i}.m"), "w") as f:
+            f.write("\n".join(lines))
+
+
+def as_dicts(cls):
+    # The model before the records: a dictionary per property and a copy of
+    # the attribute dictionary of its section.
+    cls.properties = {
+        name: {key: value for key, value in record.items()}
+        | {"attrs": dict(record.attrs)}
+        for name, record in cls.properties.items()
+    }
+
+
+def measure(basedir, model):
+    tracemalloc.start()
+    objects = []
+    for filename in sorted(os.listdir(basedir)):
+        name, _ = os.path.splitext(filename)
+        cls = MatObject.parse_mfile(os.path.join(basedir, filename), name, "corpus")
+        cls.properties  # noqa: B018 - parse the details
+        if model == "dicts":
+            as_dicts(cls)
+        objects.append(cls)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{model:8} {len(objects)} classes, model {current / 2**20:.1f} MiB, ", end="")
+    print(f"peak RSS {maxrss / 1024:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classes", type=int, default=2000)
+    parser.add_argument("--properties", type=int, default=30)
+    parser.add_argument("--measure", metavar="DIR", help=argparse.SUPPRESS)
+    parser.add_argument("--model", default="records", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.model)
+        return
+
+    with tempfile.TemporaryDirectory() as basedir:
+        make_corpus(basedir, args.classes, args.properties)
+        for model in ["dicts", "records"]:
+            subprocess.run(
+                [sys.executable, __file__, "--measure", basedir, "--model", model],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Time the analysis of a large MATLAB source tree with and without tracing.
+
+Runs the analysis done when the builder is initialized, see
+:func:`sphinxcontrib.mat_types.analyze`, with tracing disabled (the default),
+with the debug messages made but not shown as all builds did before they were
+guarded by :attr:`MatTracer.enabled`, with the debug messages shown (``-vv``)
+and with the events written to a ``matlab_trace`` file. The entities of the
+files are reused from the environment of a first build, so the time is spent
+in crawling the tree and assembling the hierarchy, not in parsing.
+
+Usage::
+
+    python benchmarks/bench_trace.py [--packages 50] [--files 40] [--repeat 3]
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+from unittest import mock
+
+from sphinx.application import Sphinx
+
+from sphinxcontrib import mat_trace
+
+
+def make_tree(basedir, packages, files):
+    for i in range(packages):
+        package = os.path.join(basedir, f"+pkg{i}")
+        os.makedirs(os.path.join(package, f"@Class{i}"))
+        for j in range(files):
+            with open(os.path.join(package, f"func{j}.m"), "w") as f:
+                f.write(f"function func{j}\nend\n")
+        with open(os.path.join(package, f"@Class{i}", f"Class{i}.m"), "w") as f:
+            f.write(f"classdef Class{i}\nend\n")
+
+
+def make_project(basedir, packages, files):
+    srcdir = os.path.join(basedir, "docs")
+    os.makedirs(srcdir)
+    make_tree(os.path.join(basedir, "src"), packages, files)
+    with open(os.path.join(srcdir, "conf.py"), "w") as f:
+        f.write(
+            'extensions = ["sphinxcontrib.matlab"]\n'
+            'matlab_src_dir = "../src"\n'
+            "matlab_parse_workers = 1\n"
+        )
+    with open(os.path.join(srcdir, "index.rst"), "w") as f:
+        f.write("Index\n=====\n")
+    return srcdir
+
+
+def make_app(srcdir, builddir, verbosity=0, **confoverrides):
+    return Sphinx(
+        srcdir,
+        srcdir,
+        os.path.join(builddir, "out"),
+        os.path.join(builddir, "doctrees"),
+        "dummy",
+        confoverrides=confoverrides,
+        status=io.StringIO(),
+        warning=io.StringIO(),
+        verbosity=verbosity,
+    )
+
+
+def analyze(srcdir, builddir, verbosity=0, **confoverrides):
+    # The analysis runs when the builder is initialized.
+    start = time.perf_counter()
+    make_app(srcdir, builddir, verbosity, **confoverrides)
+    elapsed = time.perf_counter() - start
+    mat_trace.tracer.close()
+    return elapsed
+
+
+def messages_not_shown(app):
+    # Make the debug messages although Sphinx does not show them.
+    mat_trace.tracer.reset(debug=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=50)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as basedir:
+        srcdir = make_project(basedir, args.packages, args.files)
+        builddir = os.path.join(basedir, "build")
+        trace = os.path.join(basedir, "trace.jsonl")
+        nfiles = args.packages * (args.files + 1)
+        # Store the entities in the environment.
+        make_app(srcdir, builddir).build()
+        for label, verbosity, confoverrides, setup_trace in [
+            ("disabled", 0, {}, mat_trace.setup_trace),
+            ("not shown", 0, {}, messages_not_shown),
+            ("-vv", 2, {}, mat_trace.setup_trace),
+            ("trace file", 0, {"matlab_trace": trace}, mat_trace.setup_trace),
+        ]:
+            with mock.patch.object(mat_trace, "setup_trace", setup_trace):
+                elapsed = min(
+                    analyze(srcdir, builddir, verbosity, **confoverrides)
+                    for _ in range(args.repeat)
+                )
+            print(
+                f"{label:10} {nfiles} files in {elapsed * 1000:.0f} ms "
+                f"({elapsed / nfiles * 1e6:.0f} us per file)"
+            )
+
+
+if __name__ == "__main__":
+    main()
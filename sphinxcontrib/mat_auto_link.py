@@ -0,0 +1,369 @@
+"""sphinxcontrib.mat_auto_link.
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Auto-linking of MATLAB names in docstrings, for ``matlab_auto_link = "all"``.
+
+:copyright: Copyright by the sphinxcontrib-matlabdomain team, see AUTHORS.
+:license: BSD, see LICENSE for details.
+"""
+
+import re
+
+from .mat_cache import content_key, package_version
+from .mat_profile import profiler
+from .mat_types import symbol_table
+
+__all__ = [
+    "LinkedDocstringCache",
+    "MatAutoLinker",
+    "MatMemberLinker",
+    "get_auto_linker",
+    "get_member_linker",
+    "linked_docstrings",
+]
+
+# negative look-behind for ` . + < @ * <non-breaking space>
+LOOK_BEHIND = r"(?<!(`|\.|\+|<|@|\*|\xa0))\b"
+# negative look-ahead for ` * or <non-breaking space> or
+# " Properties:" or " Methods:" or .<alphanum>
+LOOK_AHEAD = r"\b(?!(`|\*|\xa0|\sProperties:|\sMethods:|\.\w))"
+LOOK_AHEAD2 = r"\b(?!(`|\*|\xa0|\sProperties:|\sMethods:))"
+
+# Names that could be linked inside the roles inserted for other names, e.g. a
+# function ``class`` in ":class:`Foo`".
+ROLE_NAMES = ("attr", "class", "func", "meth")
+# Names that change LOOK_AHEAD of other names once linked.
+SECTION_NAMES = ("Methods", "Properties")
+
+
+class MatAutoLinker:
+    """Link the classes and functions of :attr:`MatSymbolTable.link_symbols`.
+
+    :param symbols: :class:`MatSymbol` of the classes and functions.
+    :type symbols: list
+
+    Each line is searched once for dotted names, and each prefix of a dotted
+    name is looked up in a dictionary of the link targets. The result is the
+    same as substituting the names one after the other, in the order of
+    *symbols*, as was done before: a name followed by ``.member`` of a class
+    is linked to the member, and the first match in a line decides the member
+    for all matches of the class in the line. Lines with names that do not fit
+    this scheme, e.g. names of class folders in ``matlab_src_dir`` itself, are
+    linked one name after the other.
+    """
+
+    #: dotted name, preceded by none of the characters of LOOK_BEHIND
+    name_re = re.compile(r"(?<![\w`.+<@*\xa0])\w+(?:\.@?\w+)*")
+    look_ahead_re = re.compile(LOOK_AHEAD)
+    #: ``.member`` of a class
+    member_re = re.compile(r"\.(\w+)" + LOOK_AHEAD2)
+
+    def __init__(self, symbols):
+        self.symbols = list(symbols)
+        #: link targets to indexes in :attr:`symbols`
+        self.targets = {}
+        #: targets that need linking one name after the other
+        self.irregular_targets = []
+        #: link all lines one name after the other
+        self.sequential = False
+        #: ``symbol_table.generation`` the linker was built for
+        self.generation = None
+        self._patterns = {}
+
+        dotted_name_re = re.compile(r"\w+(?:\.@?\w+)*")
+        for index, symbol in enumerate(self.symbols):
+            target = symbol.target
+            if target in ROLE_NAMES:
+                self.sequential = True
+            elif target in SECTION_NAMES or not dotted_name_re.fullmatch(target):
+                self.irregular_targets.append(target)
+            else:
+                self.targets.setdefault(target, []).append(index)
+
+    def link_line(self, line):
+        """Return *line* with the names of classes and functions linked."""
+        if self.sequential or any(t in line for t in self.irregular_targets):
+            return self.link_line_sequential(line)
+
+        # indexes of symbols to (start, end, member) of their matches
+        candidates = {}
+        for match in self.name_re.finditer(line):
+            start = match.start()
+            name = match.group()
+            ends = [start + i for i, c in enumerate(name) if c == "."]
+            ends.append(match.end())
+            for end in ends:
+                indexes = self.targets.get(line[start:end])
+                if indexes is None:
+                    continue
+                for index in indexes:
+                    if self.look_ahead_re.match(line, end):
+                        candidates.setdefault(index, []).append((start, end, None))
+                    elif self.symbols[index].role == "class":
+                        if member := self.member_re.match(line, end):
+                            candidates.setdefault(index, []).append(
+                                (start, member.end(), member.group(1))
+                            )
+        if not candidates:
+            return line
+
+        # starts of the matches to (end, text) of their links
+        links = {}
+        for index in sorted(candidates):
+            symbol = self.symbols[index]
+            target = symbol.target
+            matches = [m for m in candidates[index] if m[0] not in links]
+            members = []
+            for start, end, member in matches:
+                if member is None:
+                    links[start] = (end, f":{symbol.role}:`{target}`")
+                else:
+                    members.append((start, end))
+            if not members:
+                continue
+            member = next(m[2] for m in matches if m[2] is not None)
+            if member in symbol.entity.property_names:
+                role = "attr"
+            elif member in symbol.entity.method_names:
+                role = "meth"
+            else:
+                continue
+            for start, end in members:
+                links[start] = (end, f":{role}:`{target}.{member}`")
+
+        if profiler.enabled:
+            profiler.count("auto_link.substitutions", len(links))
+        parts = []
+        pos = 0
+        for start in sorted(links):
+            end, text = links[start]
+            parts.append(line[pos:start])
+            parts.append(text)
+            pos = end
+        parts.append(line[pos:])
+        return "".join(parts)
+
+    def link_line_sequential(self, line):
+        """Return *line* with the names linked one name after the other."""
+        substitutions = 0
+        for index, symbol in enumerate(self.symbols):
+            p, p2 = self._get_patterns(index)
+            nn = symbol.target
+            line, count = p.subn(f":{symbol.role}:`{nn}`", line)
+            substitutions += count
+            if p2 is not None and (match := p2.search(line)):
+                # if match.group(2) is a property -> :attr:`{nn}.{match.group(2)}`
+                # if match.group(2) is a method -> :meth:`{nn}.{match.group(2)}`
+                member = match.group(2)
+                if member in symbol.entity.property_names:
+                    line, count = p2.subn(f":attr:`{nn}.{member}`", line)
+                    substitutions += count
+                elif member in symbol.entity.method_names:
+                    line, count = p2.subn(f":meth:`{nn}.{member}`", line)
+                    substitutions += count
+        if profiler.enabled:
+            profiler.count("auto_link.substitutions", substitutions)
+        return line
+
+    def _get_patterns(self, index):
+        if (patterns := self._patterns.get(index)) is None:
+            symbol = self.symbols[index]
+            name = symbol.target.replace(".", r"\.")
+            # entity_name is NOT followed by .<property_or_method>
+            p = re.compile(LOOK_BEHIND + name + LOOK_AHEAD)
+            p2 = None
+            if symbol.role == "class":
+                # entity_name IS followed by .<property_or_method>
+                p2 = re.compile(LOOK_BEHIND + name + r"\.(\w+)" + LOOK_AHEAD2)
+            patterns = self._patterns[index] = (p, p2)
+        return patterns
+
+
+_auto_linker = None
+
+
+def get_auto_linker():
+    """Return the :class:`MatAutoLinker` for the current ``symbol_table``.
+
+    The linker is built once per analysis of ``matlab_src_dir``.
+    """
+    global _auto_linker
+    if _auto_linker is None or _auto_linker.generation != symbol_table.generation:
+        _auto_linker = MatAutoLinker(symbol_table.link_symbols)
+        _auto_linker.generation = symbol_table.generation
+    return _auto_linker
+
+
+class MatMemberLinker:
+    """Link the members of a :class:`MatClass` in docstrings.
+
+    :param cls: The class.
+    :type cls: :class:`MatClass`
+    :param fullname: Name of the class to link to, see :meth:`MatClass.fullname`.
+    :type fullname: str
+
+    Use :func:`get_member_linker` to get the linker of a class, it is built
+    once per class and analysis of ``matlab_src_dir``.
+    """
+
+    #: ``name()``, not preceded by ` . < @ * <non-breaking space>
+    call_re = re.compile(r"(?<!(`|\.|<|@|\*|\xa0))\b(\w+)\(\)(?!\xa0)")
+    #: first word of an entry of a "Properties:" or "Methods:" list
+    entry_re = re.compile(r"((\*\s*)?(\b\w*\b))(?=\s*-)")
+
+    def __init__(self, cls, fullname):
+        self.cls = cls
+        self.fullname = fullname
+        self.method_names = frozenset(cls.method_names)
+        self._self_patterns = {}
+
+    def link_calls(self, line):
+        """Link the calls ``name()`` of methods in *line*."""
+
+        def link(match):
+            name = match.group(2)
+            if name in self.method_names:
+                if profiler.enabled:
+                    profiler.count("auto_link.substitutions")
+                return f":meth:`{name}() <{self.fullname}.{name}>`"
+            return match.group()
+
+        return self.call_re.sub(link, line)
+
+    def link_entry(self, role, line):
+        """Link the first word of *line*, an entry of a list of members."""
+        if match := self.entry_re.search(line):
+            name = match[3]
+            parens = "()" if role == "meth" else ""
+            line = self.entry_re.sub(
+                f"* :{role}:`{name}{parens} <{self.fullname}.{name}>`", line, 1
+            )
+            if profiler.enabled:
+                profiler.count("auto_link.substitutions")
+        return line
+
+    def link_self(self, role, name, line):
+        """Link the member *name* in its own docstring *line*.
+
+        *role* is ``"meth"`` or ``"attr"``.
+        """
+        if (pattern := self._self_patterns.get((role, name))) is None:
+            if role == "meth":
+                # negative look-behind for ` or . or < or @ or * or <non-breaking
+                # space> and negative look-ahead for * or <non-breaking space> or
+                # .<alphanum>
+                regex = r"(?<!(`|\.|<|@|\*|\xa0))\b" + name + r"\b(?!\*|\xa0|\.\w)"
+                text = f":meth:`{name}() <{self.fullname}.{name}>`"
+            else:
+                # negative look-behind for ` or . or < or * or <non-breaking space>
+                # and negative look-ahead for ` * or <non-breaking space>
+                regex = r"(?<!(`|\.|<|\*|\xa0))\b" + name + r"\b(?!`|\*|\xa0)"
+                text = f":attr:`{name} <{self.fullname}.{name}>`"
+            pattern = self._self_patterns[(role, name)] = (re.compile(regex), text)
+        regex, text = pattern
+        line, count = regex.subn(text, line)
+        if profiler.enabled:
+            profiler.count("auto_link.substitutions", count)
+        return line
+
+
+_member_linkers = {}
+_member_linkers_generation = None
+
+
+def get_member_linker(cls, env):
+    """Return the :class:`MatMemberLinker` of the class *cls*."""
+    global _member_linkers_generation
+    if _member_linkers_generation != symbol_table.generation:
+        _member_linkers.clear()
+        _member_linkers_generation = symbol_table.generation
+
+    fullname = cls.fullname(env)
+    linker = _member_linkers.get(id(cls))
+    if linker is None or linker.cls is not cls or linker.fullname != fullname:
+        linker = _member_linkers[id(cls)] = MatMemberLinker(cls, fullname)
+    return linker
+
+
+class LinkedDocstringCache:
+    """Docstrings after auto-linking, see :meth:`MatlabDocumenter.auto_link`.
+
+    The same docstring is linked when a class is documented by
+    ``automodule`` and again by ``autoclass``, or by several builders. The
+    entries are keyed by the documenter, the docstring, the auto-link
+    configuration and the linkable names of ``symbol_table``, so each
+    docstring is linked once per distinct configuration. With
+    ``matlab_cache_dir`` the entries are also stored on disk and shared
+    between builds.
+    """
+
+    def __init__(self):
+        #: :class:`DiskCache` of linked docstrings or ``None``
+        self.disk = None
+        #: number of docstrings found in the cache
+        self.hits = 0
+        #: number of docstrings linked
+        self.misses = 0
+        self._entries = {}
+        self._symbols_key = None
+        self._symbols_generation = None
+
+    def reset(self, disk=None):
+        """Use the :class:`DiskCache` *disk* and reset the counters."""
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    def symbols_key(self):
+        """Return a key of the linkable names of ``symbol_table``."""
+        if self._symbols_generation != symbol_table.generation:
+            parts = []
+            for symbol in symbol_table.link_symbols:
+                parts += [symbol.name, symbol.role]
+                if symbol.role == "class":
+                    parts.append(" ".join(symbol.entity.property_names))
+                    parts.append(" ".join(symbol.entity.method_names))
+            symbols_key = content_key(*parts)
+            if symbols_key != self._symbols_key:
+                self._entries.clear()
+            self._symbols_key = symbols_key
+            self._symbols_generation = symbol_table.generation
+        return self._symbols_key
+
+    def key(self, documenter, docstrings):
+        """Return the cache key of *docstrings* of *documenter*."""
+        config = documenter.env.config
+        return content_key(
+            type(documenter).__name__,
+            documenter.fullname,
+            str(config.matlab_auto_link),
+            str(config.matlab_short_links),
+            str(config.matlab_keep_package_prefix),
+            package_version("sphinxcontrib-matlabdomain"),
+            self.symbols_key(),
+            *["\n".join(lines) for lines in docstrings],
+        )
+
+    def get(self, key):
+        """Return a copy of the linked docstrings of *key* or ``None``."""
+        linked = self._entries.get(key)
+        if linked is None and self.disk is not None:
+            linked = self.disk.get(key)
+            if linked is not None:
+                self._entries[key] = linked
+        if linked is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [list(lines) for lines in linked]
+
+    def put(self, key, docstrings):
+        """Store a copy of the linked *docstrings* for *key*."""
+        linked = tuple(tuple(lines) for lines in docstrings)
+        self._entries[key] = linked
+        if self.disk is not None:
+            self.disk.put(key, linked)
+
+
+#: Docstrings linked by the documenters.
+linked_docstrings = LinkedDocstringCache()
@@ -0,0 +1,167 @@
+"""sphinxcontrib.mat_cache.
+~~~~~~~~~~~~~~~~~~~~~~~
+
+On-disk caches for the MATLAB domain.
+
+:copyright: Copyright by the sphinxcontrib-matlabdomain team, see AUTHORS.
+:license: BSD, see LICENSE for details.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from contextlib import suppress
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+
+from sphinx.util.logging import getLogger
+
+logger = getLogger("matlab-domain")
+
+__all__ = [
+    "DiskCache",
+    "content_key",
+    "package_version",
+]
+
+
+@cache
+def package_version(name):
+    """Return the installed version of distribution *name*, or ``"unknown"``."""
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def content_key(*parts):
+    """Return a hex digest identifying *parts* (``bytes`` or ``str``)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        # Length prefix, so that ("ab", "c") and ("a", "bc") differ.
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """A cache of pickled values stored as files below a directory.
+
+    :param directory: Folder holding the cache, created on first write.
+    :type directory: str
+    :param max_size: Maximum size of the cache in bytes, see :meth:`prune`.
+    :type max_size: int
+
+    Keys are hex digests, e.g. from :func:`content_key`. Entries are written
+    atomically, so several builds can share the same directory. The
+    modification time of an entry is updated when it is read, and
+    :meth:`prune` removes the least recently used entries first.
+    """
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+        #: number of successful lookups
+        self.hits = 0
+        #: number of failed lookups
+        self.misses = 0
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: "{self.directory}">'
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.pickle")
+
+    def get(self, key):
+        """Return the value stored for *key* or ``None``."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as entry:
+                value = pickle.load(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as exc:
+            # A truncated or incompatible entry is just a miss.
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] Ignoring cache entry %s: %s", path, exc
+            )
+            self.misses += 1
+            return None
+
+        with suppress(OSError):
+            os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store *value* for *key*."""
+        path = self._entry_path(key)
+        folder = os.path.dirname(path)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        except OSError as exc:
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] Unable to write cache entry %s: %s",
+                path,
+                exc,
+            )
+            return
+        try:
+            with os.fdopen(fd, "wb") as entry:
+                pickle.dump(value, entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            os.unlink(tmp_path)
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] Unable to write cache entry %s: %s",
+                path,
+                exc,
+            )
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def entries(self):
+        """Return ``(mtime, size, path)`` of all entries in the cache."""
+        entries = []
+        try:
+            folders = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return entries
+        for folder in folders:
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.endswith(".pickle"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def prune(self):
+        """Remove least recently used entries until below ``max_size``."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_size:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            removed += 1
+            total -= size
+            if total <= self.max_size:
+                break
+        logger.debug(
+            "[sphinxcontrib-matlabdomain] Removed %d entries from cache %s.",
+            removed,
+            self.directory,
+        )
+        return removed
@@ -16,6 +16,8 @@ from sphinx.ext.autodoc.directive import (
 )
 from sphinx.util.logging import getLogger
 
+from .mat_profile import profiler
+
 logger = getLogger("matlab-domain")
 
 
@@ -77,7 +79,8 @@ class MatlabAutodocDirective(AutodocDirective):
             self.env, reporter, documenter_options, lineno, self.state
         )
         documenter = doccls(params, self.arguments[0])
-        documenter.generate(more_content=self.content)
+        with profiler.phase("autodoc"):
+            documenter.generate(more_content=self.content)
         if not params.result:
             return []
 
@@ -8,6 +8,7 @@ Extend autodoc directives to matlabdomain.
 """
 
 import inspect
+import os
 import re
 import traceback
 
@@ -41,6 +42,9 @@ from sphinx.util.docstrings import prepare_docstring
 from sphinx.util.inspect import safe_getattr
 from sphinx.util.logging import getLogger
 
+from .mat_auto_link import get_auto_linker, get_member_linker, linked_docstrings
+from .mat_cache import content_key, package_version
+from .mat_profile import profiler
 from .mat_types import (
     MatApplication,
     MatClass,
@@ -48,12 +52,13 @@ from .mat_types import (
     MatException,
     MatFunction,
     MatMethod,
+    MatModule,
     MatModuleAnalyzer,
+    MatObject,
     MatProperty,
     MatScript,
-    entities_name_map,
-    entities_table,
-    try_get_module_entity_or_default,
+    source_digest,
+    symbol_table,
 )
 
 mat_ext_sig_re = re.compile(
@@ -73,6 +78,184 @@ mat_ext_sig_re = re.compile(
 
 logger = getLogger("matlab-domain")
 
+# Events that can change the generated reST, see `GeneratedRestCache`.
+AUTODOC_EVENTS = (
+    "autodoc-before-process-signature",
+    "autodoc-process-signature",
+    "autodoc-process-docstring",
+    "autodoc-process-bases",
+    "autodoc-skip-member",
+)
+
+# Configuration values that do not change the generated reST.
+UNCACHED_CONFIG_VALUES = {
+    "matlab_cache_dir",
+    "matlab_cache_highlight",
+    "matlab_cache_max_size",
+    "matlab_cache_rest",
+    "matlab_parse_workers",
+    "matlab_profile",
+    "matlab_trace",
+}
+
+
+def option_key(value):
+    """Return a string for the directive option *value*, without addresses."""
+    if value is ALL:
+        return "ALL"
+    if value is EMPTY:
+        return "EMPTY"
+    if value is SUPPRESS:
+        return "SUPPRESS"
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(value))
+    return repr(value)
+
+
+class GeneratedRestCache:
+    """reST generated by documenters for ``matlab_cache_rest``.
+
+    The lines generated by an ``auto*`` directive, including those of its
+    members, are keyed by the contents of the MATLAB files of the documented
+    object, the directive options and content, the configuration and the
+    version of the extension, and with ``show-inheritance`` by where the
+    superclasses are found. A document using unchanged objects then only
+    replays the lines. With ``matlab_cache_dir`` the entries are also stored on
+    disk and shared between builds.
+
+    The cache is not used when handlers are connected to one of the autodoc
+    events, as these must see every object that is documented.
+    """
+
+    def __init__(self):
+        #: :class:`DiskCache` of generated reST or ``None``
+        self.disk = None
+        #: number of directives replayed from the cache
+        self.hits = 0
+        #: number of directives generated
+        self.misses = 0
+        #: whether no handlers are connected to the autodoc events
+        self.enabled = True
+        self._entries = {}
+
+    def reset(self, disk=None):
+        """Use the :class:`DiskCache` *disk*, reset the counters and drop the
+        entries of the previous build.
+        """
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self.enabled = True
+        self._entries.clear()
+
+    def check_autodoc_events(self, app):
+        """Disable the cache if handlers are connected to the autodoc events
+        of *app*.
+        """
+        self.enabled = not any(
+            app.events.listeners.get(event) for event in AUTODOC_EVENTS
+        )
+
+    def key(self, documenter, more_content, all_members):
+        """Return the cache key of the reST of *documenter* or ``None`` if its
+        reST is not cached.
+        """
+        env = documenter.env
+        if not env.config.matlab_cache_rest or not self.enabled:
+            return None
+        source_files = self.source_files(documenter)
+        if not source_files:
+            return None
+
+        analyzed = getattr(env, "matlab_analysis", {}).get("files", {})
+        parts = [
+            type(documenter).__name__,
+            documenter.name,
+            documenter.indent,
+            str(all_members),
+            package_version("sphinxcontrib-matlabdomain"),
+        ]
+        for filename in source_files:
+            entry = analyzed.get(filename)
+            parts += [filename, entry[1] if entry else source_digest(filename)]
+        for name, value in sorted(documenter.options.items()):
+            parts += [name, option_key(value)]
+        if documenter.options.show_inheritance:
+            # The links to the superclasses depend on where they are found.
+            for name, base in self.base_classes(documenter):
+                parts.append(name)
+                if isinstance(base, MatClass):
+                    parts.append(base.fullname(env))
+                    for filename in base.source_files():
+                        entry = analyzed.get(filename)
+                        parts += [
+                            filename,
+                            entry[1] if entry else source_digest(filename),
+                        ]
+        for name in sorted(env.config.values):
+            if name.startswith(("matlab_", "autodoc_", "autoclass_")):
+                if name not in UNCACHED_CONFIG_VALUES:
+                    parts += [name, repr(getattr(env.config, name))]
+        if env.config.matlab_auto_link:
+            parts.append(linked_docstrings.symbols_key())
+        if more_content:
+            for line, (source, offset) in zip(
+                more_content.data, more_content.items, strict=True
+            ):
+                parts += [line, str(source), str(offset)]
+        return content_key(*parts)
+
+    def source_files(self, documenter):
+        # The files of a folder are those of all members documented with it.
+        obj = documenter.object
+        if isinstance(obj, MatModule):
+            if documenter.options.inherited_members:
+                return []
+            analyzed = getattr(documenter.env, "matlab_analysis", {}).get("files", {})
+            prefix = os.path.join(obj.path, "")
+            return sorted(name for name in analyzed if name.startswith(prefix))
+        return documenter.get_source_files()
+
+    def base_classes(self, documenter):
+        # ``(name, entity)`` of the superclasses of the documented classes.
+        obj = documenter.object
+        if isinstance(obj, MatModule):
+            classes = [entity for _, entity in obj.entities]
+        else:
+            classes = [obj]
+        return [
+            base
+            for cls in classes
+            if isinstance(cls, MatClass)
+            for base in cls.__bases__.items()
+        ]
+
+    def get(self, key):
+        """Return ``(lines, dependencies)`` stored for *key* or ``None``."""
+        entry = self._entries.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self._entries[key] = entry
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key, lines, dependencies):
+        """Store the generated *lines*, ``(line, source, offset)``, and the
+        *dependencies* recorded while generating them for *key*.
+        """
+        entry = (tuple(lines), tuple(sorted(dependencies)))
+        self._entries[key] = entry
+        if self.disk is not None:
+            self.disk.put(key, entry)
+
+
+#: reST generated by the documenters.
+generated_rest = GeneratedRestCache()
+
 
 class MatlabDocumenter(PyDocumenter):
     """Base class for documenters of MATLAB objects."""
@@ -139,11 +322,11 @@ class MatlabDocumenter(PyDocumenter):
             if len(self.objpath) > 1:
                 lookup_name = ".".join([self.modname, self.objpath[0]])
                 lookup_name = lookup_name.lstrip(".")
-                obj = entities_table[lookup_name]
+                obj = symbol_table[lookup_name]
                 self.object = self.get_attr(obj, self.objpath[1])
             else:
                 lookup_name = self.fullname.lstrip(".")
-                self.object = try_get_module_entity_or_default(lookup_name)
+                self.object = symbol_table.module(lookup_name)
             return True
         # this used to only catch SyntaxError, ImportError and AttributeError,
         # but importing modules with side effects can raise all kinds of errors
@@ -162,6 +345,12 @@ class MatlabDocumenter(PyDocumenter):
             self.env.note_reread()
             return False
 
+    def get_source_files(self):
+        """Return the MATLAB files used to document *self.object*."""
+        if isinstance(self.object, MatObject):
+            return self.object.source_files()
+        return []
+
     def add_content(self, more_content, no_docstring=False):
         """Add content from docstrings, attribute documentation and user."""
         sourcename = f"docstring of {self.fullname}"
@@ -175,7 +364,7 @@ class MatlabDocumenter(PyDocumenter):
                 # content if desired
                 docstrings.append([])
             if self.env.config.matlab_auto_link:
-                docstrings = self.auto_link(docstrings)
+                docstrings = self.auto_link_cached(docstrings)
             for i, line in enumerate(self.process_doc(docstrings)):
                 self.add_line(line, sourcename, i)
 
@@ -196,6 +385,7 @@ class MatlabDocumenter(PyDocumenter):
         see_also_re = re.compile(r"(See also:?\s*)(\b.*\b)(.*)", re.IGNORECASE)
         see_also_cond_re = re.compile(r"(\s*)(\b.*\b)(.*)")
         class_re = re.compile(r"(.*)\.([^\.]+)")
+        keep_package_prefix = self.env.config.matlab_keep_package_prefix
         is_see_also_line = False
         for i in range(len(docstrings)):
             for j in range(len(docstrings[i])):
@@ -218,41 +408,24 @@ class MatlabDocumenter(PyDocumenter):
                         if entries[k].endswith("`"):
                             continue
 
-                        # search in entities_table
+                        # search in the symbol table
                         # (for matching class or function name)
-                        if (
-                            self.env.config.matlab_keep_package_prefix
-                            and entries[k] in entities_table
-                        ):
-                            o = entities_table[entries[k]]
-                        elif (
-                            not self.env.config.matlab_keep_package_prefix
-                            and entries[k] in entities_name_map
+                        if symbol := symbol_table.find_link(
+                            entries[k], keep_package_prefix
                         ):
-                            o = entities_table[entities_name_map[entries[k]]]
-                        else:
-                            o = None
-                        if o:
-                            if isinstance(o, dict):
-                                if "class" in o:
-                                    o = o["class"]
-                                elif "func" in o:
-                                    o = o["func"]
-                            role = o.ref_role()
-                            if role in ["class", "func"]:
-                                entries[k] = f":{role}:`{entries[k]}`"
-                                continue
+                            entries[k] = f":{symbol.role}:`{entries[k]}`"
+                            continue
 
                         # if we have an associated class, search properties and methods
                         if cls := self.class_object():
                             name = entries[k].rstrip("()")
-                            if name in cls.methods:
+                            if name in cls.method_names:
                                 entries[k] = (
                                     f":meth:`{name}() "
                                     f"<{cls.fullname(self.env)}.{name}>`"
                                 )
                                 continue
-                            elif name in cls.properties:
+                            elif name in cls.property_names:
                                 entries[k] = (
                                     f":attr:`{name} <{cls.fullname(self.env)}.{name}>`"
                                 )
@@ -261,26 +434,14 @@ class MatlabDocumenter(PyDocumenter):
                         if match2 := class_re.search(entries[k]):
                             m1 = match2[1]
                             m2 = match2[2]
-                            if (
-                                self.env.config.matlab_keep_package_prefix
-                                and m1 in entities_table
-                            ):
-                                cls = entities_table[entries[k]]
-                            elif (
-                                not self.env.config.matlab_keep_package_prefix
-                                and m1 in entities_name_map
-                            ):
-                                cls = entities_table[entities_name_map[m1]]
-                            else:
-                                cls = None
-                            if isinstance(cls, dict):
-                                cls = cls["class"]
-                            if cls and cls.ref_role() == "class":
+                            symbol = symbol_table.find_link(m1, keep_package_prefix)
+                            if symbol and symbol.role == "class":
+                                cls = symbol.entity
                                 name = m2.rstrip("()")
-                                if name in cls.methods:
+                                if name in cls.method_names:
                                     entries[k] = f":meth:`{entries[k]}`"
                                     continue
-                                elif name in cls.properties:
+                                elif name in cls.property_names:
                                     entries[k] = f":attr:`{entries[k]}`"
                                     continue
 
@@ -316,58 +477,15 @@ class MatlabDocumenter(PyDocumenter):
 
     def auto_link_all(self, docstrings):
         # auto-link known classes and functions everywhere
-        for n, o in entities_table.items():
-            if isinstance(o, dict):
-                if "class" in o:
-                    o = o["class"]
-                elif "func" in o:
-                    o = o["func"]
-            role = o.ref_role()
-            if role in ["class", "func"]:
-                nn = n.replace("+", "")  # remove + from name
-                # negative look-behind for ` . + < @ * <non-breaking space>
-                look_behind = r"(?<!(`|\.|\+|<|@|\*| ))\b"
-                # negative look-ahead for ` * or <non-breaking space> or
-                # " Properties:" or " Methods:" or .<alphanum>
-                look_ahead = r"\b(?!(`|\*| |\sProperties:|\sMethods:|\.\w))"
-                look_ahead2 = r"\b(?!(`|\*| |\sProperties:|\sMethods:))"
-                # entity_name is NOT followed by .<property_or_method>
-                pat = look_behind + nn.replace(".", r"\.") + look_ahead
-                p = re.compile(pat)
-                if role == "class":
-                    # entity_name IS followed by .<property_or_method>
-                    pat2 = (
-                        look_behind + nn.replace(".", r"\.") + r"\.(\w+)" + look_ahead2
-                    )
-                    p2 = re.compile(pat2)
-                no_link_state = 0  # normal mode (no literal block detected)
-                for i in range(len(docstrings)):
-                    for j in range(len(docstrings[i])):
-                        not_in_literal_block, no_link_state = self.detect_literal_block(
-                            docstrings[i][j], no_link_state
-                        )
-                        if not_in_literal_block:
-                            docstrings[i][j] = p.sub(
-                                f":{role}:`{nn}`", docstrings[i][j]
-                            )
-                            if role == "class":
-                                if match := p2.search(docstrings[i][j]):
-                                    # if match.group(1) is a property
-                                    #   -> :attr:`{nn}.{match.group(1)}`
-                                    for nnn in o.properties:
-                                        if match.group(2) == nnn:
-                                            docstrings[i][j] = p2.sub(
-                                                f":attr:`{nn}.{nnn}`", docstrings[i][j]
-                                            )
-                                            break
-                                    # if match.group(1) is a method
-                                    #   -> :meth:`{nn}.{match.group(1)}`
-                                    for nnn in o.methods:
-                                        if match.group(2) == nnn:
-                                            docstrings[i][j] = p2.sub(
-                                                f":meth:`{nn}.{nnn}`", docstrings[i][j]
-                                            )
-                                            break
+        linker = get_auto_linker()
+        no_link_state = 0  # normal mode (no literal block detected)
+        for lines in docstrings:
+            for j in range(len(lines)):
+                not_in_literal_block, no_link_state = self.detect_literal_block(
+                    lines[j], no_link_state
+                )
+                if not_in_literal_block:
+                    lines[j] = linker.link_line(lines[j])
 
         return docstrings
 
@@ -382,22 +500,40 @@ class MatlabDocumenter(PyDocumenter):
 
         return docstrings
 
+    def auto_link_cached(self, docstrings):
+        # docstrings are linked once, see `LinkedDocstringCache`
+        key = linked_docstrings.key(self, docstrings)
+        if (linked := linked_docstrings.get(key)) is None:
+            with profiler.phase("auto_link"):
+                linked = self.auto_link(docstrings)
+            linked_docstrings.put(key, linked)
+        return linked
+
     def auto_link_methods(self, class_obj, docstrings):
-        for n in class_obj.methods:
-            # negative look-behind for ` . < @ * <non-breaking space>, then <name>()
-            pat = r"(?<!(`|\.|<|@|\*| ))\b" + n + r"\(\)(?! )"
-            p = re.compile(pat)
-            no_link_state = 0  # normal mode (no literal block detected)
-            for i in range(len(docstrings)):
-                for j in range(len(docstrings[i])):
-                    not_in_literal_block, no_link_state = self.detect_literal_block(
-                        docstrings[i][j], no_link_state
-                    )
-                    if not_in_literal_block:
-                        docstrings[i][j] = p.sub(
-                            f":meth:`{n}() <{class_obj.fullname(self.env)}.{n}>`",
-                            docstrings[i][j],
-                        )
+        linker = get_member_linker(class_obj, self.env)
+        no_link_state = 0  # normal mode (no literal block detected)
+        for lines in docstrings:
+            for j in range(len(lines)):
+                not_in_literal_block, no_link_state = self.detect_literal_block(
+                    lines[j], no_link_state
+                )
+                if not_in_literal_block:
+                    lines[j] = linker.link_calls(lines[j])
+
+        return docstrings
+
+    def link_self(self, role, docstrings):
+        # auto-link the name of the documented class member in its docstring
+        linker = get_member_linker(self.class_object(), self.env)
+        name = self.object.name
+        no_link_state = 0  # normal mode (no literal block detected)
+        for lines in docstrings:
+            for j in range(len(lines)):
+                not_in_literal_block, no_link_state = self.detect_literal_block(
+                    lines[j], no_link_state
+                )
+                if not_in_literal_block and lines[j]:  # also not blank line
+                    lines[j] = linker.link_self(role, name, lines[j])
 
         return docstrings
 
@@ -411,10 +547,7 @@ class MatlabDocumenter(PyDocumenter):
         analyzed_member_names = set()
         if self.analyzer:
             attr_docs = self.analyzer.find_attr_docs()
-            namespace = ".".join(self.objpath)
-            for item in attr_docs.items():
-                if item[0][0] == namespace:
-                    analyzed_member_names.add(item[0][1])
+            analyzed_member_names.update(attr_docs.namespace(".".join(self.objpath)))
 
         if not want_all:
             if not self.options.members:
@@ -558,7 +691,10 @@ class MatlabDocumenter(PyDocumenter):
         # search for members in source code too
         namespace = ".".join(self.objpath)  # will be empty for modules
 
-        attr_docs = self.analyzer.find_attr_docs() if self.analyzer else {}
+        if self.analyzer:
+            attr_docs = self.analyzer.find_attr_docs().namespace(namespace)
+        else:
+            attr_docs = {}
 
         # process members and determine which to skip
         for membername, member in members:
@@ -616,7 +752,7 @@ class MatlabDocumenter(PyDocumenter):
                     and member_is_friend_of(member, self.options.friend_members)
                 ):
                     keep = has_doc or self.options.undoc_members
-            elif (namespace, membername) in attr_docs:
+            elif membername in attr_docs:
                 # keep documented attributes
                 keep = True
                 isattr = True
@@ -649,11 +785,6 @@ class MatlabDocumenter(PyDocumenter):
         If *all_members* is True, do all members, else those given by
         *self.options.members*.
         """
-        # set current namespace for finding members
-        self.env.temp_data["autodoc:module"] = self.modname
-        if self.objpath:
-            self.env.temp_data["autodoc:class"] = self.objpath[0]
-
         want_all = (
             all_members or self.options.inherited_members or self.options.members is ALL
         )
@@ -668,9 +799,20 @@ class MatlabDocumenter(PyDocumenter):
                 if membername not in self.options.exclude_members
             ]
 
+        with profiler.phase("filter_members"):
+            members = self.filter_members(members, want_all)
+        self.document_filtered_members(members, members_check_module)
+
+    def document_filtered_members(self, members, members_check_module=False):
+        """Generate reST for *members*, as returned by :meth:`filter_members`."""
+        # set current namespace for finding members
+        self.env.temp_data["autodoc:module"] = self.modname
+        if self.objpath:
+            self.env.temp_data["autodoc:class"] = self.objpath[0]
+
         # document non-skipped members
         memberdocumenters = []
-        for mname, member, isattr in self.filter_members(members, want_all):
+        for mname, member, isattr in members:
             classes = []
             for name, cls in self.documenters.items():
                 if name.startswith("mat:") and cls.can_document_member(
@@ -694,11 +836,12 @@ class MatlabDocumenter(PyDocumenter):
             memberdocumenters.sort(key=lambda e: e[0].member_order)
         elif member_order == "bysource" and self.analyzer:
             # sort by source order, by virtue of the module analyzer
-            tagorder = self.analyzer.tagorder
+            attr_docs = self.analyzer.find_attr_docs()
 
             def keyfunc(entry):
                 fullname = entry[0].name.split("::")[1]
-                return tagorder.get(fullname, len(tagorder))
+                number = attr_docs.tag_number(fullname)
+                return (number is None, number or 0)
 
             memberdocumenters.sort(key=keyfunc)
 
@@ -766,12 +909,28 @@ class MatlabDocumenter(PyDocumenter):
             if hasattr(self.module, "__file__") and self.module.__file__:
                 self.directive.record_dependencies.add(self.module.__file__)
         else:
-            self.directive.record_dependencies.add(self.analyzer.srcname)
+            # Record the MATLAB files of the object, so that only documents
+            # using them are read again when they change.
+            self.directive.record_dependencies.update(self.get_source_files())
 
         # check __module__ of object (for members not given explicitly)
         if check_module and not self.check_module():
             return
 
+        # Only the reST of the directive is cached, not that of its members,
+        # which are generated with the module name of their parent.
+        cache_key = None
+        if real_modname is None:
+            cache_key = generated_rest.key(self, more_content, all_members)
+        if cache_key is not None and (cached := generated_rest.get(cache_key)):
+            lines, dependencies = cached
+            for line, source, offset in lines:
+                self.directive.result.append(line, source, offset)
+            self.directive.record_dependencies.update(dependencies)
+            return
+        start = len(self.directive.result)
+        dependencies = set(self.directive.record_dependencies)
+
         # make sure that the result starts with an empty line.  This is
         # necessary for some situations where another directive preprocesses
         # reST and no starting newline is present
@@ -793,6 +952,14 @@ class MatlabDocumenter(PyDocumenter):
         # document members, if possible
         self.document_members(all_members)
 
+        if cache_key is not None:
+            result = self.directive.result
+            generated_rest.put(
+                cache_key,
+                [(result[i], *result.info(i)) for i in range(start, len(result))],
+                self.directive.record_dependencies - dependencies,
+            )
+
 
 class MatModuleDocumenter(MatlabDocumenter, PyModuleDocumenter):
     def parse_name(self):
@@ -1019,6 +1186,15 @@ class MatClassDocumenter(MatModuleLevelDocumenter):
                 self.doc_as_attr = True
         return ret
 
+    def get_source_files(self):
+        """Return the MATLAB files of the class, and of its superclasses if
+        inherited members are shown.
+        """
+        if not isinstance(self.object, MatClass):
+            return super().get_source_files()
+        inherited = bool(self.options.inherited_members)
+        return self.object.source_files(inherited=inherited)
+
     def format_args(self):
         """Format arguments.
 
@@ -1147,16 +1323,7 @@ class MatClassDocumenter(MatModuleLevelDocumenter):
         return docstrings
 
     def link_member(self, type, line):
-        parens = "()" if type == "meth" else ""
-        p = re.compile(r"((\*\s*)?(\b\w*\b))(?=\s*-)")
-        if match := p.search(line):
-            name = match[3]
-            line = p.sub(
-                f"* :{type}:`{name}{parens} <{self.object.fullname(self.env)}.{name}>`",
-                line,
-                1,
-            )
-        return line
+        return get_member_linker(self.object, self.env).link_entry(type, line)
 
     def auto_link_all(self, docstrings):
         docstrings = self.auto_link_methods(self.object, docstrings)
@@ -1172,131 +1339,86 @@ class MatClassDocumenter(MatModuleLevelDocumenter):
         # find out which members are documentable
         _, members = self.get_object_members(want_all)
 
-        # use filtered members to check for empty sections
-        filtered_members = [
-            (membername, member)
-            for (membername, member, isattr) in self.filter_members(members, want_all)
-        ]
-
-        # create list of properties
-        prop_names = [
-            membername
-            for (membername, member) in filtered_members
-            if isinstance(member, MatProperty)
-        ]
-        # create list of constructors
-        if self.env.config.autoclass_content in ("both", "init"):
-            # skip constructor section,
-            # since its docstring has already been used for the class
-            cons_names = []
-        else:
-            cons_names = [
-                membername
-                for (membername, member) in filtered_members
-                if isinstance(member, MatMethod) and member.name == member.cls.name
-            ]
-        # create list of non-constructor methods
-        meth_names = [
-            membername
-            for (membername, member) in filtered_members
-            if isinstance(member, MatMethod) and member.name != member.cls.name
-        ]
-        # create list of enums
-        enum_names = [
-            membername
-            for (membername, member) in filtered_members
-            if isinstance(member, MatEnumeration)
-        ]
-        # create list of other members
-        other_names = [
-            membername
-            for (membername, member) in filtered_members
-            if not isinstance(member, MatMethod)
-            and not isinstance(member, MatProperty)
-            and not isinstance(member, MatEnumeration)
-            # exclude parent modules with names matching members (as in Myclass.Myclass)
-            and not (hasattr(member, "module") and member.name == member.module)
-        ]
-        # create list of members that are not properties
-        non_properties = [
-            membername
-            for (membername, member) in members
-            if not isinstance(member, MatProperty)
-        ]
-        # create list of members that are not constructors
-        non_constructors = [
-            membername
-            for (membername, member) in members
-            if not isinstance(member, MatMethod) or member.name != member.cls.name
-        ]
-        # create list of members that are not non-constructor methods
-        non_methods = [
-            membername
-            for (membername, member) in members
-            if not isinstance(member, MatMethod) or member.name == member.cls.name
-        ]
-        # create list of members that are not properties
-        non_enums = [
-            membername
-            for (membername, member) in members
-            if not isinstance(member, MatEnumeration)
-        ]
-        # create list of members that are not non-constructor methods
-        non_other = [
-            membername
-            for (membername, member) in members
-            if isinstance(member, (MatMethod, MatProperty))
-        ]
+        # filter the members once and sort them into the sections
+        with profiler.phase("filter_members"):
+            sections = self.partition_members(self.filter_members(members, want_all))
 
         # container
-        if cons_names or prop_names or meth_names or other_names:
+        if (
+            sections["constructor"]
+            or sections["property"]
+            or sections["method"]
+            or sections["other"]
+        ):
             self.add_line("", "<autodoc>")
             self.add_line(".. container:: members", "<autodoc>")
             self.add_line("", "<autodoc>")
             self.indent += "   "
 
-        # constructor
-        if cons_names:
-            self.document_member_section(
-                "Constructor Summary", non_constructors, all_members
-            )
-
-        # properties
-        if prop_names:
-            self.document_member_section(
-                "Property Summary", non_properties, all_members
-            )
-
-        # enumss
-        if enum_names:
-            self.document_member_section("Enumeration Values", non_enums, all_members)
-
-        # methods
-        if meth_names:
-            self.document_member_section("Method Summary", non_methods, all_members)
-
-        # other
-        if other_names:
-            self.document_member_section("Other", non_other, all_members)
+        for key, heading in [
+            ("constructor", "Constructor Summary"),
+            ("property", "Property Summary"),
+            ("enumeration", "Enumeration Values"),
+            ("method", "Method Summary"),
+            ("other", "Other"),
+        ]:
+            if sections[key]:
+                self.document_member_section(heading, sections[key])
+
+    def partition_members(self, members):
+        """Sort *members*, as returned by :meth:`filter_members`, into the
+        sections of the class documentation.
+
+        Returns a dictionary of lists of members with the keys
+        ``"constructor"``, ``"property"``, ``"enumeration"``, ``"method"`` and
+        ``"other"``.
+        """
+        # skip constructor section if its docstring is used for the class
+        skip_constructor = self.env.config.autoclass_content in ("both", "init")
+        sections = {
+            "constructor": [],
+            "property": [],
+            "enumeration": [],
+            "method": [],
+            "other": [],
+        }
+        for entry in members:
+            member = entry[1]
+            if isinstance(member, MatProperty):
+                key = "property"
+            elif isinstance(member, MatEnumeration):
+                key = "enumeration"
+            elif isinstance(member, MatMethod):
+                if member.name != member.cls.name:
+                    key = "method"
+                elif skip_constructor:
+                    continue
+                else:
+                    key = "constructor"
+            elif hasattr(member, "module") and member.name == member.module:
+                # exclude parent modules with names matching members (as in
+                # Myclass.Myclass)
+                continue
+            else:
+                key = "other"
+            sections[key].append(entry)
+        return sections
 
-    def document_member_section(self, heading, new_excludes, all_members):
-        # save up original indent and exclude_members
+    def document_member_section(self, heading, members):
+        # save up original indent
         indent = self.indent
-        exclude_members = self.options.exclude_members or []
 
         # output heading and section content
         self.add_line(heading, "<autodoc>")
         self.indent += "   "
         self.add_line(".. ", "<autodoc>")  # a comment, to force a <dd> in the HTML
-        if exclude_members is EMPTY:
-            self.options.exclude_members = set(new_excludes)
-        else:
-            self.options.exclude_members = set(list(exclude_members) + new_excludes)
-        MatModuleLevelDocumenter.document_members(self, all_members)
+        exclude_members = self.options.exclude_members or ()
+        self.document_filtered_members(
+            [entry for entry in members if entry[0] not in exclude_members]
+        )
 
-        # restore original indent and exclude_members
+        # restore original indent
         self.indent = indent
-        self.options.exclude_members = exclude_members
 
 
 class MatExceptionDocumenter(MatlabDocumenter, PyExceptionDocumenter):
@@ -1358,27 +1480,7 @@ class MatMethodDocumenter(MatDocstringSignatureMixin, MatClassLevelDocumenter):
         return self.object.cls
 
     def auto_link_self(self, docstrings):
-        name = self.object.name
-        # negative look-behind for ` or . or < or @ or * or <non-breaking space>
-        # and negative look-ahead for * or <non-breaking space> or .<alphanum>
-        p = re.compile(r"(?<!(`|\.|<|@|\*| ))\b" + name + r"\b(?!\*| |\.\w)")
-        no_link_state = 0  # normal mode (no literal block detected)
-        for i in range(len(docstrings)):
-            for j in range(len(docstrings[i])):
-                not_in_literal_block, no_link_state = self.detect_literal_block(
-                    docstrings[i][j], no_link_state
-                )
-                if not_in_literal_block and docstrings[i][j]:  # also not blank line
-                    if _ := p.search(docstrings[i][j]):
-                        docstrings[i][j] = p.sub(
-                            (
-                                f":meth:`{name}() "
-                                f"<{self.class_object().fullname(self.env)}"
-                                f".{name}>`"
-                            ),
-                            docstrings[i][j],
-                        )
-        return docstrings
+        return self.link_self("meth", docstrings)
 
     def auto_link_all(self, docstrings):
         docstrings = self.auto_link_methods(self.object.cls, docstrings)
@@ -1464,30 +1566,7 @@ class MatAttributeDocumenter(MatClassLevelDocumenter):
         return self.object.cls
 
     def auto_link_self(self, docstrings):
-        name = self.object.name
-        # negative look-behind for ` or . or < or * or <non-breaking space>
-        # and negative look-ahead for ` * or <non-breaking space>
-        p = re.compile(r"(?<!(`|\.|<|\*| ))\b" + name + r"\b(?!`|\*| )")
-        no_link_state = 0  # normal mode (no literal block detected)
-        for i in range(len(docstrings)):
-            for j in range(len(docstrings[i])):
-                not_in_literal_block, no_link_state = self.detect_literal_block(
-                    docstrings[i][j], no_link_state
-                )
-                if (
-                    not_in_literal_block
-                    and docstrings[i][j]
-                    and p.search(docstrings[i][j])
-                ):
-                    docstrings[i][j] = p.sub(
-                        (
-                            f":attr:`{name} "
-                            f"<{self.class_object().fullname(self.env)}"
-                            f".{name}>`"
-                        ),
-                        docstrings[i][j],
-                    )
-        return docstrings
+        return self.link_self("attr", docstrings)
 
     def auto_link_all(self, docstrings):
         docstrings = self.auto_link_methods(self.object.cls, docstrings)
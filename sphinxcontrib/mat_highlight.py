@@ -0,0 +1,149 @@
+"""sphinxcontrib.mat_highlight.
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Cache of highlighted MATLAB code blocks, for ``matlab_cache_highlight``.
+
+:copyright: Copyright by the sphinxcontrib-matlabdomain team, see AUTHORS.
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+
+from sphinx.highlighting import lexer_classes, lexers
+
+from .mat_cache import DiskCache, content_key, package_version
+
+__all__ = [
+    "CachedHighlighter",
+    "HighlightCache",
+    "highlight_cache",
+    "setup_highlight_cache",
+]
+
+#: Languages of the code blocks that are cached.
+MATLAB_LANGUAGES = frozenset(("matlab",))
+
+
+def class_name(cls):
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+class HighlightCache:
+    """Highlighted code of MATLAB code blocks and ``literalinclude`` listings.
+
+    The output of :meth:`PygmentsBridge.highlight_block` is keyed by the code,
+    the lexer and its options, the formatter, its style and options, and the
+    versions of Pygments, the MATLAB grammar and the extension. The entries
+    are stored on disk, so unchanged listings are not lexed and formatted
+    again in the next build.
+    """
+
+    def __init__(self):
+        #: :class:`DiskCache` of highlighted code or ``None``
+        self.disk = None
+        #: number of code blocks found in the cache
+        self.hits = 0
+        #: number of code blocks highlighted
+        self.misses = 0
+
+    def reset(self, disk=None):
+        """Use the :class:`DiskCache` *disk* and reset the counters."""
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, highlighter, source, lang, opts, force, kwargs):
+        """Return the cache key of highlighting *source* with *highlighter*."""
+        if lang in lexers:
+            lexer = class_name(type(lexers[lang]))
+        elif lang in lexer_classes:
+            lexer = class_name(lexer_classes[lang])
+        else:
+            lexer = lang
+        return content_key(
+            source,
+            lang,
+            lexer,
+            repr(sorted((opts or {}).items())),
+            str(force),
+            repr(sorted(kwargs.items())),
+            highlighter.dest,
+            str(highlighter.latex_engine),
+            class_name(highlighter.formatter),
+            repr(sorted(highlighter.formatter_args.items())),
+            package_version("Pygments"),
+            package_version("tree-sitter-matlab"),
+            package_version("sphinxcontrib-matlabdomain"),
+        )
+
+    def get(self, key):
+        """Return the highlighted code stored for *key* or ``None``."""
+        highlighted = self.disk.get(key) if self.disk is not None else None
+        if highlighted is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return highlighted
+
+    def put(self, key, highlighted):
+        """Store the *highlighted* code for *key*."""
+        if self.disk is not None:
+            self.disk.put(key, highlighted)
+
+
+#: Highlighted MATLAB code.
+highlight_cache = HighlightCache()
+
+
+class CachedHighlighter:
+    """Wrap the :class:`PygmentsBridge` *highlighter* of a builder to look up
+    MATLAB code in *cache* before highlighting it.
+    """
+
+    def __init__(self, highlighter, cache):
+        self.highlighter = highlighter
+        self.cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self.highlighter, name)
+
+    def highlight_block(
+        self, source, lang, opts=None, force=False, location=None, **kwargs
+    ):
+        if lang not in MATLAB_LANGUAGES:
+            return self.highlighter.highlight_block(
+                source, lang, opts, force, location, **kwargs
+            )
+        if not isinstance(source, str):
+            source = source.decode()
+        key = self.cache.key(self.highlighter, source, lang, opts, force, kwargs)
+        highlighted = self.cache.get(key)
+        if highlighted is None:
+            highlighted = self.highlighter.highlight_block(
+                source, lang, opts, force, location, **kwargs
+            )
+            self.cache.put(key, highlighted)
+        return highlighted
+
+
+def setup_highlight_cache(app):
+    """Cache the MATLAB code highlighted by the builder of *app*.
+
+    The cache is stored in ``matlab_cache_dir`` or next to the environment in
+    the doctree folder.
+    """
+    config = app.config
+    if not config.matlab_cache_highlight or not hasattr(app.builder, "highlighter"):
+        highlight_cache.reset()
+        return
+    if config.matlab_cache_dir:
+        directory = os.path.join(app.srcdir, config.matlab_cache_dir, "highlight")
+    else:
+        directory = os.path.join(app.doctreedir, "matlab_highlight")
+    highlight_cache.reset(
+        DiskCache(os.path.normpath(directory), config.matlab_cache_max_size)
+    )
+    if not isinstance(app.builder.highlighter, CachedHighlighter):
+        app.builder.highlighter = CachedHighlighter(
+            app.builder.highlighter, highlight_cache
+        )
@@ -0,0 +1,186 @@
+"""sphinxcontrib.mat_profile.
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Timing and counters of the build phases, for ``matlab_profile``.
+
+:copyright: Copyright by the sphinxcontrib-matlabdomain team, see AUTHORS.
+:license: BSD, see LICENSE for details.
+"""
+
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+from sphinx.util.logging import getLogger
+
+logger = getLogger("matlab-domain")
+
+__all__ = [
+    "MatProfiler",
+    "profiler",
+    "report_profile",
+]
+
+#: Number of files listed in the ``slowest_files`` of the report.
+SLOWEST_FILES = 10
+
+#: Name of the JSON report in the output directory.
+REPORT_NAME = "matlab_profile.json"
+
+#: Name of the ``cProfile`` statistics in the output directory.
+STATS_NAME = "matlab_profile.prof"
+
+
+class MatProfiler:
+    """Wall time of the phases of the extension and counters.
+
+    Nothing is recorded unless :attr:`enabled` is set by :meth:`reset`, the
+    instrumented code checks it before calling any other method. Phases of the
+    same name that are nested, e.g. documenters generating their members, are
+    timed once by the outermost phase.
+    """
+
+    def __init__(self):
+        #: whether to record phases and counters
+        self.enabled = False
+        #: ``cProfile.Profile`` enabled inside phases or ``None``
+        self.cprofile = None
+        #: phase name to ``[calls, seconds]``
+        self.phases = {}
+        #: counter name to count
+        self.counters = {}
+        #: file name to seconds spent parsing it
+        self.files = {}
+        #: cache name to ``(hits, misses)``
+        self.caches = {}
+        self._active = {}
+        self._depth = 0
+
+    def reset(self, mode=False):
+        """Clear the records and enable the profiler for *mode*, the value of
+        ``matlab_profile``: ``True`` or ``"cprofile"`` to also collect
+        ``cProfile`` statistics of the phases.
+        """
+        self.enabled = bool(mode)
+        self.cprofile = cProfile.Profile() if mode == "cprofile" else None
+        self.phases = {}
+        self.counters = {}
+        self.files = {}
+        self.caches = {}
+        self._active = {}
+        self._depth = 0
+
+    def phase(self, name):
+        """Return a context manager timing the phase *name*."""
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name):
+        if self._active.get(name):
+            self._active[name] += 1
+            try:
+                yield
+            finally:
+                self._active[name] -= 1
+            return
+
+        self._active[name] = 1
+        if self.cprofile is not None and not self._depth:
+            self.cprofile.enable()
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._depth -= 1
+            if self.cprofile is not None and not self._depth:
+                self.cprofile.disable()
+            self._active[name] = 0
+            record = self.phases.setdefault(name, [0, 0.0])
+            record[0] += 1
+            record[1] += elapsed
+
+    def count(self, name, number=1):
+        """Add *number* to the counter *name*."""
+        self.counters[name] = self.counters.get(name, 0) + number
+
+    def parsed(self, filename, seconds):
+        """Record that parsing *filename* took *seconds*."""
+        self.files[filename] = self.files.get(filename, 0.0) + seconds
+
+    def cache(self, name, hits, misses):
+        """Record the *hits* and *misses* of the cache *name*."""
+        self.caches[name] = (hits, misses)
+
+    def report(self):
+        """Return the records as a dictionary, as written to the report."""
+        parse_seconds = sum(self.files.values())
+        slowest = sorted(self.files.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "phases": {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in self.phases.items()
+            },
+            "parsing": {
+                "files": len(self.files),
+                "seconds": parse_seconds,
+                "files_per_second": (
+                    len(self.files) / parse_seconds if parse_seconds else None
+                ),
+                "slowest_files": [
+                    {"file": filename, "seconds": seconds}
+                    for filename, seconds in slowest[:SLOWEST_FILES]
+                ],
+            },
+            "counters": dict(self.counters),
+            "caches": {
+                name: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": hits / (hits + misses) if hits + misses else None,
+                }
+                for name, (hits, misses) in self.caches.items()
+            },
+        }
+
+    def summary(self):
+        """Return a line summarizing the records."""
+        parts = [
+            f"{name} {seconds:.2f} s"
+            for name, (_, seconds) in sorted(
+                self.phases.items(), key=lambda item: item[1][1], reverse=True
+            )
+        ]
+        if self.files:
+            parse_seconds = sum(self.files.values())
+            parts.append(f"parsed {len(self.files)} files in {parse_seconds:.2f} s")
+        for name, (hits, misses) in self.caches.items():
+            if hits + misses:
+                parts.append(f"{name} cache {100 * hits / (hits + misses):.0f}% hits")
+        return ", ".join(parts)
+
+
+#: Records of the current build.
+profiler = MatProfiler()
+
+
+def report_profile(app, exception):  # noqa: ARG001
+    """Write the records of :data:`profiler` to the output directory."""
+    if not profiler.enabled:
+        return
+    os.makedirs(app.outdir, exist_ok=True)
+    path = os.path.join(app.outdir, REPORT_NAME)
+    with open(path, "w", encoding="utf-8") as report:
+        json.dump(profiler.report(), report, indent=2)
+    if profiler.cprofile is not None:
+        profiler.cprofile.dump_stats(os.path.join(app.outdir, STATS_NAME))
+    logger.info(
+        "[sphinxcontrib-matlabdomain] Profile: %s. Report written to %s.",
+        profiler.summary(),
+        path,
+    )
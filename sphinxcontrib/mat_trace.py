@@ -0,0 +1,95 @@
+"""sphinxcontrib.mat_trace.
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Debug messages and trace events of the analysis, for ``matlab_trace``.
+
+:copyright: Copyright by the sphinxcontrib-matlabdomain team, see AUTHORS.
+:license: BSD, see LICENSE for details.
+"""
+
+import json
+import os
+import time
+
+from sphinx.util.logging import getLogger
+
+logger = getLogger("matlab-domain")
+
+__all__ = [
+    "MatTracer",
+    "close_trace",
+    "setup_trace",
+    "tracer",
+]
+
+
+class MatTracer:
+    """Events of the discovery and parsing of MATLAB files.
+
+    An event is logged as a debug message when Sphinx shows them, i.e. with
+    ``-vv``, and written as a line of JSON to the ``matlab_trace`` file. The
+    callers check :attr:`enabled` before calling :meth:`event`, so that no
+    message is made when neither is the case.
+    """
+
+    def __init__(self):
+        #: whether events are logged or written
+        self.enabled = False
+        #: whether events are logged as debug messages
+        self.debug = False
+        #: trace file or ``None``
+        self.file = None
+        self._start = time.perf_counter()
+
+    def reset(self, debug=False, path=None):
+        """Log events as debug messages if *debug* and write them to the file
+        *path* if given.
+        """
+        self.close()
+        self.debug = debug
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # One line per event, also when written by worker processes.
+            self.file = open(path, "w", encoding="utf-8", buffering=1)  # noqa: SIM115
+        self._start = time.perf_counter()
+        self.enabled = self.debug or self.file is not None
+
+    def event(self, event, /, **fields):
+        """Log and write the *event* with *fields*."""
+        if self.debug:
+            logger.debug(
+                "[sphinxcontrib-matlabdomain] %s: %s",
+                event,
+                ", ".join(f"{key}={value!r}" for key, value in fields.items()),
+            )
+        if self.file is not None:
+            record = {
+                "time": round(time.perf_counter() - self._start, 6),
+                "event": event,
+                **fields,
+            }
+            self.file.write(json.dumps(record, default=str) + "\n")
+
+    def close(self):
+        """Close the trace file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.enabled = self.debug
+
+
+#: Events of the current build.
+tracer = MatTracer()
+
+
+def setup_trace(app):
+    """Set up :data:`tracer` for the verbosity and ``matlab_trace`` of *app*."""
+    path = app.config.matlab_trace
+    if path:
+        # Interpret `matlab_trace` relative to the sphinx source directory.
+        path = os.path.normpath(os.path.join(app.srcdir, path))
+    tracer.reset(app.verbosity > 1, path)
+
+
+def close_trace(app, exception):  # noqa: ARG001
+    tracer.close()
@@ -0,0 +1,247 @@
+"""sphinxcontrib.mat_tree_sitter_lexer.
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Pygments lexer making the tokens of the MATLAB lexer from a tree-sitter parse.
+
+:copyright: Copyright by the sphinxcontrib-matlabdomain team, see AUTHORS.
+:license: BSD, see LICENSE for details.
+"""
+
+from pygments.lexer import Lexer
+from pygments.token import (
+    Comment,
+    Keyword,
+    Name,
+    Number,
+    Operator,
+    Punctuation,
+    String,
+    Text,
+)
+
+from .mat_lexer import MatlabLexer
+from .mat_tree_sitter_parser import get_parser
+
+__all__ = ["TreeSitterMatlabLexer"]
+
+#: Keywords highlighted by :class:`MatlabLexer`.
+KEYWORDS = frozenset(
+    (
+        "arguments",
+        "break",
+        "case",
+        "catch",
+        "classdef",
+        "continue",
+        "else",
+        "elseif",
+        "end",
+        "enumeration",
+        "events",
+        "for",
+        "function",
+        "global",
+        "if",
+        "methods",
+        "otherwise",
+        "parfor",
+        "persistent",
+        "properties",
+        "return",
+        "spmd",
+        "switch",
+        "try",
+        "while",
+    )
+)
+
+#: Token types of the operators and punctuation of the grammar.
+SYMBOLS = {
+    **dict.fromkeys(
+        (
+            "-",
+            "==",
+            "~=",
+            "<",
+            ">",
+            "<=",
+            ">=",
+            "&&",
+            "&",
+            "~",
+            "|",
+            "||",
+            ".*",
+            "*",
+            "+",
+            ".^",
+            ".\\",
+            "./",
+            "/",
+            "\\",
+            "'",
+            ".'",
+        ),
+        Operator,
+    ),
+    **dict.fromkeys(
+        ("[", "]", "(", ")", "{", "}", ":", "@", ".", ",", "=", ";"), Punctuation
+    ),
+}
+
+#: Names highlighted as builtins.
+BUILTINS = frozenset(MatlabLexer.elfun + MatlabLexer.specfun + MatlabLexer.elmat)
+
+#: Children of a function definition holding its outputs and arguments, which
+#: are highlighted as text.
+SIGNATURE_TYPES = frozenset(("function_arguments", "function_output"))
+
+#: Token types in the outputs and arguments of a function definition.
+SIGNATURE = {
+    "(": Punctuation,
+    ")": Punctuation,
+    "=": Punctuation,
+}
+
+#: Nodes holding comments.
+COMMENT_TYPES = frozenset(("comment", "line_continuation"))
+
+#: Nodes lexed by :meth:`TreeSitterMatlabLexer.lex_node`.
+LEXED_TYPES = COMMENT_TYPES | {"command_argument"}
+
+
+def name_type(node):
+    """Token type of a word, as highlighted by :class:`MatlabLexer`."""
+    value = node.text.decode("utf-8")
+    if value in KEYWORDS:
+        previous = node.prev_sibling
+        if previous is None or previous.type != ".":
+            return Keyword
+    if value in BUILTINS:
+        return Name.Builtin
+    return Name
+
+
+class TreeSitterMatlabLexer(Lexer):
+    """For Matlab source code, using the tree-sitter MATLAB grammar.
+
+    Yields the same token types as :class:`~sphinxcontrib.mat_lexer.MatlabLexer`,
+    but from a single parse of the code instead of trying one regular
+    expression after the other at each position. The arguments of commands,
+    e.g. ``hold on``, are lexed by :class:`MatlabLexer`.
+    """
+
+    name = "Matlab (tree-sitter)"
+    aliases = ["matlab"]
+    filenames = ["*.m"]
+    mimetypes = ["text/matlab"]
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.fallback = MatlabLexer(**options)
+
+    def get_tokens_unprocessed(self, text):
+        data = text.encode("utf-8")
+        tree = get_parser().parse(data)
+        pos = 0  # position in text
+        end = 0  # byte offset in data
+        for start, stop, tokentype, node in self.get_leaves(tree.root_node):
+            if start > end:
+                gap = data[end:start].decode("utf-8")
+                yield pos, Text, gap
+                pos += len(gap)
+            value = data[start:stop].decode("utf-8")
+            if tokentype is None:
+                for index, tokentype, token in self.lex_node(node, value):
+                    yield pos + index, tokentype, token
+            else:
+                yield pos, tokentype, value
+            pos += len(value)
+            end = stop
+        if end < len(data):
+            yield pos, Text, data[end:].decode("utf-8")
+
+    def get_leaves(self, root):
+        """Yield ``(start_byte, end_byte, tokentype, node)`` for the tokens of
+        the tree. The token type is None for nodes lexed by :meth:`lex_node`.
+        """
+        stack = [(root, False)]
+        while stack:
+            node, signature = stack.pop()
+            nodetype = node.type
+            if signature and nodetype not in COMMENT_TYPES:
+                # The outputs and arguments of a function definition.
+                if node.child_count:
+                    stack.extend((child, True) for child in reversed(node.children))
+                elif node.start_byte < node.end_byte:
+                    yield (
+                        node.start_byte,
+                        node.end_byte,
+                        SIGNATURE.get(nodetype, Text),
+                        node,
+                    )
+            elif nodetype in LEXED_TYPES:
+                yield node.start_byte, node.end_byte, None, node
+            elif nodetype == "identifier":
+                yield node.start_byte, node.end_byte, self.identifier_type(node), node
+            elif nodetype == "string":
+                yield node.start_byte, node.end_byte, String, node
+            elif nodetype == "number":
+                yield node.start_byte, node.end_byte, self.number_type(node), node
+            elif nodetype == "command" and node.text.startswith(b"!"):
+                yield node.start_byte, node.end_byte, String.Other, node
+            elif node.child_count:
+                signature = nodetype == "function_definition"
+                stack.extend(
+                    (child, signature and child.type in SIGNATURE_TYPES)
+                    for child in reversed(node.children)
+                )
+            elif node.start_byte < node.end_byte:
+                yield node.start_byte, node.end_byte, self.leaf_type(node), node
+
+    @staticmethod
+    def identifier_type(node):
+        if node.parent.type == "function_definition":
+            return Name.Function
+        return name_type(node)
+
+    @staticmethod
+    def number_type(node):
+        if node.text.isdigit():
+            return Number.Integer
+        return Number.Float
+
+    @staticmethod
+    def leaf_type(node):
+        if node.type in ("get.", "set.") and node.parent.type == "function_definition":
+            return Name.Function
+        if node.is_named or node.type.isidentifier():
+            return name_type(node)
+        return SYMBOLS.get(node.type, Text)
+
+    def lex_node(self, node, value):
+        """Yield the ``(index, tokentype, value)`` tokens of comments and
+        command arguments.
+        """
+        if node.type == "command_argument":
+            yield from self.fallback.get_tokens_unprocessed(value)
+            return
+        if value.startswith("%{"):
+            yield 0, Comment.Multiline, value
+            return
+        # Consecutive line comments are one node.
+        index = 0
+        for line in value.splitlines(keepends=True):
+            comment = line.lstrip()
+            if comment != line:
+                yield index, Text, line[: len(line) - len(comment)]
+            content = comment.rstrip("\r\n")
+            if content:
+                yield index + len(line) - len(comment), Comment, content
+            if len(content) < len(comment):
+                yield (
+                    index + len(line) - len(comment) + len(content),
+                    Text,
+                    (comment[len(content) :]),
+                )
+            index += len(line)
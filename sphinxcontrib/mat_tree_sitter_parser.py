@@ -1,8 +1,11 @@
 import re
+import sys
+import threading
+from functools import cache
 from importlib.metadata import version
 
 import tree_sitter_matlab as tsml
-from tree_sitter import Language
+from tree_sitter import Language, Parser
 
 # Attribute default dictionary used to give default values
 # for e.g. `Abstract` or `Static` when used without
@@ -41,14 +44,87 @@ MATLAB_ATTRIBUTE_DEFAULTS = {
 }
 
 
-tree_sitter_ver = tuple(int(sec) for sec in version("tree_sitter").split("."))
-if tree_sitter_ver[1] == 21:
-    ML_LANG = Language(tsml.language(), "matlab")
-else:
-    ML_LANG = Language(tsml.language())
+@cache
+def tree_sitter_version():
+    """Return the version of tree-sitter as a tuple of integers, probed once."""
+    return tuple(int(sec) for sec in version("tree_sitter").split("."))
+
+
+def tree_sitter_is_0_21():
+    """Check if tree-sitter is v0.21.* \
+        in order to use the correct language initialization and syntax.
+    """
+    return tree_sitter_version()[1] == 21
+
+
+@cache
+def get_language():
+    """Return the tree-sitter ``Language`` of MATLAB, created on first use."""
+    if tree_sitter_is_0_21():
+        return Language(tsml.language(), "matlab")
+    return Language(tsml.language())
+
+
+_parsers = threading.local()
+
+
+def get_parser():
+    """Return the tree-sitter ``Parser`` of MATLAB of the current thread.
+
+    A parser cannot be used by several threads at once, so each thread, and
+    each worker process, creates one on first use and reuses it for all files.
+    """
+    parser = getattr(_parsers, "parser", None)
+    if parser is None:
+        if tree_sitter_is_0_21():
+            parser = Parser()
+            parser.set_language(get_language())
+        else:
+            parser = Parser(get_language())
+        _parsers.parser = parser
+    return parser
+
+
+def __getattr__(name):
+    # `ML_LANG` is created on first use, like the queries.
+    if name == "ML_LANG":
+        return get_language()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazyQuery:
+    """A tree-sitter query of the MATLAB grammar, compiled on first use.
+
+    Compiling all queries takes longer than the rest of importing the
+    extension, which is wasted when no MATLAB files are parsed, e.g. with
+    ``matlab_src_dir = None``.
+
+    :param source: Source of the query.
+    :type source: str
+    """
+
+    __slots__ = ("query", "source")
+
+    def __init__(self, source):
+        self.source = source
+        #: compiled ``Query`` or ``None``
+        self.query = None
+
+    def compile(self):
+        """Return the compiled query."""
+        if self.query is None:
+            self.query = get_language().query(self.source)
+        return self.query
+
+    def matches(self, node):
+        return self.compile().matches(node)
+
+    def captures(self, node):
+        return self.compile().captures(node)
+
 
 # QUERIES
-q_classdef = ML_LANG.query(
+q_classdef = LazyQuery(
     """(class_definition
     .
     "classdef"
@@ -68,7 +144,7 @@ q_classdef = ML_LANG.query(
 """
 )
 
-q_attributes = ML_LANG.query(
+q_attributes = LazyQuery(
     """(attribute
     (identifier) @name
     [
@@ -82,9 +158,9 @@ q_attributes = ML_LANG.query(
     """
 )
 
-q_supers = ML_LANG.query("""[(identifier) @secs "."]+ """)
+q_supers = LazyQuery("""[(identifier) @secs "."]+ """)
 
-q_properties = ML_LANG.query(
+q_properties = LazyQuery(
     """(properties
     .
     (attributes
@@ -95,7 +171,7 @@ q_properties = ML_LANG.query(
 """
 )
 
-q_methods = ML_LANG.query(
+q_methods = LazyQuery(
     """(methods
     (attributes
         [(attribute) @attrs _]+
@@ -105,14 +181,14 @@ q_methods = ML_LANG.query(
 """
 )
 
-q_enumerations = ML_LANG.query(
+q_enumerations = LazyQuery(
     """(enumeration
     [(enum) @enums _]+
     ) @enum_block
 """
 )
 
-q_events = ML_LANG.query(
+q_events = LazyQuery(
     """(events
     (attributes
         [(attribute) @attrs _]+
@@ -122,7 +198,7 @@ q_events = ML_LANG.query(
 """
 )
 
-q_property = ML_LANG.query(
+q_property = LazyQuery(
     """
     (property name: (identifier) @name
      (dimensions
@@ -140,7 +216,7 @@ q_property = ML_LANG.query(
 """
 )
 
-q_old_property = ML_LANG.query(
+q_old_property = LazyQuery(
     """
     (property name: (identifier) @name
      (identifier) @type
@@ -151,7 +227,7 @@ q_old_property = ML_LANG.query(
 """
 )
 
-q_enum = ML_LANG.query(
+q_enum = LazyQuery(
     """(enum
     .
     (identifier) @name
@@ -160,7 +236,7 @@ q_enum = ML_LANG.query(
 """
 )
 
-q_fun = ML_LANG.query(
+q_fun = LazyQuery(
     """(function_definition
     _*
     (function_output
@@ -185,7 +261,7 @@ q_fun = ML_LANG.query(
 """
 )
 
-q_argblock = ML_LANG.query(
+q_argblock = LazyQuery(
     """
     (arguments_statement
     .
@@ -198,7 +274,7 @@ q_argblock = ML_LANG.query(
 """
 )
 
-q_arg = ML_LANG.query(
+q_arg = LazyQuery(
     """
     (property name:
         [
@@ -220,7 +296,7 @@ q_arg = ML_LANG.query(
 """
 )
 
-q_script = ML_LANG.query(
+q_script = LazyQuery(
     """
     (source_file
         (comment)? @docstring
@@ -228,24 +304,72 @@ q_script = ML_LANG.query(
     """
 )
 
-q_get_set = ML_LANG.query("""["get." "set."]""")
+q_get_set = LazyQuery("""["get." "set."]""")
 
-q_line_continuation = ML_LANG.query("(line_continuation) @lc")
+q_line_continuation = LazyQuery("(line_continuation) @lc")
 
+#: Top-level nodes that may precede the class or function definition of a file.
+LEADING_TYPES = frozenset(("comment", "line_continuation"))
+
+#: Definitions that make a file a class or a function.
+DEFINITION_TYPES = frozenset(("class_definition", "function_definition"))
+
+
+# Version of the model extracted by the parsers below. Must be increased when
+# the parsers change what they extract, as it is part of the parse cache key.
+PARSER_VERSION = 4
 
 re_percent_remove = re.compile(r"^[ \t]*% ?", flags=re.MULTILINE)
 re_trim_line = re.compile(r"^[ \t]*", flags=re.MULTILINE)
 re_assign_remove = re.compile(r"^=[ \t]*")
 
 
-def tree_sitter_is_0_21():
-    """Check if tree-sitter is v0.21.* \
-        in order to use the correct language initialization and syntax.
+def find_definition(root_node):
+    """Return the class or function definition of the file *root_node*.
+
+    Functions and classes always start with a keyword, so only the top-level
+    nodes up to the first one that is not a comment are inspected. Returns
+    ``None`` for scripts.
     """
-    if not hasattr(tree_sitter_is_0_21, "is_21"):
-        tree_sitter_ver = tuple(int(sec) for sec in version("tree_sitter").split("."))
-        tree_sitter_is_0_21.is_21 = tree_sitter_ver[1] == 21  # memoize
-    return tree_sitter_is_0_21.is_21
+    node = root_node.named_child(0) if root_node.named_child_count else None
+    while node is not None:
+        if node.type in DEFINITION_TYPES:
+            return node
+        if node.type not in LEADING_TYPES:
+            return None
+        node = node.next_named_sibling
+    return None
+
+
+def match_classdef(cls_node):
+    """Return the captures of :data:`q_classdef` for the class definition
+    *cls_node*.
+
+    Only the children of *cls_node* up to its docstring are inspected, instead
+    of running the query over the whole class.
+    """
+    class_match = {"class": cls_node}
+    for node in cls_node.named_children:
+        nodetype = node.type
+        if "name" not in class_match:
+            if nodetype == "attributes":
+                class_match["attrs"] = [
+                    attr for attr in node.named_children if attr.type == "attribute"
+                ]
+            elif nodetype == "identifier":
+                class_match["name"] = node
+            else:
+                break
+        elif nodetype == "superclasses" and "supers" not in class_match:
+            class_match["supers"] = [
+                sup for sup in node.named_children if sup.type == "property_name"
+            ]
+        elif nodetype == "comment":
+            class_match["docstring"] = node
+            break
+        else:
+            break
+    return class_match
 
 
 def get_row(point):
@@ -286,6 +410,122 @@ def process_default(node, encoding):
     return re.sub(re_trim_line, "", default)
 
 
+def decode_name(node, encoding):
+    """Decode the text of *node* and intern it.
+
+    Used for names that repeat throughout a project, like attribute names and
+    types, so that each is stored once.
+    """
+    return sys.intern(node.text.decode(encoding, errors="backslashreplace"))
+
+
+_attribute_dicts = {}
+
+
+def intern_attributes(attrs):
+    """Return a dictionary equal to *attrs* shared by all equal dictionaries.
+
+    Most members have one of a few attribute combinations, e.g. no attributes
+    or ``{"Access": "private"}``. The returned dictionary must not be modified.
+    """
+    key = tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in attrs.items()
+    )
+    return _attribute_dicts.setdefault(key, attrs)
+
+
+class MatRecord:
+    """Compact record of a parsed member, with the fields in ``__slots__``.
+
+    Records replace the dictionaries used before and still support reading
+    them like one, e.g. ``record["docstring"]``, and comparing to a
+    dictionary.
+    """
+
+    __slots__ = ()
+    #: names of the fields, the ``__slots__`` of the class and its bases
+    _fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls._fields + cls.__dict__.get("__slots__", ())
+
+    def __init__(self, **fields):
+        for name in self._fields:
+            setattr(self, name, fields.get(name))
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._fields else default
+
+    def keys(self):
+        return list(self._fields)
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self._fields]
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if isinstance(other, (MatRecord, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"{self.__class__.__name__}({fields})"
+
+
+class PropertyRecord(MatRecord):
+    """Details of a property of a class."""
+
+    # In the order of the fields of the dictionaries used before.
+    __slots__ = ("attrs", "size", "type", "validators", "default", "docstring")  # noqa: RUF023
+
+
+class ArgumentRecord(PropertyRecord):
+    """Details of an argument of a function, from an ``arguments`` block."""
+
+    __slots__ = ()
+
+
+class EnumerationRecord(MatRecord):
+    """Details of an enumeration of a class."""
+
+    __slots__ = ("args", "docstring")
+
+
+class EventRecord(MatRecord):
+    """Details of an event of a class."""
+
+    __slots__ = ("attrs", "docstring")
+
+
+def parse_supers(supers_nodes, encoding):
+    """Return the dotted names of the superclasses in *supers_nodes*."""
+    supers = []
+    if supers_nodes is not None:
+        for super_node in supers_nodes:
+            _, super_match = q_supers.matches(super_node)[0]
+            super_cls = [
+                sec.text.decode(encoding, errors="backslashreplace")
+                for sec in super_match.get("secs")
+            ]
+            supers.append(".".join(super_cls))
+    return supers
+
+
 class MatScriptParser:
     def __init__(self, root_node, encoding):
         """Parse m script."""
@@ -303,11 +543,26 @@ class MatScriptParser:
             self.docstring = None
 
 
+class MatFunctionHeaderParser:
+    def __init__(self, fun_node, encoding):
+        """Parse only the name of the function definition *fun_node*.
+
+        The rest is parsed by :class:`MatFunctionParser` when the function is
+        documented.
+        """
+        self.encoding = encoding
+        self.name = None
+        name_node = fun_node.child_by_field_name("name")
+        if name_node is not None:
+            self.name = name_node.text.decode(self.encoding, errors="backslashreplace")
+
+
 class MatFunctionParser:
-    def __init__(self, root_node, encoding):
-        """Parse Function definition."""
+    def __init__(self, fun_node, encoding):
+        """Parse the function definition *fun_node*."""
         self.encoding = encoding
-        _, fun_match = q_fun.matches(root_node)[0]
+        # The first match is the function itself, then its nested functions.
+        _, fun_match = q_fun.matches(fun_node)[0]
         self.name = fun_match.get("name").text.decode(
             self.encoding, errors="backslashreplace"
         )
@@ -386,17 +641,12 @@ class MatFunctionParser:
             dims_list = arg_match.get("dims")
             dims = None
             if dims_list is not None:
-                dims = tuple(
-                    dim.text.decode(self.encoding, errors="backslashreplace")
-                    for dim in dims_list
-                )
+                dims = tuple(decode_name(dim, self.encoding) for dim in dims_list)
 
             # extract type
             type_node = arg_match.get("type")
             typename = (
-                type_node.text.decode(self.encoding, errors="backslashreplace")
-                if type_node is not None
-                else None
+                decode_name(type_node, self.encoding) if type_node is not None else None
             )
 
             # extract validator functions
@@ -518,14 +768,14 @@ class MatFunctionParser:
             # Here we trust that the person is giving us valid matlab.
             arg_loc = self.retv if "Output" in attrs else self.args
             if len(name) == 1:
-                arg_loc[name[0]] = {
-                    "attrs": attrs,
-                    "size": dims,
-                    "type": typename,
-                    "validators": vfs,
-                    "default": default,
-                    "docstring": docstring,
-                }
+                arg_loc[name[0]] = ArgumentRecord(
+                    attrs=attrs,
+                    size=dims,
+                    type=typename,
+                    validators=vfs,
+                    default=default,
+                    docstring=docstring,
+                )
             else:
                 pass
                 # TODO
@@ -535,13 +785,56 @@ class MatFunctionParser:
         attrs = {}
         if attrs_nodes is not None:
             for attr_node in attrs_nodes:
-                name = attr_node.text.decode(self.encoding, errors="backslashreplace")
-                attrs[name] = None
-        return attrs
+                attrs[decode_name(attr_node, self.encoding)] = None
+        return intern_attributes(attrs)
+
+
+class MatClassHeaderParser:
+    def __init__(self, cls_node, encoding):
+        """Parse the name, superclasses and member names of the class
+        definition *cls_node*.
+
+        This is all that is needed to analyze the source folder and to
+        auto-link names. The rest is parsed by :class:`MatClassParser` when the
+        class is documented. The member names are in the same order as the
+        keys of the dictionaries of :class:`MatClassParser`.
+        """
+        self.encoding = encoding
+        class_match = match_classdef(cls_node)
+        self.name = class_match.get("name").text.decode(
+            self.encoding, errors="backslashreplace"
+        )
+        self.supers = parse_supers(class_match.get("supers"), self.encoding)
+
+        properties = {}
+        for _, prop_match in q_properties.matches(cls_node):
+            for prop in prop_match.get("properties") or []:
+                properties[self._decode(prop.child_by_field_name("name"))] = None
+
+        methods = {}
+        for _, methods_match in q_methods.matches(cls_node):
+            for method in methods_match.get("methods") or []:
+                # Skip getter and setter, as MatClassParser does
+                if len(q_get_set.matches(method)) > 0:
+                    continue
+                methods[self._decode(method.child_by_field_name("name"))] = None
+
+        enumerations = {}
+        for _, enum_match in q_enumerations.matches(cls_node):
+            for enum in enum_match.get("enums") or []:
+                _, name_match = q_enum.matches(enum)[0]
+                enumerations[self._decode(name_match.get("name"))] = None
+
+        self.property_names = list(properties)
+        self.method_names = list(methods)
+        self.enumeration_names = list(enumerations)
+
+    def _decode(self, node):
+        return node.text.decode(self.encoding, errors="backslashreplace")
 
 
 class MatClassParser:
-    def __init__(self, root_node, encoding):
+    def __init__(self, cls_node, encoding):
         # DATA
         self.encoding = encoding
         self.name = ""
@@ -553,27 +846,18 @@ class MatClassParser:
         self.enumerations = {}
         self.events = {}
 
-        self.root_node = root_node
-
-        # Parse class basics
-        class_matches = q_classdef.matches(root_node)
-        _, class_match = class_matches[0]
-        self.cls = class_match.get("class")
-        self.name = class_match.get("name")
+        # Parse class basics. No tree nodes are kept, so parsed classes can be
+        # pickled and stored in the parse cache.
+        class_match = match_classdef(cls_node)
+        self.name = class_match.get("name").text.decode(
+            self.encoding, errors="backslashreplace"
+        )
 
         # Parse class attrs and supers
         attrs_nodes = class_match.get("attrs")
         self.attrs = self._parse_attributes(attrs_nodes)
 
-        supers_nodes = class_match.get("supers")
-        if supers_nodes is not None:
-            for super_node in supers_nodes:
-                _, super_match = q_supers.matches(super_node)[0]
-                super_cls = [
-                    sec.text.decode(self.encoding, errors="backslashreplace")
-                    for sec in super_match.get("secs")
-                ]
-                self.supers.append(".".join(super_cls))
+        self.supers = parse_supers(class_match.get("supers"), self.encoding)
 
         # get docstring and check that it consecutive
         docstring_node = class_match.get("docstring")
@@ -595,10 +879,10 @@ class MatClassParser:
                     )
         self.docstring = docstring
 
-        prop_matches = q_properties.matches(self.cls)
-        method_matches = q_methods.matches(self.cls)
-        enum_matches = q_enumerations.matches(self.cls)
-        event_matches = q_events.matches(self.cls)
+        prop_matches = q_properties.matches(cls_node)
+        method_matches = q_methods.matches(cls_node)
+        enum_matches = q_enumerations.matches(cls_node)
+        event_matches = q_events.matches(cls_node)
 
         for _, prop_match in prop_matches:
             self._parse_property_section(prop_match)
@@ -620,19 +904,14 @@ class MatClassParser:
             # match property to extract details
             _, prop_match = q_property.matches(prop)[0]
             # extract name (this is always available so no need for None check)
-            name = prop_match.get("name").text.decode(
-                self.encoding, errors="backslashreplace"
-            )
+            name = decode_name(prop_match.get("name"), self.encoding)
 
             # extract dims list
             size_type = prop_match.get("size_type")
             dims_list = prop_match.get("dims")
             dims = None
             if dims_list is not None:
-                dims = tuple(
-                    dim.text.decode(self.encoding, errors="backslashreplace")
-                    for dim in dims_list
-                )
+                dims = tuple(decode_name(dim, self.encoding) for dim in dims_list)
             elif size_type is None:
                 dims = None
             elif size_type.text == b"scalar":
@@ -654,9 +933,7 @@ class MatClassParser:
             # extract type
             type_node = prop_match.get("type")
             typename = (
-                type_node.text.decode(self.encoding, errors="backslashreplace")
-                if type_node is not None
-                else None
+                decode_name(type_node, self.encoding) if type_node is not None else None
             )
 
             # extract default
@@ -761,14 +1038,14 @@ class MatClassParser:
             # After all that if our docstring is empty then we have none
             if not docstring.strip():
                 docstring = None
-            self.properties[name] = {
-                "attrs": attrs,
-                "size": dims,
-                "type": typename,
-                "validators": vfs,
-                "default": default,
-                "docstring": docstring,
-            }
+            self.properties[name] = PropertyRecord(
+                attrs=attrs,
+                size=dims,
+                type=typename,
+                validators=vfs,
+                default=default,
+                docstring=docstring,
+            )
 
     def _parse_method_section(self, methods_match):
         methods = methods_match.get("methods")
@@ -849,7 +1126,7 @@ class MatClassParser:
             # After all that if our docstring is empty then we have none
             if docstring.strip() == "":
                 docstring = None
-            self.enumerations[name] = {"args": args, "docstring": docstring}
+            self.enumerations[name] = EnumerationRecord(args=args, docstring=docstring)
 
     def _parse_event_section(self, events_match):
         attrs_nodes = events_match.get("attrs")
@@ -906,29 +1183,24 @@ class MatClassParser:
             # After all that if our docstring is empty then we have none
             if docstring.strip() == "":
                 docstring = None
-            self.events[name] = {"attrs": attrs, "docstring": docstring}
+            self.events[name] = EventRecord(attrs=attrs, docstring=docstring)
 
     def _parse_attributes(self, attrs_nodes):
         attrs = {}
         if attrs_nodes is not None:
             for attr_node in attrs_nodes:
                 _, attr_match = q_attributes.matches(attr_node)[0]
-                name = attr_match.get("name").text.decode(
-                    self.encoding, errors="backslashreplace"
-                )
+                name = decode_name(attr_match.get("name"), self.encoding)
                 value_node = attr_match.get("value")
                 rhs_node = attr_match.get("rhs")
                 if rhs_node is not None:
                     if rhs_node.type == "cell":
                         attrs[name] = [
-                            vn.text.decode(self.encoding, errors="backslashreplace")
-                            for vn in value_node
+                            decode_name(vn, self.encoding) for vn in value_node
                         ]
                     else:
-                        attrs[name] = value_node[0].text.decode(
-                            self.encoding, errors="backslashreplace"
-                        )
+                        attrs[name] = decode_name(value_node[0], self.encoding)
                 else:
                     attrs[name] = MATLAB_ATTRIBUTE_DEFAULTS.get(name)
 
-        return attrs
+        return intern_attributes(attrs)
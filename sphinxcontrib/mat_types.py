@@ -9,18 +9,27 @@ Types for MATLAB.
 
 import builtins
 import os
+import time
 import xml.etree.ElementTree as ET
-from importlib.metadata import version
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
 from zipfile import ZipFile
 
 from sphinx.util.logging import getLogger
-from tree_sitter import Parser
 
+from sphinxcontrib.mat_cache import DiskCache, content_key, package_version
+from sphinxcontrib.mat_profile import profiler
+from sphinxcontrib.mat_trace import tracer
 from sphinxcontrib.mat_tree_sitter_parser import (
-    ML_LANG,
+    PARSER_VERSION,
+    MatClassHeaderParser,
     MatClassParser,
+    MatFunctionHeaderParser,
     MatFunctionParser,
     MatScriptParser,
+    find_definition,
+    get_parser,
 )
 
 logger = getLogger("matlab-domain")
@@ -99,18 +108,290 @@ MATLAB_METHOD_ATTRIBUTE_TYPES = {
     "TestTags": list,
 }
 
+
+class MatSymbol:
+    """An entity of :class:`MatSymbolTable` that can be auto-linked.
+
+    :param name: Name of the entity in the symbol table.
+    :type name: str
+    :param entity: The class or function.
+    :type entity: :class:`MatClass` or :class:`MatFunction`
+    """
+
+    __slots__ = ("entity", "name", "role", "target")
+
+    def __init__(self, name, entity):
+        self.name = name
+        self.entity = entity
+        #: role of references to the entity, ``"class"`` or ``"func"``
+        self.role = entity.ref_role()
+        #: name to link to, without '+' in package names
+        self.target = name.replace("+", "")
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: "{self.name}">'
+
+
+class MatSymbolTable:
+    """All MATLAB entities found in ``matlab_src_dir`` and their names.
+
+    An entity can be known by several names. Example:
+
+    * ``target.+package.@ClassBar.ClassBar``, the full dotted path relative to
+      the root, see :attr:`canonical`.
+    * ``target.package.@ClassBar.ClassBar``, the full dotted path without '+'
+      in package names, see :attr:`stripped`.
+    * ``target.+package.ClassBar`` and ``package.ClassBar``, the class folder
+      name and the short name, see :attr:`aliases`.
+
+    The special case of a folder ``ClassName`` and a file ``ClassName.m`` in
+    the same folder has a single short name for two entities. It is stored as
+    a dictionary ``{role: entity}``.
+
+    Aliases that replace the entity of an existing name are recorded in
+    :attr:`conflicts` and logged.
+    """
+
+    def __init__(self):
+        #: full dotted paths to entities
+        self.canonical = {}
+        #: full dotted paths without '+' in package names to full dotted paths
+        self.stripped = {}
+        #: class folder and short names to entities or ``{role: entity}``
+        self.aliases = {}
+        #: all names to entities or ``{role: entity}``, see ``entities_table``
+        self.names = {}
+        #: names without '+' in package names to names, see ``entities_name_map``
+        self.name_map = {}
+        #: roles to ``{name: entity}``
+        self.roles = {}
+        #: all names of classes, also without '+' in package names, to classes
+        self.classes = {}
+        #: :class:`MatSymbol` of the classes and functions in :attr:`names`
+        self.link_symbols = []
+        #: ``(name, replaced, entity)`` of aliases replacing an existing entity
+        self.conflicts = []
+        self._links = {}
+        self._stripped_links = {}
+        #: increased by :meth:`build_indexes`, to invalidate derived data
+        self.generation = 0
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __getitem__(self, name):
+        return self.names[name]
+
+    def __len__(self):
+        return len(self.names)
+
+    def clear(self):
+        """Remove all entities."""
+        for index in (
+            self.canonical,
+            self.stripped,
+            self.aliases,
+            self.names,
+            self.name_map,
+            self.roles,
+            self.classes,
+            self.link_symbols,
+            self.conflicts,
+            self._links,
+            self._stripped_links,
+        ):
+            index.clear()
+
+    def add_tree(self, obj, path=""):
+        """Add the entities of module *obj* and its submodules recursively."""
+        for o in obj.members.values():
+            fullpath = f"{path}.{o.name}"
+            fullpath = fullpath.lstrip(".")
+            self.canonical[fullpath] = o
+            self.names[fullpath] = o
+            self.stripped[strip_package_prefix(fullpath)] = fullpath
+            self.name_map[strip_package_prefix(fullpath)] = fullpath
+            if isinstance(o, MatModule) and o.members:
+                self.add_tree(o, fullpath)
+
+    def add_root(self, root):
+        """Add the root module, with the name ``"."``."""
+        self.canonical["."] = root
+        self.names["."] = root
+
+    def add_class_folder_names(self):
+        """Add the names of the classes in class folders without the folder.
+
+        E.g. ``target.+pkg.ClassName`` for ``target.+pkg.@ClassName.ClassName``.
+        """
+        class_folder_names = {}
+        for name, entity in self.names.items():
+            alt_name = classfolder_class_name(name)
+            if name != alt_name:
+                class_folder_names[alt_name] = entity
+        for name, entity in class_folder_names.items():
+            self._add_alias(name, entity)
+
+    def add_short_names(self):
+        """Add the shortest valid MATLAB name of each entity.
+
+        E.g. ``package.ClassBar`` for ``target.+package.ClassBar`` and
+        ``Class`` for ``folder.subfolder.Class``.
+        """
+        # NOTE: Does not yet work with class folders
+        short_names = {}
+        long_names = self.names.keys()
+        for name, entity in self.names.items():
+            short_name = shortest_name(name)
+            if (
+                short_name != name
+                and not (short_name in long_names and name in long_names)
+            ) or (
+                short_name in long_names
+                and (entity.ref_role() == "func" or entity.ref_role() == "class")
+                and self.names[short_name].ref_role() == "mod"
+            ):
+                # Only handle the below special case
+                # when overwriting entries in entities_table will not
+                # introduce conflicts
+                if short_name in self.names:
+                    # Special Case - ClassName/ClassName.m
+                    existing_entity = self.names[short_name]
+                    alias = {
+                        entity.ref_role(): entity,
+                        existing_entity.ref_role(): existing_entity,
+                    }
+                else:
+                    alias = entity
+                if short_name in short_names:
+                    self._conflict(short_name, short_names[short_name], alias)
+                short_names[short_name] = alias
+                self.name_map[short_name] = short_name
+
+        for name, alias in short_names.items():
+            self.aliases[name] = alias
+            self.names[name] = alias
+
+    def _add_alias(self, name, entity):
+        existing = self.names.get(name)
+        if existing is not None and existing is not entity:
+            self._conflict(name, existing, entity)
+        self.aliases[name] = entity
+        self.names[name] = entity
+
+    def _conflict(self, name, replaced, entity):
+        # The later alias wins, as it always did, but is reported.
+        self.conflicts.append((name, replaced, entity))
+
+    def build_indexes(self):
+        """Build the indexes used for lookups, after all names are added."""
+        self.generation += 1
+        for name, value in self.names.items():
+            entities = value.values() if isinstance(value, dict) else [value]
+            for entity in entities:
+                self.roles.setdefault(entity.ref_role(), {})[name] = entity
+                if isinstance(entity, MatClass):
+                    self.classes[name] = entity
+
+            if (symbol := self._make_link_symbol(name, value)) is not None:
+                self.link_symbols.append(symbol)
+                self._links[name] = symbol
+
+        for name, entity in list(self.classes.items()):
+            self.classes.setdefault(strip_package_prefix(name), entity)
+
+        for name, fullname in self.name_map.items():
+            if (symbol := self._links.get(fullname)) is not None:
+                self._stripped_links[name] = symbol
+
+        for name, replaced, entity in self.conflicts:
+            logger.verbose(
+                "[sphinxcontrib-matlabdomain] Name %s of %r replaces %r.",
+                name,
+                entity,
+                replaced,
+            )
+        if self.conflicts:
+            logger.info(
+                "[sphinxcontrib-matlabdomain] %d ambiguous names of MATLAB "
+                "entities, run with -v to list them.",
+                len(self.conflicts),
+            )
+
+    @staticmethod
+    def _make_link_symbol(name, value):
+        if isinstance(value, dict):
+            if "class" in value:
+                value = value["class"]
+            elif "func" in value:
+                value = value["func"]
+            else:
+                return None
+        if value.ref_role() in ("class", "func"):
+            return MatSymbol(name, value)
+        return None
+
+    def get(self, name, default=None):
+        """Return the entity or ``{role: entity}`` for *name*."""
+        return self.names.get(name, default)
+
+    def module(self, name):
+        """Return the entity for *name*, the module for the special case."""
+        entity = self.names.get(name)
+        if isinstance(entity, dict):
+            return entity.get("mod")
+        return entity
+
+    def resolve(self, name, keep_package_prefix):
+        """Return the entity or ``{role: entity}`` for *name* as written in a
+        docstring, i.e. with '+' in package names if *keep_package_prefix*.
+        """
+        if keep_package_prefix:
+            return self.names.get(name)
+        if (fullname := self.name_map.get(name)) is not None:
+            return self.names[fullname]
+        return None
+
+    def find_link(self, name, keep_package_prefix):
+        """Return the :class:`MatSymbol` of the class or function *name* as
+        written in a docstring, or ``None``.
+        """
+        if keep_package_prefix:
+            return self._links.get(name)
+        return self._stripped_links.get(name)
+
+
+# All MATLAB entities that are found in `matlab_src_dir`, see `MatSymbolTable`.
+# Filled by `analyze`.
+symbol_table = MatSymbolTable()
+
 # Dictionary containing all MATLAB entities that are found in `matlab_src_dir`.
 # The dictionary keys are both the full dotted path, relative to the root.
 # Further, "short names" are added. Example:
 #   Given a dotted path of: target.+package.ClassBar
 #   Will result in a short name of: package.ClassBar
-entities_table = {}
+entities_table = symbol_table.names
 
 # Dictionary containing a map of names WITHOUT '+' in package names to
 # the corresponding names WITH '+' in the package name. This is only
 # used if "matlab_auto_link" is on AND "matlab_keep_package_prefix"
 # is True AND a docstring with "see also" is encountered.
-entities_name_map = {}
+entities_name_map = symbol_table.name_map
+
+# Dictionary containing MATLAB objects parsed ahead of time by worker processes,
+# keyed by the full path of the source file. `MatObject.matlabify` consumes the
+# entries while walking `matlab_src_dir`, so the hierarchy is built exactly as
+# in the serial case. Only populated while `analyze` runs.
+preparsed_objects = {}
+
+# Dictionary of the entities made from MATLAB files, keyed by the full path of
+# the file. Filled by `MatObject.matlabify` and used by `analyze` to remember
+# the entities for the next build.
+source_entities = {}
+
+# Below this number of source files, starting worker processes costs more than
+# parsing the files serially.
+PARALLEL_PARSE_MIN_FILES = 32
 
 
 def shortest_name(dotted_path):
@@ -157,53 +438,285 @@ def recursive_find_all(obj):
     for _, o in obj.entities:
         if isinstance(o, MatModule):
             o.safe_getmembers()
-            if o.entities:
+            if o.members:
                 recursive_find_all(o)
 
 
-def recursive_log_debug(obj, indent=""):
-    # Traverse the object hierarchy and log to debug
+def recursive_trace(obj):
+    # Traverse the object hierarchy and trace each entity. Callers check
+    # `tracer.enabled` first.
     for n, o in obj.entities:
-        logger.debug(
-            "[sphinxcontrib-matlabdomain] %s Name=%s, Entity=%s", indent, n, str(o)
-        )
-        if isinstance(o, MatModule) and o.entities:
-            indent = f"{indent} "
-            names = [n_ for n_, o_ in o.entities]
-            logger.debug("[sphinxcontrib-matlabdomain] %s Names=%s", indent, str(names))
-            recursive_log_debug(o, indent)
-            indent = indent[:-1]
         if isinstance(o, MatClass):
-            logger.debug(
-                "[sphinxcontrib-matlabdomain] %s -> name=%s, methods=%s",
-                indent,
-                str(o.name),
-                str(o.methods),
-            )
+            tracer.event("entity", name=n, entity=o, methods=o.method_names)
+        elif isinstance(o, MatModule):
+            tracer.event("entity", name=n, entity=o, members=list(o.members))
+            recursive_trace(o)
+        else:
+            tracer.event("entity", name=n, entity=o)
 
 
-def populate_entities_table(obj, path=""):
-    # Recursively scan the hiearachy of entities and populate the entities_table.
-    for _n, o in obj.entities:
-        fullpath = f"{path}.{o.name}"
-        fullpath = fullpath.lstrip(".")
-        entities_table[fullpath] = o
-        entities_name_map[strip_package_prefix(fullpath)] = fullpath
-        if isinstance(o, MatModule) and o.entities:
-            populate_entities_table(o, fullpath)
+def try_get_module_entity_or_default(entity_name):
+    return symbol_table.module(entity_name)
 
 
-def try_get_module_entity_or_default(entity_name):
-    maybe_mod = entities_table.get(entity_name)
-    if isinstance(maybe_mod, dict):
-        return maybe_mod["mod"]
-    return maybe_mod
+def scan_folder(path):
+    """Return the entries of folder *path* to visit.
+
+    :param path: Full path of the folder.
+    :type path: str
+    :returns: ``{name: (kind, filename)}`` in the order of the folder listing,
+        where *name* has no file extension and *kind* is ``"dir"``, ``"m"`` or
+        ``"mlapp"``.
+
+    The folder is read once with :func:`os.scandir`, which on most platforms
+    knows the type of each entry without calling ``stat``. Folders starting
+    with ``.`` (VCS and editors) or ``_`` (build/temp folders in Sphinx) are
+    skipped. A folder takes precedence over a file with the same name, and a
+    ``.m`` file over a ``.mlapp`` file.
+    """
+    entries = {}
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir():
+                if entry.name.startswith((".", "_")):
+                    continue
+                entries[entry.name] = ("dir", entry.path)
+            elif entry.is_file():
+                if entry.name.endswith(".m"):
+                    kind = "m"
+                elif entry.name.endswith(".mlapp"):
+                    kind = "mlapp"
+                else:
+                    continue
+                name, _ = os.path.splitext(entry.name)
+                previous = entries.get(name)
+                if previous is None or (previous[0], kind) == ("mlapp", "m"):
+                    entries[name] = (kind, entry.path)
+    return entries
+
+
+def classify_path(fullpath):
+    """Return ``(kind, filename)`` as :func:`scan_folder` for a single object.
+
+    :param fullpath: Full path of the object without file extension.
+    :type fullpath: str
+    """
+    if os.path.isdir(fullpath):
+        return "dir", fullpath
+    if os.path.isfile(f"{fullpath}.m"):
+        return "m", f"{fullpath}.m"
+    if os.path.isfile(f"{fullpath}.mlapp"):
+        return "mlapp", f"{fullpath}.mlapp"
+    return None, None
+
+
+def parse_workers(config):
+    """Return the number of processes to use for parsing MATLAB files."""
+    workers = config.matlab_parse_workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(int(workers), 1)
+
+
+def find_source_files(basedir):
+    """Return ``(filename, name, path)`` for all files that ``analyze`` visits.
+
+    Follows the same rules as :meth:`MatModule.safe_getmembers`, see
+    :func:`scan_folder`. ``path`` is relative to *basedir*, as expected by
+    :meth:`MatObject.parse_mfile`.
+    """
+    files = []
+    folders = [(basedir, "")]
+    while folders:
+        folder, path = folders.pop()
+        for name, (kind, filename) in scan_folder(folder).items():
+            if kind == "dir":
+                folders.append((filename, os.path.join(path, name)))
+            else:
+                files.append((filename, name, path))
+    return files
+
+
+def _parse_source_file(job):
+    # Worker function for `preparse_source_files`. Failures are not raised
+    # here, the file is parsed again serially to report the error. Returns
+    # the object and the time spent parsing it for `matlab_profile`.
+    filename, name, path, encoding, parse_cache, profile = job
+    MatObject.parse_cache = parse_cache
+    profiler.enabled = profile
+    try:
+        if filename.endswith(".mlapp"):
+            obj = MatObject.parse_mlappfile(filename, name, path)
+        else:
+            obj = MatObject.parse_mfile(filename, name, path, encoding)
+    except Exception:
+        return None, None
+    return obj, profiler.files.pop(filename, None)
+
+
+def preparse_source_files(sources, workers):
+    """Parse the MATLAB files *sources* using a pool of *workers* processes.
+
+    :param sources: ``(filename, name, path)`` as from :func:`find_source_files`.
+    :type sources: list
+
+    The results are stored in ``preparsed_objects`` where
+    :meth:`MatObject.matlabify` picks them up.
+    """
+    jobs = [
+        (
+            filename,
+            name,
+            path,
+            MatObject.encoding,
+            MatObject.parse_cache,
+            profiler.enabled,
+        )
+        for filename, name, path in sources
+    ]
+    if len(jobs) < max(PARALLEL_PARSE_MIN_FILES, 2):
+        return
+
+    if tracer.enabled:
+        tracer.event("preparse", files=len(jobs), workers=workers)
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_parse_source_file, jobs, chunksize=chunksize)
+        for job, (obj, seconds) in zip(jobs, results, strict=True):
+            filename, name, path = job[:3]
+            if obj is not None:
+                preparsed_objects[filename] = (name, path, obj)
+            if seconds is not None:
+                profiler.parsed(filename, seconds)
+
+
+def source_stamp(filename):
+    """Return ``(mtime, size)`` of *filename* to detect changes between builds."""
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def source_digest(filename):
+    """Return a digest of the contents of *filename*."""
+    with builtins.open(filename, "rb") as source:
+        return content_key(source.read())
+
+
+def analysis_key(basedir):
+    # Results of a previous build are only reused if all of these match.
+    return (
+        basedir,
+        MatObject.encoding,
+        PARSER_VERSION,
+        package_version("sphinxcontrib-matlabdomain"),
+        package_version("tree-sitter"),
+        package_version("tree-sitter-matlab"),
+    )
+
+
+class AnalysisState(dict):
+    """The result of :func:`analyze`, stored in the Sphinx environment.
+
+    With ``sphinx-build -j``, the processes reading documents send their
+    environment back pickled. The main process keeps its own analysis, so it
+    is left out of environments pickled by other processes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pid = os.getpid()
+
+    def __reduce__(self):
+        if os.getpid() != self.pid:
+            return AnalysisState, ()
+        return AnalysisState, (dict(self),)
+
+
+def find_unchanged_entities(sources, previous):
+    """Return the entities of the previous build that can be reused.
+
+    :param sources: ``(filename, name, path)`` as from :func:`find_source_files`.
+    :type sources: list
+    :param previous: ``{filename: (stamp, digest, entity)}`` of the previous
+        build, see :func:`analyze`.
+    :type previous: dict
+    :returns: ``({filename: entity}, {filename: stamp})`` of the unchanged files.
+
+    A file is unchanged if its modification time and size are the same, or
+    else if its contents are the same. Class folders where any file was added,
+    changed or deleted are parsed again completely, as their entities were
+    modified when merging the methods into the class.
+    """
+    unchanged = {}
+    stamps = {}
+    for filename, _, _ in sources:
+        if filename not in previous:
+            continue
+        old_stamp, old_digest, entity = previous[filename]
+        stamp = source_stamp(filename)
+        if stamp != old_stamp and source_digest(filename) != old_digest:
+            continue
+        unchanged[filename] = entity
+        stamps[filename] = stamp
+
+    current = {filename for filename, _, _ in sources}
+    changed = (current - unchanged.keys()) | (previous.keys() - current)
+    changed_class_folders = {
+        os.path.dirname(filename)
+        for filename in changed
+        if os.path.basename(os.path.dirname(filename)).startswith("@")
+    }
+    unchanged = {
+        filename: entity
+        for filename, entity in unchanged.items()
+        if os.path.dirname(filename) not in changed_class_folders
+    }
+    return unchanged, stamps
+
+
+def make_disk_cache(app, name):
+    """Return the :class:`DiskCache` *name* in ``matlab_cache_dir`` or ``None``."""
+    cache_dir = app.env.config.matlab_cache_dir
+    if not cache_dir:
+        return None
+    # Interpret `matlab_cache_dir` relative to the sphinx source directory.
+    cache_dir = os.path.normpath(os.path.join(app.env.srcdir, cache_dir, name))
+    return DiskCache(cache_dir, app.env.config.matlab_cache_max_size)
+
+
+def make_parse_cache(app):
+    """Return the :class:`DiskCache` for parse results or ``None``."""
+    return make_disk_cache(app, "parse")
+
+
+def parse_cache_key(code, encoding, tier="header"):
+    """Return the parse cache key for the contents *code* of a MATLAB file.
+
+    *tier* is ``"header"`` for the results of :meth:`MatObject.parse_mfile`
+    and ``"details"`` for those of :meth:`MatObject.parse_details`.
+    """
+    return content_key(
+        code,
+        encoding,
+        tier,
+        str(PARSER_VERSION),
+        package_version("sphinxcontrib-matlabdomain"),
+        package_version("tree-sitter"),
+        package_version("tree-sitter-matlab"),
+    )
+
+
+def parse_tree(code):
+    """Return the tree-sitter syntax tree of the MATLAB source *code*."""
+    return get_parser().parse(code)
 
 
 def analyze(app):
     # Using the "MatObject.matlabify" and "MatModule.safe_getmembers" the
     # `matlab_src_dir` is recursively scanned for MATLAB objects only once.
-    # All entities found are stored in globally available `entities_table`
+    # All entities found are stored in globally available `entities_table`.
+    # With `matlab_parse_workers` > 1 the files are parsed upfront by a pool
+    # of processes, the scan then only assembles the hierarchy.
 
     if app.env.config.matlab_src_dir is None:
         logger.debug(
@@ -218,23 +731,75 @@ def analyze(app):
     MatObject.basedir = basedir  # set MatObject base directory
     MatObject.sphinx_env = app.env  # pass env to MatObject cls
     MatObject.sphinx_app = app  # pass app to MatObject cls
+    MatObject.parse_cache = make_parse_cache(app)
+
+    symbol_table.clear()
+    source_entities.clear()
+    MatModuleAnalyzer.cache.clear()
+
+    # Entities of files that are unchanged since the previous build, as
+    # stored in the environment, are reused. Only the other files are parsed.
+    key = analysis_key(basedir)
+    previous = getattr(app.env, "matlab_analysis", None)
+    if previous is None or previous.get("key") != key:
+        previous = {"key": key, "files": {}}
+    with profiler.phase("analyze.scan"):
+        sources = find_source_files(basedir)
+        unchanged, stamps = find_unchanged_entities(sources, previous["files"])
+    if tracer.enabled:
+        tracer.event(
+            "analyze", basedir=basedir, files=len(sources), reused=len(unchanged)
+        )
 
-    entities_table.clear()
-    entities_name_map.clear()
+    workers = parse_workers(app.env.config)
+    try:
+        with profiler.phase("analyze.parse"):
+            for filename, name, path in sources:
+                if filename in unchanged:
+                    preparsed_objects[filename] = (name, path, unchanged[filename])
+            if workers > 1:
+                preparse_source_files(
+                    [source for source in sources if source[0] not in unchanged],
+                    workers,
+                )
 
-    # Set the root object and get root members.
-    root = MatObject.matlabify("")
-    if not root:
-        return
-    root.safe_getmembers()
-    recursive_find_all(root)
+            # Set the root object and get root members.
+            root = MatObject.matlabify("")
+            if not root:
+                return
+            root.safe_getmembers()
+            recursive_find_all(root)
+    finally:
+        # Drop results for files shadowed by folders of the same name.
+        preparsed_objects.clear()
+        if MatObject.parse_cache is not None:
+            if profiler.enabled:
+                cache = MatObject.parse_cache
+                profiler.cache("parse", cache.hits, cache.misses)
+            MatObject.parse_cache.prune()
+    if profiler.enabled:
+        profiler.cache("environment", len(unchanged), len(sources) - len(unchanged))
+
+    # Store stamps and entities of all files for the next build.
+    files = {}
+    for filename, entity in source_entities.items():
+        if unchanged.get(filename) is entity:
+            files[filename] = (stamps[filename], previous["files"][filename][1], entity)
+        else:
+            files[filename] = (
+                source_stamp(filename),
+                source_digest(filename),
+                entity,
+            )
+    app.env.matlab_analysis = AnalysisState(key=key, files=files)
+    reused = {id(entity) for entity in unchanged.values()}
 
-    # Print the hierarchy of entities to the log.
-    logger.debug("[sphinxcontrib-matlabdomain] Found the following entities:")
-    recursive_log_debug(root)
+    # Trace the hierarchy of entities.
+    if tracer.enabled:
+        recursive_trace(root)
 
-    populate_entities_table(root)
-    entities_table["."] = root
+    symbol_table.add_tree(root)
+    symbol_table.add_root(root)
 
     """
     Transform Class Folders classes from
@@ -257,66 +822,42 @@ def analyze(app):
         return parts[-1].startswith("@")
 
     class_folder_modules = {
-        k: v for k, v in entities_table.items() if isClassFolderModule(k, v)
+        k: v for k, v in symbol_table.canonical.items() if isClassFolderModule(k, v)
     }
-    # For each Class Folder module
-    for cf_entity in class_folder_modules.values():
-        # Find the class entity class.
-        class_entities = [e for e in cf_entity.entities if isinstance(e[1], MatClass)]
-        func_entities = [e for e in cf_entity.entities if isinstance(e[1], MatFunction)]
+    with profiler.phase("analyze.class_folders"):
+        # For each Class Folder module, except those unchanged since the previous
+        # build, where the methods are already merged.
+        for cf_entity in class_folder_modules.values():
+            if all(id(entity) in reused for entity in cf_entity.members.values()):
+                continue
+            # Find the class entity class.
+            entities = cf_entity.entities
+            class_entities = [e for e in entities if isinstance(e[1], MatClass)]
+            func_entities = [e for e in entities if isinstance(e[1], MatFunction)]
 
-        if not class_entities:
-            continue
-        assert len(class_entities) == 1
-        cls = class_entities[0][1]
-
-        # Add functions to class
-        for _func_name, func in func_entities:
-            func.__class__ = MatMethod
-            func.cls = cls
-            # TODO: Find the method attributes defined in classfolder class definition.
-            func.attrs = {}
-            cls.methods[func.name] = func
-
-    # Transform @ClassFolder names. Specifically
-    class_folder_names = {}
-    for name, entity in entities_table.items():
-        alt_name = classfolder_class_name(name)
-        if name != alt_name:
-            class_folder_names[alt_name] = entity
-    entities_table.update(class_folder_names)
-
-    # Find alternative names to entities
-    # target.+package.+sub.Class -> package.sub.Class
-    # folder.subfolder.Class -> Class
-    #
-    # NOTE: Does not yet work with class folders
-    short_names = {}
-    long_names = entities_table.keys()
-    for name, entity in entities_table.items():
-        short_name = shortest_name(name)
-        if (
-            short_name != name and not (short_name in long_names and name in long_names)
-        ) or (
-            short_name in long_names
-            and (entity.ref_role() == "func" or entity.ref_role() == "class")
-            and entities_table[short_name].ref_role() == "mod"
-        ):
-            # Only handle the below special case
-            # when overwriting entries in entities_table will not
-            # introduce conflicts
-            if short_name in entities_table:
-                # Special Case - ClassName/ClassName.m
-                existing_entity = entities_table[short_name]
-                short_names[short_name] = {
-                    entity.ref_role(): entity,
-                    existing_entity.ref_role(): existing_entity,
-                }
-            else:
-                short_names[short_name] = entity
-            entities_name_map[short_name] = short_name
+            if not class_entities:
+                continue
+            assert len(class_entities) == 1
+            cls = class_entities[0][1]
+
+            # Add functions to class
+            for _func_name, func in func_entities:
+                func.__class__ = MatMethod
+                # TODO: Find the method attributes defined in classfolder class
+                # definition.
+                func.attrs = {}
+                cls.add_method(func)
+
+    with profiler.phase("analyze.names"):
+        # Transform @ClassFolder names. Specifically
+        symbol_table.add_class_folder_names()
 
-    entities_table.update(short_names)
+        # Find alternative names to entities
+        # target.+package.+sub.Class -> package.sub.Class
+        # folder.subfolder.Class -> Class
+        symbol_table.add_short_names()
+
+        symbol_table.build_indexes()
 
 
 def strip_package_prefix(varname):
@@ -347,11 +888,65 @@ class MatObject:
     encoding = None
     sphinx_env = None
     sphinx_app = None
+    parse_cache = None
+    #: full path of the file the object is defined in, set by :meth:`matlabify`
+    filename = None
+    #: names of the attributes set by :meth:`load_details`
+    lazy_attributes = ()
+    #: parser for the details, see :meth:`parse_details`
+    details_parser = None
+
+    # Allows the ``__slots__`` of small subclasses, e.g. MatProperty, to take
+    # effect. Subclasses without ``__slots__`` have a ``__dict__``.
+    __slots__ = ()
 
     def __init__(self, name):
         #: name of MATLAB object
         self.name = name
 
+    def __reduce__(self):
+        # The ``__module__`` property of the subclasses hides the module of the
+        # class, so pickle can't find the class by reference. Rebuild by name.
+        state = getattr(self, "__dict__", None)
+        slots = {
+            name: getattr(self, name)
+            for name in _slot_names(type(self))
+            if hasattr(self, name)
+        }
+        if slots:
+            state = (state or None, slots)
+        return _new_mat_object, (type(self).__name__,), state
+
+    def __getattr__(self, name):
+        # Only called for missing attributes, i.e. details not parsed yet.
+        if name in type(self).lazy_attributes and "unparsed" in self.__dict__:
+            self.load_details()
+            return self.__dict__[name]
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    def load_details(self):
+        """Parse the details of the object, e.g. docstrings and arguments.
+
+        Only the header of classes and functions is parsed while analyzing
+        ``matlab_src_dir``. The details are parsed on first access of one of
+        the :attr:`lazy_attributes`. The file is read again for that, the
+        definition file comes first in :meth:`source_files`.
+        """
+        digest, encoding = self.__dict__.pop("unparsed")
+        filename = self.source_files()[0]
+        with builtins.open(filename, "rb") as code_f:
+            code = code_f.read()
+        if content_key(code) != digest:
+            logger.warning(
+                "[sphinxcontrib-matlabdomain] %s changed since it was analyzed, "
+                "its current contents are documented.",
+                filename,
+            )
+        parsed = MatObject.parse_details(code, encoding, self.details_parser)
+        self.set_details(parsed)
+
     def ref_role(self):
         """Return role to use for references to this object.
 
@@ -359,6 +954,17 @@ class MatObject:
         """
         return "ref"
 
+    def source_files(self):
+        """Return the MATLAB files that define this object.
+
+        Members defined in the class definition file have no file of their
+        own, the file of their class is used instead.
+        """
+        filename = self.filename
+        if filename is None and isinstance(getattr(self, "cls", None), MatClass):
+            filename = self.cls.filename
+        return [filename] if filename else []
+
     @property
     def __name__(self):
         return self.name
@@ -371,14 +977,8 @@ class MatObject:
         if name == "__name__":
             return self.__name__
         elif len(defargs) == 0:
-            logger.debug(
-                (
-                    "[sphinxcontrib-matlabdomain] "
-                    'Warning attribute "%s" was not found in %s.'
-                ),
-                name,
-                self,
-            )
+            if tracer.enabled:
+                tracer.event("missing_attribute", name=name, entity=self)
             return None
         elif len(defargs) == 1:
             return defargs[0]
@@ -386,11 +986,14 @@ class MatObject:
             return defargs
 
     @staticmethod
-    def matlabify(objname):
+    def matlabify(objname, entry=None):
         """Make a MatObject.
 
         :param objname: Name of object to matlabify without file extension.
         :type objname: str
+        :param entry: ``(kind, filename)`` of the object as returned by
+            :func:`scan_folder`, to avoid looking it up on disk again.
+        :type entry: tuple
 
         Assumes that object is contained in a folder described by a namespace
         composed of modules and packages connected by dots, and that the top-
@@ -404,8 +1007,6 @@ class MatObject:
         over the mfile.
         """
         # no object name given
-        logger.debug(f"[sphinxcontrib-matlabdomain] enter matlabify {objname=}.")
-
         if objname is None:
             return None
         if objname == "":
@@ -425,43 +1026,61 @@ class MatObject:
             # make a full path out of basedir and objname
             fullpath = os.path.join(MatObject.basedir, objname)  # objname fullpath
 
-        logger.debug(
-            f"[sphinxcontrib-matlabdomain] "
-            f"matlabify {package=}, {objname=}, {fullpath=}"
-        )
+        if entry is None:
+            entry = classify_path(fullpath)
+        kind, filename = entry
+        if tracer.enabled:
+            tracer.event("matlabify", package=package, kind=kind, filename=filename)
+
         # package folders imported over mfile with same name
-        if os.path.isdir(fullpath):
+        if kind == "dir":
             if package.startswith("_") or package.startswith("."):
                 return None
             if mod := try_get_module_entity_or_default(package):
-                logger.debug(
-                    "[sphinxcontrib-matlabdomain] Module %s already loaded.", package
-                )
+                if tracer.enabled:
+                    tracer.event("module", package=package, loaded=True)
                 return mod
             else:
-                logger.debug(
-                    f"[sphinxcontrib-matlabdomain] "
-                    f"matlabify MatModule {package=}, {fullpath=}"
-                )
-                return MatModule(name, fullpath, package)  # import package
-        elif os.path.isfile(f"{fullpath}.m"):
-            mfile = f"{fullpath}.m"
-            logger.debug(
-                "[sphinxcontrib-matlabdomain] "
-                "matlabify parse_mfile {package=}, {mfile=}"
-            )
-            return MatObject.parse_mfile(
-                mfile, name, path, MatObject.encoding
-            )  # parse mfile
-        elif os.path.isfile(f"{fullpath}.mlapp"):
-            mlappfile = f"{fullpath}.mlapp"
-            logger.debug(
-                "[sphinxcontrib-matlabdomain] "
-                "matlabify parse_mlappfile {package=}, {mlappfile=}"
-            )
-            return MatObject.parse_mlappfile(mlappfile, name, path)
+                if tracer.enabled:
+                    tracer.event("module", package=package, loaded=False)
+                return MatModule(name, filename, package)  # import package
+        elif kind == "m":
+            mfile = filename
+            if not (obj := MatObject.take_preparsed(mfile, name, path)):
+                obj = MatObject.parse_mfile(
+                    mfile, name, path, MatObject.encoding
+                )  # parse mfile
+            elif tracer.enabled:
+                tracer.event("preparsed", filename=mfile)
+            obj.filename = mfile
+            source_entities.setdefault(mfile, obj)
+            return obj
+        elif kind == "mlapp":
+            mlappfile = filename
+            if not (obj := MatObject.take_preparsed(mlappfile, name, path)):
+                obj = MatObject.parse_mlappfile(mlappfile, name, path)
+            elif tracer.enabled:
+                tracer.event("preparsed", filename=mlappfile)
+            obj.filename = mlappfile
+            source_entities.setdefault(mlappfile, obj)
+            return obj
         return None
 
+    @staticmethod
+    def take_preparsed(filename, name, path):
+        """Return the object parsed by a worker process for *filename*, if any.
+
+        Each result is handed out once, later requests parse the file again
+        just like the serial code path does.
+        """
+        entry = preparsed_objects.pop(filename, None)
+        if entry is None:
+            return None
+        parsed_name, parsed_path, obj = entry
+        if (parsed_name, parsed_path) != (name, path):
+            return None
+        return obj
+
     @staticmethod
     def parse_mfile(mfile, name, path, encoding=None):
         """Use Pygments to parse mfile to determine type: function or class.
@@ -488,47 +1107,96 @@ class MatObject:
             encoding = "utf-8"
         with builtins.open(mfile, "rb") as code_f:
             code = code_f.read()
-
-        # parse the file
-        tree_sitter_ver = tuple(int(sec) for sec in version("tree_sitter").split("."))
-        if tree_sitter_ver[1] == 21:
-            parser = Parser()
-            parser.set_language(ML_LANG)
-        else:
-            parser = Parser(ML_LANG)
-        tree = parser.parse(code)
+        # the details are parsed from the file again when needed
+        digest = content_key(code)
 
         modname = path.replace(os.sep, ".")  # module name
 
-        # assume that functions and classes always start with a keyword
-        def isFunction(tree):
-            q_is_function = ML_LANG.query(
-                r"""(source_file [(comment) "\n"]* (function_definition))"""
+        # files with known contents are taken from the parse cache
+        cache = MatObject.parse_cache
+        if cache is not None:
+            key = parse_cache_key(code, encoding)
+            if (parsed := cache.get(key)) is not None:
+                if tracer.enabled:
+                    tracer.event(
+                        "parse", filename=mfile, type=type(parsed).__name__, cached=True
+                    )
+                obj = MatObject.from_parsed(parsed, name, modname, encoding, digest)
+                obj.filename = mfile
+                return obj
+
+        # parse the file
+        if profiler.enabled:
+            start = time.perf_counter()
+        root_node = parse_tree(code).root_node
+
+        # Only the header of classes and functions is parsed here, the rest
+        # when they are documented, see `MatObject.load_details`.
+        definition = find_definition(root_node)
+        if definition is None:
+            parsed = MatScriptParser(root_node, encoding)
+        elif definition.type == "class_definition":
+            parsed = MatClassHeaderParser(definition, encoding)
+        else:
+            parsed = MatFunctionHeaderParser(definition, encoding)
+        if profiler.enabled:
+            profiler.parsed(mfile, time.perf_counter() - start)
+        if tracer.enabled:
+            tracer.event(
+                "parse", filename=mfile, type=type(parsed).__name__, cached=False
             )
-            matches = q_is_function.matches(tree.root_node)
-            return bool(matches)
 
-        def isClass(tree):
-            q_is_class = ML_LANG.query("(class_definition)")
-            matches = q_is_class.matches(tree.root_node)
-            return bool(matches)
+        if cache is not None:
+            cache.put(key, parsed)
+        obj = MatObject.from_parsed(parsed, name, modname, encoding, digest)
+        obj.filename = mfile
+        return obj
 
-        if isClass(tree):
-            logger.debug(
-                "[sphinxcontrib-matlabdomain] parsing classdef %s from %s.",
-                name,
-                modname,
-            )
-            return MatClass(name, modname, tree.root_node, encoding)
-        elif isFunction(tree):
-            logger.debug(
-                "[sphinxcontrib-matlabdomain] parsing function %s from %s.",
-                name,
-                modname,
-            )
-            return MatFunction(name, modname, tree.root_node, encoding)
+    @staticmethod
+    def from_parsed(parsed, name, modname, encoding, digest=None):
+        """Make a :class:`MatObject` from the result of a parser.
+
+        :param parsed: Instance of one of the parsers in
+            :mod:`sphinxcontrib.mat_tree_sitter_parser`.
+        :param name: Name of :class:`MatObject`.
+        :type name: str
+        :param modname: Name of folder containing :class:`MatObject`.
+        :type modname: str
+        :param encoding: Encoding of the parsed file.
+        :type encoding: str
+        :param digest: Digest of the contents of the file, required for the
+            header parsers.
+        :type digest: str
+        """
+        if isinstance(parsed, (MatClassHeaderParser, MatClassParser)):
+            return MatClass(name, modname, None, encoding, parsed, digest)
+        elif isinstance(parsed, (MatFunctionHeaderParser, MatFunctionParser)):
+            return MatFunction(name, modname, None, encoding, parsed, digest)
         else:
-            return MatScript(name, modname, tree.root_node, encoding)
+            return MatScript(name, modname, None, encoding, parsed)
+
+    @staticmethod
+    def parse_details(code, encoding, parser):
+        """Parse the MATLAB source *code* with *parser*.
+
+        :param code: Contents of the file.
+        :type code: bytes
+        :param encoding: Encoding of the file.
+        :type encoding: str
+        :param parser: :class:`MatClassParser` or :class:`MatFunctionParser`.
+        :returns: The *parser* instance.
+        """
+        cache = MatObject.parse_cache
+        if cache is not None:
+            key = parse_cache_key(code, encoding, "details")
+            if (parsed := cache.get(key)) is not None:
+                return parsed
+
+        with profiler.phase("parse_details"):
+            parsed = parser(find_definition(parse_tree(code).root_node), encoding)
+        if cache is not None:
+            cache.put(key, parsed)
+        return parsed
 
     @staticmethod
     def parse_mlappfile(mlappfile, name, path):
@@ -572,6 +1240,8 @@ class MatObject:
         docstring = "\n\n".join(doc)
 
         modname = path.replace(os.sep, ".")  # module name
+        if tracer.enabled:
+            tracer.event("parse", filename=mlappfile, type="MatApplication")
 
         return MatApplication(name, modname, docstring)
 
@@ -596,8 +1266,9 @@ class MatModule(MatObject):
         self.path = path
         #: name of package (full path from basedir to module)
         self.package = package
-        #: entities found in the module: class, function, module (subpath and +package)
-        self.entities = []
+        #: entities found in the module by name: class, function, module (subpath
+        #: and +package), in the order they were found
+        self.members = {}
 
     def ref_role(self):
         """Return role to use for references to this object.
@@ -607,36 +1278,33 @@ class MatModule(MatObject):
         return "mod"
 
     def safe_getmembers(self):
-        logger.debug(
-            "[sphinxcontrib-matlabdomain] "
-            "MatModule.safe_getmembers {self.name=}, {self.path=}, {self.package=}"
-        )
-        if self.entities:
+        if self.members:
             return self.entities
+        if tracer.enabled:
+            tracer.event("getmembers", package=self.package, path=self.path)
 
-        results = []
-        for key in os.listdir(self.path):
-            # make full path
-            path = os.path.join(self.path, key)
-            # Do not visit directories starting with:
-            # 1) "." (VCS and Editors)
-            # 2) "_" (build/temp folders in Sphinx)
-            if os.path.isdir(path) and (key.startswith(".") or key.startswith("_")):
-                continue
-            # Only visit MATLAB files
-            if os.path.isfile(path) and not (
-                key.endswith(".m") or key.endswith(".mlapp")
-            ):
-                continue
-            # trim file extension
-            if os.path.isfile(path):
-                key, _ = os.path.splitext(key)
-            if not results or key not in next(zip(*results, strict=False)):
-                if value := self.getter(key, None):
-                    results.append((key, value))
-        self.entities = results
+        for key, entry in scan_folder(self.path).items():
+            if value := MatObject.matlabify(f"{self.package}.{key}", entry):
+                self.members[key] = value
+
+        return self.entities
 
-        return results
+    def source_files(self):
+        """Return the MATLAB files of the members of the module.
+
+        The members of subfolders are not included, they are documented with
+        modules of their own.
+        """
+        files = {}
+        for _name, entity in self.safe_getmembers():
+            if not isinstance(entity, MatModule):
+                files.update(dict.fromkeys(entity.source_files()))
+        return list(files)
+
+    @property
+    def entities(self):
+        """List of ``(name, entity)`` of :attr:`members`."""
+        return list(self.members.items())
 
     @property
     def __doc__(self):
@@ -673,31 +1341,18 @@ class MatModule(MatObject):
         elif name == "__package__":
             return self.__package__
         elif name == "__module__":
-            logger.debug(
-                (
-                    "[sphinxcontrib-matlabdomain] "
-                    "mod %s is a package does not have __module__."
-                ),
-                self,
-            )
+            # a package does not have __module__
             return None
         else:
             # Search if we already has this entity
-            for entity_name, entity_content in self.entities:
-                if name == entity_name:
-                    logger.debug(
-                        "[sphinxcontrib-matlabdomain] mod %s already has entity %s.",
-                        self,
-                        name,
-                    )
-                    return entity_content
+            if (entity := self.members.get(name)) is not None:
+                return entity
 
             # If not - try to MATLABIFY it.
             if entity := MatObject.matlabify(f"{self.package}.{name}"):
-                self.entities.append((name, entity))
-                logger.debug(
-                    f"[sphinxcontrib-matlabdomain] entity {name=} imported from {self=}"
-                )
+                self.members[name] = entity
+                if tracer.enabled:
+                    tracer.event("import", package=self.package, name=name)
                 return entity
 
 
@@ -710,21 +1365,36 @@ class MatFunction(MatObject):
     :type modname: str
     :param tokens: List of tokens parsed from mfile by Pygments.
     :type tokens: list
+    :param parsed: Result of the parser, if already available.
+    :type parsed: :class:`MatFunctionParser` or :class:`MatFunctionHeaderParser`
+    :param digest: Digest of the contents of the file, to check the file when
+        the details are parsed later if *parsed* is a
+        :class:`MatFunctionHeaderParser`.
+    :type digest: str
     """
 
-    def __init__(self, name, modname, tokens, encoding):
+    lazy_attributes = ("docstring", "retv", "args")
+    details_parser = MatFunctionParser
+
+    def __init__(self, name, modname, tokens, encoding, parsed=None, digest=None):
         super().__init__(name)
-        parsed_function = MatFunctionParser(tokens, encoding)
         #: Path of folder containing :class:`MatObject`.
         self.module = modname
+        #: remaining tokens after main function is parsed
+        self.rem_tks = None
+        if isinstance(parsed, MatFunctionHeaderParser):
+            #: ``(digest, encoding)`` of the file until the details are parsed
+            self.unparsed = (digest, encoding)
+        else:
+            self.set_details(parsed or MatFunctionParser(tokens, encoding))
+
+    def set_details(self, parsed_function):
         #: docstring
         self.docstring = parsed_function.docstring
         #: output args
         self.retv = parsed_function.retv
         #: input args
         self.args = parsed_function.args
-        #: remaining tokens after main function is parsed
-        self.rem_tks = None
 
     def ref_role(self):
         """Return role to use for references to this object.
@@ -761,30 +1431,67 @@ class MatClass(MatObject):
     :type path: str
     :param tokens: List of tokens parsed from mfile by Pygments.
     :type tokens: list
+    :param parsed: Result of the parser, if already available.
+    :type parsed: :class:`MatClassParser` or :class:`MatClassHeaderParser`
+    :param digest: Digest of the contents of the file, to check the file when
+        the details are parsed later if *parsed* is a
+        :class:`MatClassHeaderParser`.
+    :type digest: str
     """
 
-    def __init__(self, name, modname, tokens, encoding):
+    lazy_attributes = ("attrs", "docstring", "properties", "methods", "enumerations")
+    details_parser = MatClassParser
+
+    def __init__(self, name, modname, tokens, encoding, parsed=None, digest=None):
         super().__init__(name)
-        parsed_class = MatClassParser(tokens, encoding)
+        parsed_class = parsed or MatClassParser(tokens, encoding)
         #: Path of folder containing :class:`MatObject`.
         self.module = modname
-        #: dictionary of class attributes
-        self.attrs = parsed_class.attrs
         #: list of class superclasses
         self.bases = parsed_class.supers
+        #: methods defined in their own file in a class folder
+        self.folder_methods = {}
+        #: remaining tokens after main class definition is parsed
+        self.rem_tks = None
+        if isinstance(parsed_class, MatClassHeaderParser):
+            #: names of the properties, available without parsing the details
+            self.property_names = parsed_class.property_names
+            #: names of the methods, available without parsing the details
+            self.method_names = parsed_class.method_names
+            #: names of the enumerations, available without parsing the details
+            self.enumeration_names = parsed_class.enumeration_names
+            #: ``(digest, encoding)`` of the file until the details are parsed
+            self.unparsed = (digest, encoding)
+        else:
+            self.set_details(parsed_class)
+            self.property_names = list(self.properties)
+            self.method_names = list(self.methods)
+            self.enumeration_names = list(self.enumerations)
+
+    def set_details(self, parsed_class):
+        #: dictionary of class attributes
+        self.attrs = parsed_class.attrs
         #: docstring
         self.docstring = parsed_class.docstring
         #: dictionary of class properties
         self.properties = parsed_class.properties
         #: dictionary of class methods
         self.methods = {
-            name: MatMethod(name, parsed_fun, modname, self)
+            name: MatMethod(name, parsed_fun, self.module, self)
             for (name, parsed_fun) in parsed_class.methods.items()
         }
+        self.methods.update(self.folder_methods)
         #:
         self.enumerations = parsed_class.enumerations
-        #: remaining tokens after main class definition is parsed
-        self.rem_tks = None
+
+    def add_method(self, method):
+        """Add *method* defined in its own file in the class folder."""
+        method.cls = self
+        self.folder_methods[method.name] = method
+        if method.name not in self.method_names:
+            self.method_names.append(method.name)
+        if "methods" in self.__dict__:
+            self.methods[method.name] = method
 
     def ref_role(self):
         """Return role to use for references to this object.
@@ -815,6 +1522,31 @@ class MatClass(MatObject):
         target = self.fullname(env)
         return f":class:`{name} <{target}>`" if name else f":class:`{target}`"
 
+    def source_files(self, inherited=False):
+        """Return the MATLAB files that define this class.
+
+        :param inherited: Also return the files of all known superclasses.
+        :type inherited: bool
+
+        These are the class definition file and, for ``@ClassFolder``
+        classes, the files of the methods in the folder.
+        """
+        files = dict.fromkeys(super().source_files())
+        for method in self.folder_methods.values():
+            if method.filename:
+                files[method.filename] = None
+        if inherited:
+            seen = {id(self)}
+            bases = list(self.__bases__.values())
+            while bases:
+                base = bases.pop(0)
+                if not isinstance(base, MatClass) or id(base) in seen:
+                    continue
+                seen.add(id(base))
+                files.update(dict.fromkeys(base.source_files()))
+                bases.extend(base.__bases__.values())
+        return list(files)
+
     @property
     def __module__(self):
         return self.module
@@ -825,19 +1557,7 @@ class MatClass(MatObject):
 
     @property
     def __bases__(self):
-        bases_ = dict.fromkeys(list(self.bases))  # make copy of bases
-
-        class_entity_table = {
-            name: entity
-            for name, entity in entities_table.items()
-            if isinstance(entity, MatClass) or "@" in name
-        }
-
-        for base in bases_:
-            if base in class_entity_table:
-                bases_[base] = class_entity_table[base]
-
-        return bases_
+        return {base: symbol_table.classes.get(base) for base in self.bases}
 
     def getter(self, name, *defargs):
         """:class:`MatClass` ``getter`` method to get attributes."""
@@ -867,6 +1587,18 @@ class MatClass(MatObject):
 
 
 class MatProperty(MatObject):
+    # Created for every lookup of a property, so kept small.
+    __slots__ = (
+        "attrs",
+        "cls",
+        "default",
+        "docstring",
+        "name",
+        "size",
+        "type",
+        "validators",
+    )
+
     def __init__(self, name, cls, attrs):
         super().__init__(name)
         self.cls = cls
@@ -894,6 +1626,8 @@ class MatProperty(MatObject):
 
 
 class MatEnumeration(MatObject):
+    __slots__ = ("cls", "docstring", "name")
+
     def __init__(self, name, cls, attrs):
         super().__init__(name)
         self.cls = cls
@@ -916,6 +1650,9 @@ class MatEnumeration(MatObject):
 
 
 class MatMethod(MatFunction):
+    # No ``__slots__``, functions in class folders become methods by changing
+    # their ``__class__``, which requires the same layout as MatFunction.
+
     def __init__(self, name, parsed_function, modname, cls):
         self.name = name
         #: Path of folder containing :class:`MatObject`.
@@ -947,13 +1684,13 @@ class MatMethod(MatFunction):
 
 
 class MatScript(MatObject):
-    def __init__(self, name, modname, tks, encoding):
+    def __init__(self, name, modname, tks, encoding, parsed=None):
         super().__init__(name)
-        parsed_script = MatScriptParser(tks, encoding)
+        parsed_script = parsed or MatScriptParser(tks, encoding)
         #: Path of folder containing :class:`MatScript`.
         self.module = modname
-        #: List of tokens parsed from mfile by Pygments.
-        self.tokens = tks
+        #: The syntax tree is not kept, so that scripts can be pickled.
+        self.tokens = None
         #: docstring
         self.docstring = parsed_script.docstring
 
@@ -1005,6 +1742,20 @@ class MatException(MatObject):
         return self.docstring
 
 
+@cache
+def _slot_names(cls):
+    # Names of the ``__slots__`` of *cls* and its bases, for pickling.
+    return tuple(
+        name for klass in cls.__mro__ for name in klass.__dict__.get("__slots__", ())
+    )
+
+
+def _new_mat_object(clsname):
+    # Used by `MatObject.__reduce__`, the state is restored by pickle.
+    cls = globals()[clsname]
+    return cls.__new__(cls)
+
+
 class MatcodeError(Exception):
     def __str__(self):
         res = self.args[0]
@@ -1013,6 +1764,119 @@ class MatcodeError(Exception):
         return res
 
 
+class MatAttrDocs(Mapping):
+    """Docstrings of the members of a MATLAB folder and of its classes.
+
+    :param modname: Name of the folder.
+    :type modname: str
+
+    Keys are ``(namespace, name)``, where *namespace* is the package of the
+    folder for its members and the full name of a class for the class members.
+    The docstrings of a namespace are looked up when it is first used, see
+    :meth:`namespace`, so documenting a class does not parse the other classes
+    and functions of its folder.
+    """
+
+    def __init__(self, modname):
+        self.modname = modname
+        self._module = None
+        # namespace -> {name: docstring}, in source order
+        self._namespaces = {}
+        self._tag_numbers = {}
+
+    @property
+    def module(self):
+        """The :class:`MatModule` of :attr:`modname`."""
+        if self._module is None:
+            self._module = try_get_module_entity_or_default(self.modname)
+            self._module.safe_getmembers()
+        return self._module
+
+    def class_namespace(self, name):
+        """Return the namespace of the members of class *name*."""
+        return f"{self.module.package}.{name}".lstrip(".")
+
+    def tagname(self, namespace, name):
+        """Return the name of *name* in *namespace* relative to the folder."""
+        if namespace == self.module.package:
+            return name
+        return f"{namespace[len(self.module.package) :].lstrip('.')}.{name}"
+
+    def namespace(self, namespace):
+        """Return a dictionary of the docstrings of the members of
+        *namespace*.
+        """
+        docs = self._namespaces.get(namespace)
+        if docs is None:
+            docs = self._namespaces[namespace] = self._find_docs(namespace)
+        return docs
+
+    def _find_docs(self, namespace):
+        mod = self.module
+        if namespace == mod.package:
+            return {
+                name: member.docstring
+                for name, member in mod.entities
+                if hasattr(member, "docstring")
+            }
+        for name in self._class_names(namespace):
+            cls = mod.members.get(name)
+            if isinstance(cls, MatClass):
+                return {
+                    member_name: member.docstring
+                    for member_name, member in cls.getter("__dict__").items()
+                }
+        return {}
+
+    def _class_names(self, namespace):
+        # The class names of the folder that could have *namespace*
+        package = self.module.package
+        if not package:
+            return [namespace]
+        if namespace.startswith(package + "."):
+            return [namespace[len(package) + 1 :]]
+        return []
+
+    def tag_number(self, tagname):
+        """Return the position of *tagname* in its namespace or ``None``.
+
+        *tagname* is the name of a member of the folder, e.g. ``"ClassName"``,
+        or of a class member, e.g. ``"ClassName.method"``.
+        """
+        name, _, member_name = tagname.rpartition(".")
+        namespace = self.class_namespace(name) if name else self.module.package
+        numbers = self._tag_numbers.get(namespace)
+        if numbers is None:
+            numbers = self._tag_numbers[namespace] = {
+                key: number for number, key in enumerate(self.namespace(namespace))
+            }
+        return numbers.get(member_name)
+
+    def __getitem__(self, key):
+        namespace, name = key
+        return self.namespace(namespace)[name]
+
+    def __contains__(self, key):
+        try:
+            namespace, name = key
+        except (TypeError, ValueError):
+            return False
+        return name in self.namespace(namespace)
+
+    def __iter__(self):
+        mod = self.module
+        namespaces = [mod.package]
+        for name, member in mod.entities:
+            if isinstance(member, MatClass):
+                namespaces.append(self.class_namespace(name))
+        for namespace in namespaces:
+            for name in self.namespace(namespace):
+                yield namespace, name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
 class MatModuleAnalyzer:
     # cache for analyzer objects -- caches both by module and file name
     cache = {}
@@ -1060,34 +1924,24 @@ class MatModuleAnalyzer:
         self.parsetree = None
         # will be filled by find_attr_docs()
         self.attr_docs = None
-        self.tagorder = None
         # will be filled by find_tags()
         self.tags = None
 
     def find_attr_docs(self):
-        """Find class and module-level attributes and their documentation."""
-        if self.attr_docs is not None:
-            return self.attr_docs
-        attr_visitor_collected = {}
-        attr_visitor_tagorder = {}
-        tagnumber = 0
-        mod = try_get_module_entity_or_default(self.modname)
-
-        # walk package tree
-        for k, v in mod.safe_getmembers():
-            if hasattr(v, "docstring"):
-                attr_visitor_collected[mod.package, k] = v.docstring
-                attr_visitor_tagorder[k] = tagnumber
-                tagnumber += 1
-            if isinstance(v, MatClass):
-                for mk, mv in v.getter("__dict__").items():
-                    namespace = f"{mod.package}.{k}"
-                    namespace = namespace.lstrip(".")
-                    tagname = f"{k}.{mk}"
-                    tagname = tagname.lstrip(".")
-                    attr_visitor_collected[namespace, mk] = mv.docstring
-                    attr_visitor_tagorder[tagname] = tagnumber
-                    tagnumber += 1
-        self.attr_docs = attr_visitor_collected
-        self.tagorder = attr_visitor_tagorder
-        return attr_visitor_collected
+        """Find class and module-level attributes and their documentation.
+
+        Returns a :class:`MatAttrDocs`, which only looks up the docstrings of a
+        namespace when it is first used.
+        """
+        if self.attr_docs is None:
+            self.attr_docs = MatAttrDocs(self.modname)
+        return self.attr_docs
+
+    @property
+    def tagorder(self):
+        """Dictionary of the position of all members and class members."""
+        tagorder = {}
+        for namespace, name in self.find_attr_docs():
+            tagname = self.attr_docs.tagname(namespace, name)
+            tagorder[tagname] = len(tagorder)
+        return tagorder
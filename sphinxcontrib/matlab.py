@@ -12,6 +12,7 @@ import re
 from docutils import nodes
 from docutils.parsers.rst import Directive, directives
 from sphinx import addnodes
+from sphinx.config import ENUM
 from sphinx.directives import ObjectDescription
 from sphinx.domains import Domain, Index, ObjType
 from sphinx.locale import _ as translation
@@ -20,7 +21,16 @@ from sphinx.util.docfields import Field, GroupedField, TypedField
 from sphinx.util.logging import getLogger
 from sphinx.util.nodes import make_refnode
 
-from . import mat_directives, mat_types
+from . import (
+    mat_auto_link,
+    mat_directives,
+    mat_highlight,
+    mat_lexer,
+    mat_profile,
+    mat_trace,
+    mat_tree_sitter_lexer,
+    mat_types,
+)
 from . import mat_documenters as doc
 
 logger = getLogger("matlab-domain")
@@ -276,7 +286,8 @@ class MatObject(ObjectDescription):
             signode["ids"].append(fullname_out)
             signode["first"] = not self.names
             self.state.document.note_explicit_target(signode)
-            objects = self.env.domaindata["mat"]["objects"]
+            domain = self.env.domains["mat"]
+            objects = domain.data["objects"]
             if fullname_out in objects:
                 self.state_machine.reporter.warning(
                     f"duplicate object description of {fullname_out}, "
@@ -285,7 +296,7 @@ class MatObject(ObjectDescription):
                     + ", use :noindex: for one of them",
                     line=self.lineno,
                 )
-            objects[fullname_out] = (self.env.docname, self.objtype)
+            domain.note_object(fullname_out, self.objtype, self.env.docname)
 
         if indextext := self.get_index_text(modname_out, name_cls):
             entry = ("single", indextext, fullname_out, "", None)
@@ -507,7 +518,8 @@ class MatModule(Directive):
         env.temp_data["mat:module"] = modname
         ret = []
         if not noindex:
-            env.domaindata["mat"]["modules"][modname] = (
+            env.domains["mat"].note_module(
+                modname,
                 env.docname,
                 self.options.get("synopsis", ""),
                 self.options.get("platform", ""),
@@ -515,7 +527,7 @@ class MatModule(Directive):
             )
             # make a duplicate entry in 'objects' to facilitate searching for
             # the module in MATLABDomain.find_obj()
-            env.domaindata["mat"]["objects"][modname] = (env.docname, "module")
+            env.domains["mat"].note_object(modname, "module", env.docname)
             targetnode = nodes.target("", "", ids=[f"module-{modname}"], ismod=True)
             self.state.document.note_explicit_target(targetnode)
             # the platform and synopsis aren't printed; in fact, they are only
@@ -656,6 +668,85 @@ class MATLABModuleIndex(Index):
         return content, collapse
 
 
+class MatObjectIndex:
+    """Indexes of the ``objects`` and ``modules`` of :class:`MATLABDomain`.
+
+    :param objects: ``{fullname: (docname, objtype)}`` of the domain.
+    :type objects: dict
+    :param modules: ``{modname: (docname, synopsis, platform, deprecated)}`` of
+        the domain.
+    :type modules: dict
+
+    ``suffixes`` maps every dotted suffix of a name, e.g. ``".b.c"`` and
+    ``".c"`` for ``"a.b.c"``, to the names ending with it, in the order of
+    *objects*. ``objtypes`` maps each object type to its names. ``docnames``
+    and ``module_docnames`` map each document to the names of the objects and
+    modules it describes.
+
+    The indexes are not stored in the environment, they are built from the
+    domain data when first used.
+    """
+
+    def __init__(self, objects, modules):
+        #: the indexed ``objects``
+        self.objects = objects
+        #: the indexed ``modules``
+        self.modules = modules
+        self.suffixes = {}
+        self.objtypes = {}
+        self.docnames = {}
+        self.module_docnames = {}
+        for fullname, (docname, objtype) in objects.items():
+            self.add(fullname, objtype, docname)
+        for modname, (docname, *_) in modules.items():
+            self.module_docnames.setdefault(docname, {})[modname] = None
+
+    @staticmethod
+    def name_suffixes(fullname):
+        pos = fullname.find(".")
+        while pos != -1:
+            yield fullname[pos:]
+            pos = fullname.find(".", pos + 1)
+
+    @staticmethod
+    def _discard(index, key, name):
+        names = index[key]
+        del names[name]
+        if not names:
+            del index[key]
+
+    def add(self, fullname, objtype, docname):
+        for suffix in self.name_suffixes(fullname):
+            self.suffixes.setdefault(suffix, []).append(fullname)
+        self.objtypes.setdefault(objtype, {})[fullname] = None
+        self.docnames.setdefault(docname, {})[fullname] = None
+
+    def remove(self, fullname, objtype, docname):
+        for suffix in self.name_suffixes(fullname):
+            names = self.suffixes[suffix]
+            names.remove(fullname)
+            if not names:
+                del self.suffixes[suffix]
+        self._discard(self.objtypes, objtype, fullname)
+        self._discard(self.docnames, docname, fullname)
+
+    def move(self, fullname, old_docname, docname):
+        self._discard(self.docnames, old_docname, fullname)
+        self.docnames.setdefault(docname, {})[fullname] = None
+
+    def add_module(self, modname, docname, old_docname=None):
+        if old_docname is not None:
+            self._discard(self.module_docnames, old_docname, modname)
+        self.module_docnames.setdefault(docname, {})[modname] = None
+
+    def remove_module(self, modname, docname):
+        self._discard(self.module_docnames, docname, modname)
+
+    def has_objtypes(self, objtypes):
+        """Return whether there are objects of any of *objtypes*."""
+        return any(objtype in self.objtypes for objtype in objtypes)
+
+
 class MATLABDomain(Domain):
     """MATLAB language domain."""
 
@@ -713,13 +804,73 @@ class MATLABDomain(Domain):
         MATLABModuleIndex,
     ]
 
+    @property
+    def object_index(self):
+        """:class:`MatObjectIndex` of the objects, built on first use."""
+        index = getattr(self, "_object_index", None)
+        if (
+            index is None
+            or index.objects is not self.data["objects"]
+            or index.modules is not self.data["modules"]
+        ):
+            index = MatObjectIndex(self.data["objects"], self.data["modules"])
+            self._object_index = index
+        return index
+
+    def note_object(self, fullname, objtype, docname):
+        """Record the object *fullname* described in *docname*."""
+        objects = self.data["objects"]
+        index = self.object_index
+        if fullname in objects:
+            old_docname, old_objtype = objects[fullname]
+            if old_objtype == objtype:
+                objects[fullname] = (docname, objtype)
+                index.move(fullname, old_docname, docname)
+                return
+            self.remove_object(fullname)
+        objects[fullname] = (docname, objtype)
+        index.add(fullname, objtype, docname)
+
+    def remove_object(self, fullname):
+        """Remove the object *fullname*."""
+        index = self.object_index
+        docname, objtype = self.data["objects"].pop(fullname)
+        index.remove(fullname, objtype, docname)
+
+    def note_module(self, modname, docname, synopsis, platform, deprecated):
+        """Record the module *modname* described in *docname*."""
+        modules = self.data["modules"]
+        index = self.object_index
+        old_docname = modules[modname][0] if modname in modules else None
+        modules[modname] = (docname, synopsis, platform, deprecated)
+        index.add_module(modname, docname, old_docname)
+
     def clear_doc(self, docname):
-        for fullname, (fn, _) in list(self.data["objects"].items()):  # noqa: 401
-            if fn == docname:
-                del self.data["objects"][fullname]
-        for modname, (fn, _, _, _) in list(self.data["modules"].items()):
-            if fn == docname:
-                del self.data["modules"][modname]
+        index = self.object_index
+        for fullname in list(index.docnames.get(docname, ())):
+            self.remove_object(fullname)
+        for modname in list(index.module_docnames.get(docname, ())):
+            del self.data["modules"][modname]
+            index.remove_module(modname, docname)
+
+    def merge_domaindata(self, docnames, otherdata):
+        """Merge the objects and modules of *docnames* read in parallel."""
+        objects = self.data["objects"]
+        for fullname, (fn, objtype) in otherdata["objects"].items():
+            if fn not in docnames:
+                continue
+            if fullname in objects and objects[fullname][0] != fn:
+                logger.warning(
+                    "[sphinxcontrib-matlabdomain] duplicate object description "
+                    "of %s, other instance in %s, use :noindex: for one of them",
+                    fullname,
+                    self.env.doc2path(objects[fullname][0]),
+                    location=fn,
+                )
+            self.note_object(fullname, objtype, fn)
+        for modname, data in otherdata["modules"].items():
+            if data[0] in docnames:
+                self.note_module(modname, *data)
 
     def find_obj(self, modname, classname, name, type, searchmode=0):
         """Find a MATLAB object for "name", perhaps using the given module \
@@ -760,9 +911,8 @@ class MATLABDomain(Domain):
                         searchname = f".{name}"
                         matches = [
                             (oname, objects[oname])
-                            for oname in objects
-                            if oname.endswith(searchname)
-                            and objects[oname][1] in objtypes
+                            for oname in self.object_index.suffixes.get(searchname, ())
+                            if objects[oname][1] in objtypes
                         ]
         elif name in objects:
             newname = name
@@ -833,16 +983,68 @@ class MATLABDomain(Domain):
     def resolve_any_xref(self, env, fromdocname, builder, target, node, contnode):
         ret = []
         for role in self.roles:
-            matrole = f"mat:{role}"
+            if not self.object_index.has_objtypes(self.objtypes_for_role(role, [])):
+                # nothing to find for this role
+                continue
             if element := self.resolve_xref(
-                env, fromdocname, builder, matrole, target, node, contnode
+                env, fromdocname, builder, role, target, node, contnode
             ):
-                ret.append((matrole, element))
+                ret.append((f"mat:{role}", element))
         return ret
 
 
 def analyze(app):
-    mat_types.analyze(app)
+    mat_profile.profiler.reset(app.config.matlab_profile)
+    mat_trace.setup_trace(app)
+    with mat_profile.profiler.phase("analyze"):
+        mat_types.analyze(app)
+    mat_auto_link.linked_docstrings.reset(mat_types.make_disk_cache(app, "autolink"))
+    doc.generated_rest.reset(mat_types.make_disk_cache(app, "rest"))
+
+
+def check_autodoc_events(app, env, docnames):  # noqa: ARG001
+    # Handlers can be connected until the documents are read.
+    doc.generated_rest.check_autodoc_events(app)
+
+
+def report_caches(app, exception):  # noqa: ARG001
+    cache = mat_auto_link.linked_docstrings
+    if cache.hits or cache.misses:
+        logger.verbose(
+            "[sphinxcontrib-matlabdomain] Auto-linked %d docstrings, "
+            "reused %d linked docstrings.",
+            cache.misses,
+            cache.hits,
+        )
+    if cache.disk is not None:
+        cache.disk.prune()
+    cache = doc.generated_rest
+    if cache.hits or cache.misses:
+        logger.verbose(
+            "[sphinxcontrib-matlabdomain] Generated reST for %d directives, "
+            "reused the reST of %d directives.",
+            cache.misses,
+            cache.hits,
+        )
+    if cache.disk is not None:
+        cache.disk.prune()
+    cache = mat_highlight.highlight_cache
+    if cache.hits or cache.misses:
+        logger.verbose(
+            "[sphinxcontrib-matlabdomain] Highlighted %d MATLAB code blocks, "
+            "reused %d highlighted code blocks.",
+            cache.misses,
+            cache.hits,
+        )
+    if cache.disk is not None:
+        cache.disk.prune()
+    if mat_profile.profiler.enabled:
+        for name, cache in [
+            ("auto_link", mat_auto_link.linked_docstrings),
+            ("rest", doc.generated_rest),
+            ("highlight", mat_highlight.highlight_cache),
+        ]:
+            mat_profile.profiler.cache(name, cache.hits, cache.misses)
 
 
 def ensure_configuration(app, env):  # noqa: ARG001
@@ -854,9 +1056,30 @@ def ensure_configuration(app, env):  # noqa: ARG001
         env.matlab_keep_package_prefix = False
 
 
+def setup_lexer(app, config):
+    if config.matlab_lexer is None:
+        return
+    if config.matlab_lexer == "regex":
+        app.add_lexer("matlab", mat_lexer.MatlabLexer)
+    elif config.matlab_lexer == "tree-sitter":
+        app.add_lexer("matlab", mat_tree_sitter_lexer.TreeSitterMatlabLexer)
+    else:
+        logger.warning(
+            "[sphinxcontrib-matlabdomain] Unknown matlab_lexer %r, "
+            "expected 'regex' or 'tree-sitter'.",
+            config.matlab_lexer,
+        )
+
+
 def setup(app):
     app.connect("config-inited", ensure_configuration)
+    app.connect("config-inited", setup_lexer)
     app.connect("builder-inited", analyze)
+    app.connect("builder-inited", mat_highlight.setup_highlight_cache)
+    app.connect("env-before-read-docs", check_autodoc_events)
+    app.connect("build-finished", report_caches)
+    app.connect("build-finished", mat_profile.report_profile)
+    app.connect("build-finished", mat_trace.close_trace)
 
     app.add_domain(MATLABDomain)
     # autodoc
@@ -868,6 +1091,16 @@ def setup(app):
     app.add_config_value("matlab_short_links", False, "env")
     app.add_config_value("matlab_auto_link", None, "env")
     app.add_config_value("matlab_class_signature", False, "env")
+    app.add_config_value("matlab_parse_workers", None, "")
+    app.add_config_value("matlab_cache_dir", None, "")
+    app.add_config_value("matlab_cache_max_size", 256 * 1024 * 1024, "")
+    app.add_config_value("matlab_cache_rest", False, "")
+    app.add_config_value("matlab_lexer", None, "env")
+    app.add_config_value("matlab_cache_highlight", False, "")
+    app.add_config_value(
+        "matlab_profile", False, "", types=ENUM(False, True, "cprofile")
+    )
+    app.add_config_value("matlab_trace", None, "")
 
     app.registry.add_documenter("mat:module", doc.MatModuleDocumenter)
     app.add_directive_to_domain(
@@ -922,4 +1155,6 @@ def setup(app):
     app.add_autodoc_attrgetter(mat_types.MatModule, mat_types.MatModule.getter)
     app.add_autodoc_attrgetter(doc.MatClass, doc.MatClass.getter)
 
-    return {"parallel_read_safe": False}
+    # Documents are read by forked processes, which inherit the entities found
+    # by `analyze` when the builder was initialized.
+    return {"parallel_read_safe": True}
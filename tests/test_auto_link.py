@@ -0,0 +1,186 @@
+"""Test the auto-linker for ``matlab_auto_link = "all"``."""
+
+import os
+import random
+import re
+import shutil
+from types import SimpleNamespace
+
+import pytest
+
+from sphinxcontrib.mat_auto_link import (
+    MatAutoLinker,
+    MatMemberLinker,
+    get_auto_linker,
+    get_member_linker,
+    linked_docstrings,
+)
+from sphinxcontrib.mat_types import MatClass, symbol_table
+
+SEPARATORS = [" ", ", ", ".", "(", ")", "`", "*", "<", "@", "+", "\xa0", ": ", "\t"]
+
+
+def make_lines(linker, count, seed=0):
+    rng = random.Random(seed)
+    words = ["Properties:", "Methods:", "foo", "a.b"]
+    for symbol in linker.symbols:
+        words.append(symbol.target)
+        if isinstance(symbol.entity, MatClass):
+            words.extend(
+                f"{symbol.target}.{member}"
+                for member in symbol.entity.property_names + symbol.entity.method_names
+            )
+    lines = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            parts.append(rng.choice(SEPARATORS))
+            parts.append(rng.choice(words))
+        lines.append("".join(parts))
+    return lines
+
+
+@pytest.mark.parametrize("root", ["test_autodoc", "test_classfolder", "test_pymat"])
+def test_same_as_sequential(make_app, rootdir, root):
+    make_app(srcdir=rootdir / "roots" / root)
+    linker = get_auto_linker()
+    assert linker.symbols == symbol_table.link_symbols
+
+    lines = make_lines(linker, 2000)
+    for obj in symbol_table.canonical.values():
+        if obj.__doc__:
+            lines.extend(obj.__doc__.splitlines())
+
+    for line in lines:
+        assert linker.link_line(line) == linker.link_line_sequential(line), line
+
+
+def test_link_line(make_app, rootdir):
+    make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    linker = get_auto_linker()
+
+    line = "Use ClassExample.a, ClassExample.b and ClassExample not `ClassExample`"
+    assert linker.link_line(line) == (
+        "Use :attr:`ClassExample.a`, :attr:`ClassExample.a` and "
+        ":class:`ClassExample` not `ClassExample`"
+    )
+    assert linker.link_line("ClassExample Properties:") == "ClassExample Properties:"
+    assert linker.link_line("package.ClassBar.doFoo()") == (
+        ":meth:`package.ClassBar.doFoo`()"
+    )
+
+
+def test_rebuilt_after_analyze(make_app, rootdir):
+    make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    linker = get_auto_linker()
+    assert get_auto_linker() is linker
+
+    make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    assert get_auto_linker() is not linker
+
+
+def test_role_names_are_linked_sequentially():
+    class Symbol:
+        def __init__(self, target, role="func"):
+            self.target = target
+            self.role = role
+
+    linker = MatAutoLinker([Symbol("Foo", "class"), Symbol("class")])
+    assert linker.sequential
+    line = "Foo and class"
+    assert linker.link_line(line) == linker.link_line_sequential(line)
+
+
+def link_calls_sequential(cls, fullname, line):
+    # auto_link_methods before the member linker, one method after the other
+    for n in cls.method_names:
+        p = re.compile(r"(?<!(`|\.|<|@|\*|\xa0))\b" + n + r"\(\)(?!\xa0)")
+        line = p.sub(f":meth:`{n}() <{fullname}.{n}>`", line)
+    return line
+
+
+def test_member_linker_calls():
+    cls = SimpleNamespace(method_names=[f"method{i}" for i in range(300)])
+    linker = MatMemberLinker(cls, "pkg.Class")
+    rng = random.Random(0)
+    words = [*cls.method_names, "other", "method", "Class"]
+    for _ in range(500):
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            parts.append(rng.choice(SEPARATORS))
+            parts.append(rng.choice(words) + rng.choice(["()", "", "()\xa0"]))
+        line = "".join(parts)
+        expected = link_calls_sequential(cls, "pkg.Class", line)
+        assert linker.link_calls(line) == expected, line
+
+
+def test_member_linker(make_app, rootdir):
+    app = make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    cls = symbol_table["target.ClassExample"]
+    linker = get_member_linker(cls, app.env)
+    assert get_member_linker(cls, app.env) is linker
+    assert linker.fullname == "target.ClassExample"
+
+    assert linker.link_entry("attr", "* a - first property") == (
+        "* :attr:`a <target.ClassExample.a>` - first property"
+    )
+    assert linker.link_entry("meth", "mymethod - a method") == (
+        "* :meth:`mymethod() <target.ClassExample.mymethod>` - a method"
+    )
+    assert linker.link_self("meth", "mymethod", "Call mymethod or b.mymethod") == (
+        "Call :meth:`mymethod() <target.ClassExample.mymethod>` or b.mymethod"
+    )
+    assert linker.link_self("attr", "a", "Set a, not `a`") == (
+        "Set :attr:`a <target.ClassExample.a>`, not `a`"
+    )
+
+    make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    assert get_member_linker(cls, app.env) is not linker
+
+
+@pytest.fixture
+def autodoc_srcdir(rootdir, tmp_path):
+    srcdir = tmp_path / "test_autodoc"
+    shutil.copytree(
+        rootdir / "roots" / "test_autodoc",
+        srcdir,
+        ignore=shutil.ignore_patterns("_build"),
+    )
+    # Docstrings linked by other tests are still in memory.
+    linked_docstrings._entries.clear()
+    return srcdir
+
+
+def build(make_app, srcdir, **confoverrides):
+    app = make_app(
+        srcdir=srcdir,
+        confoverrides={"matlab_auto_link": "all", **confoverrides},
+        freshenv=True,
+    )
+    app.builder.build_all()
+    return app
+
+
+def test_linked_docstrings_are_cached(make_app, autodoc_srcdir):
+    app = build(make_app, autodoc_srcdir)
+    assert linked_docstrings.misses > 0
+    doctree = (app.doctreedir / "index_target.doctree").read_bytes()
+
+    app = build(make_app, autodoc_srcdir)
+    assert linked_docstrings.misses == 0
+    assert linked_docstrings.hits > 0
+    assert (app.doctreedir / "index_target.doctree").read_bytes() == doctree
+
+    # A different configuration is linked again.
+    build(make_app, autodoc_srcdir, matlab_short_links=True)
+    assert linked_docstrings.misses > 0
+
+
+def test_linked_docstrings_disk_cache(make_app, autodoc_srcdir):
+    build(make_app, autodoc_srcdir, matlab_cache_dir="cache")
+    assert os.listdir(autodoc_srcdir / "cache" / "autolink")
+
+    linked_docstrings._entries.clear()
+    build(make_app, autodoc_srcdir, matlab_cache_dir="cache")
+    assert linked_docstrings.hits > 0
+    assert linked_docstrings.misses == 0
@@ -8,6 +8,7 @@ Test the autodoc extension.
 """
 
 import pickle
+from collections import Counter
 
 import pytest
 
@@ -243,3 +244,17 @@ def test_root_class_signature(app, confdict):
         content[0].astext()
         == "root\n\n\n\nclass BaseClass(obj, args)\n\nA class in the very root of the directory\n\nBaseClass Methods:\n\nBaseClass - the constructor, whose description extends\n\nto the next line\n\nDoBase - another BaseClass method\n\nSee Also\n\ntarget.ClassExample, baseFunction, ClassExample\n\nConstructor Summary\n\n\n\n\n\nBaseClass(obj, args)\n\nThe constructor\n\nMethod Summary\n\n\n\n\n\nDoBase()\n\nDo the Base thing\n\n\n\nbaseFunction(x)\n\nReturn the base of x\n\nSee Also:\n\ntarget.submodule.ClassMeow\ntarget.package.ClassBar\nClassMeow\npackage.ClassBar"
     )
+
+
+def test_class_members_filtered_once(make_app, srcdir):
+    app = make_app(srcdir=srcdir)
+    skipped = Counter()
+
+    def count_member(app, what, name, obj, skip, options):
+        if what == "class":
+            skipped[name] += 1
+
+    app.connect("autodoc-skip-member", count_member)
+    app.builder.build_all()
+    assert skipped["mymethod"] == 1
+    assert set(skipped.values()) == {1}
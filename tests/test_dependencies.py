@@ -0,0 +1,75 @@
+"""Test the dependencies recorded for documents using MATLAB files."""
+
+import os
+import shutil
+
+import pytest
+
+from sphinxcontrib import mat_types
+
+
+@pytest.fixture
+def srcdir(rootdir):
+    return rootdir / "roots" / "test_classfolder"
+
+
+def test_classfolder_dependencies(app, srcdir):
+    dependencies = app.env.dependencies
+    first = {os.path.relpath(dep, srcdir) for dep in dependencies["index_first"]}
+    second = {os.path.relpath(dep, srcdir) for dep in dependencies["index_second"]}
+
+    assert first == {
+        os.path.join("@First", "First.m"),
+        os.path.join("@First", "method_in_folder.m"),
+    }
+    assert second == {
+        os.path.join("src", "@Second", "Second.m"),
+        os.path.join("src", "@Second", "method_in_folder.m"),
+    }
+
+
+def test_source_files_of_members(app, srcdir):
+    first = mat_types.entities_table["First"]
+    first_m = str(srcdir / "@First" / "First.m")
+
+    assert first.getter("a").source_files() == [first_m]
+    assert first.methods["method_inside_classdef"].source_files() == [first_m]
+    assert first.methods["method_in_folder"].source_files() == [
+        str(srcdir / "@First" / "method_in_folder.m")
+    ]
+
+
+def test_source_files_of_superclasses(make_app, rootdir):
+    srcdir = rootdir / "roots" / "test_duplicate_link"
+    make_app(srcdir=srcdir)
+    group = mat_types.entities_table["replab.Group"]
+
+    def names(files):
+        return [os.path.basename(filename) for filename in files]
+
+    assert names(group.source_files()) == ["Group.m"]
+    assert names(group.source_files(inherited=True)) == [
+        "Group.m",
+        "Monoid.m",
+        "Domain.m",
+    ]
+
+
+def test_unchanged_automodule_is_not_read_again(make_app, rootdir, tmp_path):
+    srcdir = tmp_path / "test_autodoc"
+    shutil.copytree(
+        rootdir / "roots" / "test_autodoc",
+        srcdir,
+        ignore=shutil.ignore_patterns("_build"),
+    )
+    app = make_app(srcdir=srcdir)
+    app.build()
+    dependencies = app.env.dependencies["index_package"]
+    assert dependencies
+    assert all(os.path.isfile(dependency) for dependency in dependencies)
+
+    app = make_app(srcdir=srcdir)
+    read = []
+    app.connect("env-before-read-docs", lambda _app, _env, docs: read.extend(docs))
+    app.build()
+    assert read == []
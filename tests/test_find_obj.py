@@ -0,0 +1,117 @@
+"""Test the object indexes used to resolve cross-references."""
+
+import random
+
+import pytest
+from docutils import nodes
+from sphinx import addnodes
+
+from sphinxcontrib.matlab import MatObjectIndex
+
+
+@pytest.fixture
+def domain(make_app, rootdir):
+    app = make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    domain = app.env.domains["mat"]
+    domain.data["objects"] = {}
+    return domain
+
+
+def fuzzy_scan(objects, name, objtypes):
+    # find_obj before the suffix index
+    return [
+        (oname, objects[oname])
+        for oname in objects
+        if oname.endswith(f".{name}") and objects[oname][1] in objtypes
+    ]
+
+
+def test_fuzzy_matches_scan(domain):
+    rng = random.Random(0)
+    parts = ["pkg", "sub", "Class", "method", "prop", "a", "b"]
+    objtypes = ["class", "method", "attribute", "function", "module"]
+    for _ in range(500):
+        fullname = ".".join(rng.choice(parts) for _ in range(rng.randint(1, 4)))
+        docname = rng.choice(["first", "second", "third"])
+        domain.note_object(fullname, rng.choice(objtypes), docname)
+    domain.clear_doc("second")
+
+    objects = domain.data["objects"]
+    assert MatObjectIndex(objects, {}).suffixes == domain.object_index.suffixes
+    for name in ["method", "Class.method", "sub.Class", "b.a", "x"]:
+        for role in ["meth", "attr", "class", "func", "obj"]:
+            objtypes = domain.objtypes_for_role(role)
+            if name in objects and objects[name][1] in objtypes:
+                # exact matches are found first
+                continue
+            expected = fuzzy_scan(objects, name, objtypes)
+            assert domain.find_obj(None, None, name, role, 1) == expected
+
+
+def test_index_updated(domain):
+    domain.note_object("pkg.Class", "class", "first")
+    domain.note_object("pkg.Class.method", "method", "first")
+    domain.note_object("other.Class", "class", "second")
+    index = domain.object_index
+    assert index.suffixes[".Class"] == ["pkg.Class", "other.Class"]
+    assert index.suffixes[".Class.method"] == ["pkg.Class.method"]
+    assert index.has_objtypes(["method"])
+
+    domain.clear_doc("first")
+    assert index.suffixes == {".Class": ["other.Class"]}
+    assert not index.has_objtypes(["method", "attribute"])
+    assert domain.find_obj(None, None, "Class", "class", 1) == [
+        ("other.Class", ("second", "class"))
+    ]
+
+
+@pytest.mark.parametrize("refspecific", [False, True])
+def test_any_xref_skips_roles_without_objects(make_app, rootdir, refspecific):
+    app = make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    domain = app.env.domains["mat"]
+    domain.data["objects"] = {}
+    domain.note_object("pkg.Class", "class", "index")
+    node = addnodes.pending_xref("", refdomain="", reftype="any")
+    if refspecific:
+        node["refspecific"] = True
+
+    results = domain.resolve_any_xref(
+        app.env, "index", app.builder, "pkg.Class", node, nodes.literal()
+    )
+    assert [role for role, _ in results] == ["mat:class", "mat:obj"]
+
+
+def test_docnames_index(domain):
+    domain.data["modules"] = {}
+    domain.note_module("pkg", "first", "", "", False)
+    domain.note_object("pkg", "module", "first")
+    domain.note_object("pkg.Class", "class", "first")
+    domain.note_object("pkg.func", "function", "second")
+    # described again in another document
+    domain.note_object("pkg.Class", "class", "second")
+    domain.merge_domaindata(
+        {"third"},
+        {
+            "objects": {"other.f": ("third", "function")},
+            "modules": {"other": ("third", "", "", False)},
+        },
+    )
+
+    index = domain.object_index
+    assert index.docnames == {
+        "first": {"pkg": None},
+        "second": {"pkg.func": None, "pkg.Class": None},
+        "third": {"other.f": None},
+    }
+    assert index.module_docnames == {"first": {"pkg": None}, "third": {"other": None}}
+    # the same as an index built from a pickled environment
+    rebuilt = MatObjectIndex(domain.data["objects"], domain.data["modules"])
+    assert rebuilt.docnames == index.docnames
+    assert rebuilt.module_docnames == index.module_docnames
+
+    domain.clear_doc("second")
+    domain.clear_doc("third")
+    assert domain.data["objects"] == {"pkg": ("first", "module")}
+    assert domain.data["modules"] == {"pkg": ("first", "", "", False)}
+    assert index.docnames == {"first": {"pkg": None}}
+    assert index.module_docnames == {"first": {"pkg": None}}
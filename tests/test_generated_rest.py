@@ -0,0 +1,131 @@
+"""Test the cache of generated reST, ``matlab_cache_rest``."""
+
+import pickle
+import shutil
+
+import pytest
+
+from sphinxcontrib.mat_documenters import generated_rest
+
+
+@pytest.fixture
+def autodoc_srcdir(rootdir, tmp_path):
+    srcdir = tmp_path / "test_autodoc"
+    shutil.copytree(
+        rootdir / "roots" / "test_autodoc",
+        srcdir,
+        ignore=shutil.ignore_patterns("_build"),
+    )
+    return srcdir
+
+
+def build(make_app, srcdir, connect=None, **confoverrides):
+    app = make_app(
+        srcdir=srcdir,
+        confoverrides={
+            "matlab_cache_rest": True,
+            "matlab_cache_dir": "cache",
+            **confoverrides,
+        },
+        freshenv=True,
+    )
+    if connect:
+        app.connect(*connect)
+    app.builder.build_all()
+    return app
+
+
+def doctrees(app):
+    return {
+        path.name: pickle.loads(path.read_bytes()).pformat()
+        for path in app.doctreedir.glob("*.doctree")
+    }
+
+
+def test_generated_rest_is_replayed(make_app, autodoc_srcdir):
+    app = build(make_app, autodoc_srcdir)
+    generated = generated_rest.misses
+    assert generated > 0
+    assert generated_rest.hits == 0
+    expected = doctrees(app)
+    dependencies = app.env.dependencies
+
+    app = build(make_app, autodoc_srcdir)
+    assert (generated_rest.hits, generated_rest.misses) == (generated, 0)
+    assert doctrees(app) == expected
+    assert app.env.dependencies == dependencies
+
+
+def test_changed_file_is_generated_again(make_app, autodoc_srcdir):
+    build(make_app, autodoc_srcdir)
+    generated = generated_rest.misses
+
+    mfile = autodoc_srcdir / "target" / "ClassExample.m"
+    mfile.write_text(mfile.read_text().replace("Example class", "Changed class"))
+    app = build(make_app, autodoc_srcdir)
+    assert generated_rest.misses == 2  # automodule target and autoclass
+    assert generated_rest.hits == generated - 2
+    assert "Changed class" in doctrees(app)["index_target.doctree"]
+
+
+def test_not_cached_by_default(make_app, autodoc_srcdir):
+    build(make_app, autodoc_srcdir, matlab_cache_rest=False)
+    assert (generated_rest.hits, generated_rest.misses) == (0, 0)
+
+
+def test_not_cached_with_autodoc_hooks(make_app, autodoc_srcdir):
+    processed = []
+
+    def process_docstring(app, what, name, obj, options, lines):
+        processed.append(name)
+
+    build(make_app, autodoc_srcdir)
+    build(
+        make_app,
+        autodoc_srcdir,
+        connect=("autodoc-process-docstring", process_docstring),
+    )
+    assert (generated_rest.hits, generated_rest.misses) == (0, 0)
+    assert "target.ClassExample" in processed
+
+
+def test_moved_superclass_is_linked_again(make_app, tmp_path):
+    srcdir = tmp_path / "inheritance"
+    (srcdir / "src" / "app").mkdir(parents=True)
+    (srcdir / "src" / "lib").mkdir()
+    (srcdir / "src" / "other").mkdir()
+    (srcdir / "conf.py").write_text(
+        'extensions = ["sphinx.ext.autodoc", "sphinxcontrib.matlab"]\n'
+        'primary_domain = "mat"\n'
+        'matlab_src_dir = "src"\n'
+        'matlab_cache_dir = "cache"\n'
+    )
+    (srcdir / "index.rst").write_text(
+        "Index\n=====\n\n"
+        ".. mat:module:: app\n\n"
+        ".. mat:autoclass:: Sub\n"
+        "   :show-inheritance:\n"
+    )
+    (srcdir / "src" / "app" / "Sub.m").write_text(
+        "classdef Sub < Base\n    % A subclass\nend\n"
+    )
+    base = srcdir / "src" / "lib" / "Base.m"
+    base.write_text("classdef Base\n    % A superclass\nend\n")
+
+    app = build(make_app, srcdir)
+    assert "lib.Base" in doctrees(app)["index.doctree"]
+
+    base.rename(srcdir / "src" / "other" / "Base.m")
+    app = build(make_app, srcdir)
+    doctree = doctrees(app)["index.doctree"]
+    assert "other.Base" in doctree
+    assert "lib.Base" not in doctree
+
+
+def test_reset_drops_entries():
+    generated_rest.reset()
+    generated_rest.put("key", [("line", "source", 0)], set())
+    assert generated_rest.get("key") is not None
+
+    generated_rest.reset()
+    assert generated_rest.get("key") is None
@@ -0,0 +1,79 @@
+"""Test the cache of highlighted MATLAB code, ``matlab_cache_highlight``."""
+
+import shutil
+
+import pytest
+
+from sphinxcontrib.mat_highlight import CachedHighlighter, highlight_cache
+
+LISTINGS = """
+
+.. code-block:: matlab
+
+    x = sin(pi / 2);  % one
+
+.. literalinclude:: target/ClassExample.m
+    :language: matlab
+    :linenos:
+
+.. code-block:: python
+
+    x = 1
+"""
+
+
+@pytest.fixture
+def listing_srcdir(rootdir, tmp_path):
+    srcdir = tmp_path / "test_autodoc"
+    shutil.copytree(
+        rootdir / "roots" / "test_autodoc",
+        srcdir,
+        ignore=shutil.ignore_patterns("_build"),
+    )
+    with open(srcdir / "index.rst", "a", encoding="utf-8") as index:
+        index.write(LISTINGS)
+    return srcdir
+
+
+def build(make_app, srcdir, **confoverrides):
+    app = make_app(
+        "html",
+        srcdir=srcdir,
+        confoverrides={"matlab_cache_highlight": True, **confoverrides},
+        freshenv=True,
+    )
+    app.builder.build_all()
+    return app
+
+
+def test_highlighted_code_is_reused(make_app, listing_srcdir):
+    app = build(make_app, listing_srcdir)
+    assert isinstance(app.builder.highlighter, CachedHighlighter)
+    assert (highlight_cache.hits, highlight_cache.misses) == (0, 2)
+    assert (app.doctreedir / "matlab_highlight").is_dir()
+    html = (app.outdir / "index.html").read_text(encoding="utf-8")
+
+    app = build(make_app, listing_srcdir)
+    assert (highlight_cache.hits, highlight_cache.misses) == (2, 0)
+    assert (app.outdir / "index.html").read_text(encoding="utf-8") == html
+
+    # Other formatter options are highlighted again.
+    build(make_app, listing_srcdir, pygments_style="default")
+    assert (highlight_cache.hits, highlight_cache.misses) == (0, 2)
+
+
+def test_changed_code_is_highlighted_again(make_app, listing_srcdir):
+    build(make_app, listing_srcdir, matlab_cache_dir="cache")
+    assert (listing_srcdir / "cache" / "highlight").is_dir()
+
+    mfile = listing_srcdir / "target" / "ClassExample.m"
+    mfile.write_text(mfile.read_text().replace("Example class", "Changed class"))
+    app = build(make_app, listing_srcdir, matlab_cache_dir="cache")
+    assert (highlight_cache.hits, highlight_cache.misses) == (1, 1)
+    assert "Changed class" in (app.outdir / "index.html").read_text(encoding="utf-8")
+
+
+def test_not_cached_by_default(make_app, listing_srcdir):
+    app = build(make_app, listing_srcdir, matlab_cache_highlight=False)
+    assert not isinstance(app.builder.highlighter, CachedHighlighter)
+    assert highlight_cache.disk is None
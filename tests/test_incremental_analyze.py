@@ -0,0 +1,86 @@
+"""Test reusing the analysis of unchanged MATLAB files between builds."""
+
+import os
+import shutil
+
+import pytest
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_types import MatMethod, MatObject
+
+
+@pytest.fixture
+def srcdir(rootdir, tmp_path):
+    srcdir = tmp_path / "test_classfolder"
+    shutil.copytree(rootdir / "roots" / "test_classfolder", srcdir)
+    return srcdir
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Names of the files parsed by ``MatObject.parse_mfile``."""
+    monkeypatch.setattr(MatObject, "parse_cache", None)
+    parsed = []
+    parse_mfile = MatObject.parse_mfile
+
+    def counting_parse_mfile(mfile, name, path, encoding=None):
+        parsed.append(os.path.basename(mfile))
+        return parse_mfile(mfile, name, path, encoding)
+
+    monkeypatch.setattr(MatObject, "parse_mfile", staticmethod(counting_parse_mfile))
+    return parsed
+
+
+def build(make_app, srcdir):
+    app = make_app(srcdir=srcdir)
+    app.build()
+    return app
+
+
+def test_unchanged_files_are_not_parsed(make_app, srcdir, parsed):
+    build(make_app, srcdir)
+    assert "First.m" in parsed
+    names = list(mat_types.entities_table)
+
+    parsed.clear()
+    build(make_app, srcdir)
+
+    assert parsed == []
+    assert list(mat_types.entities_table) == names
+    first = mat_types.entities_table["First"]
+    assert isinstance(first.methods["method_in_folder"], MatMethod)
+    assert first.methods["method_in_folder"].cls is first
+
+
+def test_changed_file_is_parsed(make_app, srcdir, parsed):
+    build(make_app, srcdir)
+
+    mexfunction = srcdir / "@First" / "dlls" / "mexfunction.m"
+    mexfunction.write_text(mexfunction.read_text() + "\n% changed\n")
+    parsed.clear()
+    build(make_app, srcdir)
+
+    assert parsed == ["mexfunction.m"]
+
+
+def test_touched_file_is_not_parsed(make_app, srcdir, parsed):
+    build(make_app, srcdir)
+
+    os.utime(srcdir / "src" / "@Second" / "Second.m", (0, 0))
+    parsed.clear()
+    build(make_app, srcdir)
+
+    assert parsed == []
+
+
+def test_changed_class_folder_is_parsed(make_app, srcdir, parsed):
+    build(make_app, srcdir)
+
+    (srcdir / "@First" / "method_in_folder.m").unlink()
+    parsed.clear()
+    build(make_app, srcdir)
+
+    # The other files of the class folder are parsed again as well.
+    assert parsed == ["First.m"]
+    first = mat_types.entities_table["First"]
+    assert "method_in_folder" not in first.methods
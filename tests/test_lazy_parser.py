@@ -0,0 +1,59 @@
+"""Test that the tree-sitter parser and queries are created on first use."""
+
+import subprocess
+import sys
+import threading
+
+from sphinxcontrib import mat_tree_sitter_parser
+from sphinxcontrib.mat_tree_sitter_parser import LazyQuery, get_parser
+from sphinxcontrib.mat_types import parse_tree
+
+IMPORT_CHECK = """
+import sphinxcontrib.matlab
+from sphinxcontrib import mat_tree_sitter_parser as p
+queries = [q for q in vars(p).values() if isinstance(q, p.LazyQuery)]
+print(len(queries), sum(q.query is not None for q in queries))
+print(p.tree_sitter_version.cache_info().currsize, p.get_language.cache_info().currsize)
+"""
+
+
+def test_import_creates_nothing():
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_CHECK],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    queries, compiled, probed, languages = map(int, result.stdout.split())
+    assert queries > 0
+    assert compiled == 0
+    assert probed == 0
+    assert languages == 0
+
+
+def test_query_compiled_once():
+    query = LazyQuery("(class_definition) @class")
+    assert query.query is None
+    tree = parse_tree(b"classdef A\nend\n")
+    assert len(query.matches(tree.root_node)) == 1
+    compiled = query.query
+    assert compiled is not None
+    assert query.captures(tree.root_node)
+    assert query.query is compiled
+
+
+def test_parser_reused_per_thread():
+    parser = get_parser()
+    assert get_parser() is parser
+    parse_tree(b"function f\nend\n")
+    assert get_parser() is parser
+
+    parsers = []
+    thread = threading.Thread(target=lambda: parsers.append(get_parser()))
+    thread.start()
+    thread.join()
+    assert parsers[0] is not parser
+
+
+def test_ml_lang_is_available():
+    assert mat_tree_sitter_parser.ML_LANG is mat_tree_sitter_parser.get_language()
@@ -0,0 +1,106 @@
+"""Test the on-disk caches."""
+
+import os
+import shutil
+
+import pytest
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_cache import DiskCache, content_key
+from sphinxcontrib.mat_types import MatClass, MatFunction, MatObject
+
+
+@pytest.fixture
+def parse_cache(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path / "cache"), 1024 * 1024)
+    monkeypatch.setattr(MatObject, "parse_cache", cache)
+    return cache
+
+
+def test_content_key():
+    assert content_key(b"ab", "c") == content_key(b"ab", "c")
+    assert content_key(b"ab", "c") != content_key(b"a", "bc")
+
+
+def test_disk_cache_roundtrip(tmp_path):
+    cache = DiskCache(str(tmp_path), 1024)
+    key = content_key("value")
+
+    assert cache.get(key) is None
+    cache.put(key, {"a": 1})
+    assert cache.get(key) == {"a": 1}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_disk_cache_prune_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), 1024 * 1024)
+    keys = [content_key(str(i)) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, bytes(100))
+        os.utime(cache._entry_path(key), (i, i))
+    # reading makes the oldest entry the most recently used one
+    cache.get(keys[0])
+
+    entry_size = os.path.getsize(cache._entry_path(keys[0]))
+    cache.max_size = 2 * entry_size
+    assert cache.prune() == 1
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_parse_mfile_cached(dir_test_data, parse_cache):
+    mfile = dir_test_data / "ClassExample.m"
+
+    obj = MatObject.parse_mfile(mfile, "ClassExample", "test_data")
+    assert (parse_cache.hits, parse_cache.misses) == (0, 1)
+
+    cached = MatObject.parse_mfile(mfile, "ClassExample", "test_data")
+    assert (parse_cache.hits, parse_cache.misses) == (1, 1)
+
+    assert isinstance(cached, MatClass)
+    assert cached.docstring == obj.docstring
+    assert cached.bases == obj.bases
+    assert cached.properties == obj.properties
+    assert list(cached.methods) == list(obj.methods)
+    assert cached.methods["mymethod"].cls is cached
+    assert cached.methods["mymethod"].args == obj.methods["mymethod"].args
+
+
+def test_parse_mfile_cached_by_content(dir_test_data, tmp_path, parse_cache):
+    copy = tmp_path / "vendored" / "f_example.m"
+    copy.parent.mkdir()
+    shutil.copy(dir_test_data / "f_example.m", copy)
+
+    MatObject.parse_mfile(dir_test_data / "f_example.m", "f_example", "test_data")
+    obj = MatObject.parse_mfile(copy, "f_example", "vendored")
+
+    assert parse_cache.hits == 1
+    assert isinstance(obj, MatFunction)
+    assert obj.module == "vendored"
+    assert list(obj.args) == ["a1", "a2"]
+
+
+def test_parse_mfile_cache_key_encoding(dir_test_data, parse_cache):
+    mfile = dir_test_data / "f_with_latin_1.m"
+
+    MatObject.parse_mfile(mfile, "f_with_latin_1", "test_data", "latin-1")
+    MatObject.parse_mfile(mfile, "f_with_latin_1", "test_data", "utf-8")
+
+    assert parse_cache.hits == 0
+
+
+def test_analyze_with_cache_dir(make_app, rootdir, tmp_path, monkeypatch):
+    # restore the class attribute set by analyze after the test
+    monkeypatch.setattr(MatObject, "parse_cache", None)
+    confoverrides = {"matlab_cache_dir": str(tmp_path)}
+    make_app(srcdir=rootdir / "roots" / "test_autodoc", confoverrides=confoverrides)
+    expected = list(mat_types.entities_table)
+    assert MatObject.parse_cache.misses > 0
+    assert MatObject.parse_cache.hits == 0
+
+    make_app(srcdir=rootdir / "roots" / "test_autodoc", confoverrides=confoverrides)
+    assert list(mat_types.entities_table) == expected
+    assert MatObject.parse_cache.misses == 0
+    assert MatObject.parse_cache.hits > 0
@@ -1,8 +1,14 @@
 """Test mat_lexer module functions and methods."""
 
+import re
+from pathlib import Path
+
+import pytest
 from pygments.token import Token
+from sphinx.highlighting import lexer_classes
 
 from sphinxcontrib.mat_lexer import MatlabLexer
+from sphinxcontrib.mat_tree_sitter_lexer import TreeSitterMatlabLexer
 
 
 def test_strings():
@@ -26,3 +32,120 @@ def test_function_names():
         *MatlabLexer().get_tokens("function_name;functions;function;"), strict=False
     )
     assert Token.Name.Function not in tk_name
+
+
+TEST_DATA = Path(__file__).parent / "test_data"
+
+# MatlabLexer highlights "enumerated" instead of "enumeration" and lexes
+# function signatures one line at a time.
+REGEX_DIFFERENCES = {
+    "Bool.m",
+    "ClassWithEnumMethod.m",
+    "f_ellipsis_after_equals.m",
+    "f_ellipsis_empty_output.m",
+    "f_ellipsis_in_input.m",
+    "f_ellipsis_in_output.m",
+    "f_ellipsis_in_output_multiple.m",
+}
+
+SNIPPETS = [
+    "x = a' + b; y = [1 2]';\n!ls -l\nhold on\ndisp x\nif a, b=1; end\n",
+    "%{\nblock\n%}\ns = \"a\"\"b\" + 'it''s';\nz = 1.5e3 + 3e-2;\n",
+    "c = {1, 'a'}; d = x(end-1:end);\ns.end = 1;\n",
+    "function out = f(x)\n  % help\n  out = x.^2 ./ 3 \\ 4 * pi; % trailing\n"
+    "  out(out > 2 & out ~= 3 | ~out) = [];\nend\n",
+    "x = @(t) sin(t) ... comment\n  + cos(t);\nwhile true\n  break\nend\n"
+    "try\nerror('x')\ncatch err\nend\nswitch a\n case 1\n otherwise\nend\n",
+]
+
+
+def token_stream(lexer, code):
+    """Tokens of the words of *code*, whitespace is text."""
+    stream = []
+    for tokentype, value in lexer.get_tokens(code):
+        if tokentype in Token.Text:
+            tokentype = Token.Text
+        for part in re.split(r"(\s+)", value):
+            if part.isspace():
+                part_type = Token.Text
+            elif part:
+                part_type = tokentype
+            else:
+                continue
+            if stream and stream[-1][0] == part_type:
+                stream[-1] = (part_type, stream[-1][1] + part)
+            else:
+                stream.append((part_type, part))
+    return stream
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        path
+        for path in sorted(TEST_DATA.rglob("*.m"))
+        if path.name not in REGEX_DIFFERENCES
+    ],
+    ids=lambda path: path.relative_to(TEST_DATA).as_posix(),
+)
+def test_tree_sitter_same_tokens(path):
+    code = path.read_text(encoding="utf-8", errors="replace")
+    assert token_stream(TreeSitterMatlabLexer(), code) == token_stream(
+        MatlabLexer(), code
+    )
+
+
+@pytest.mark.parametrize("code", SNIPPETS)
+def test_tree_sitter_same_tokens_snippets(code):
+    assert token_stream(TreeSitterMatlabLexer(), code) == token_stream(
+        MatlabLexer(), code
+    )
+
+
+def test_tree_sitter_differences():
+    stream = token_stream(TreeSitterMatlabLexer(), "enumeration\n  On\nend\n")
+    assert stream[0] == (Token.Keyword, "enumeration")
+
+    code = "function [a, ...\n    b] = f(x)\nend\n"
+    assert token_stream(TreeSitterMatlabLexer(), code) == [
+        (Token.Keyword, "function"),
+        (Token.Text, " [a, "),
+        (Token.Comment, "..."),
+        (Token.Text, "\n    b] "),
+        (Token.Punctuation, "="),
+        (Token.Text, " "),
+        (Token.Name.Function, "f"),
+        (Token.Punctuation, "("),
+        (Token.Text, "x"),
+        (Token.Punctuation, ")"),
+        (Token.Text, "\n"),
+        (Token.Keyword, "end"),
+        (Token.Text, "\n"),
+    ]
+
+    tokens = list(TreeSitterMatlabLexer().get_tokens("b = a.' >= .5;"))
+    assert (Token.Operator, ".'") in tokens
+    assert (Token.Operator, ">=") in tokens
+    assert (Token.Number.Float, ".5") in tokens
+
+
+def test_tree_sitter_text_is_kept():
+    code = "x = 'ü€'; % ñ\n\tclassdef A\n\x00end"
+    tokens = list(TreeSitterMatlabLexer().get_tokens_unprocessed(code))
+    assert "".join(value for _, _, value in tokens) == code
+    assert all(code.startswith(value, index) for index, _, value in tokens)
+
+
+@pytest.mark.parametrize(
+    "matlab_lexer, lexer_class",
+    [("regex", MatlabLexer), ("tree-sitter", TreeSitterMatlabLexer)],
+)
+def test_matlab_lexer_config(make_app, rootdir, monkeypatch, matlab_lexer, lexer_class):
+    # The lexer is registered for the whole process.
+    monkeypatch.setitem(lexer_classes, "matlab", None)
+    app = make_app(
+        srcdir=rootdir / "roots" / "test_autodoc",
+        confoverrides={"matlab_lexer": matlab_lexer},
+    )
+    lexer = app.builder.highlighter.get_lexer("x = 1;", "matlab")
+    assert isinstance(lexer, lexer_class)
@@ -1,18 +1,34 @@
 """Test mat_types module functions and methods."""
 
+import pickle
+
 import pytest
 
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_tree_sitter_parser import (
+    PropertyRecord,
+    find_definition,
+    match_classdef,
+    q_classdef,
+)
 from sphinxcontrib.mat_types import (
     MatClass,
+    MatEnumeration,
     MatFunction,
     MatMethod,
     MatModule,
+    MatModuleAnalyzer,
     MatObject,
     MatProperty,
     MatScript,
+    MatSymbolTable,
     classfolder_class_name,
     entities_table,
+    parse_tree,
+    scan_folder,
     shortest_name,
+    source_digest,
+    symbol_table,
 )
 
 
@@ -1437,3 +1453,274 @@ def test_parse_mlappfile(dir_test_data):
     obj = MatObject.parse_mlappfile(mfile, "Application", "test_data")
     assert obj.name == "Application"
     assert obj.docstring == "Summary of app\n\nDescription of app"
+
+
+def test_scan_folder(tmp_path):
+    for name in ["func.m", "app.mlapp", "both.mlapp", "both.m", "pkg.m", "x.txt"]:
+        (tmp_path / name).write_text("")
+    for name in ["pkg", "+ns", ".git", "_build"]:
+        (tmp_path / name).mkdir()
+
+    entries = scan_folder(str(tmp_path))
+
+    assert {name: kind for name, (kind, _) in entries.items()} == {
+        "func": "m",
+        "app": "mlapp",
+        "both": "m",
+        "pkg": "dir",
+        "+ns": "dir",
+    }
+    assert entries["both"][1] == str(tmp_path / "both.m")
+    assert entries["pkg"][1] == str(tmp_path / "pkg")
+
+
+def test_safe_getmembers_does_not_stat(app, dir_test_data, monkeypatch):
+    def no_stat(*args):
+        raise AssertionError(f"unexpected stat of {args}")
+
+    mod = MatModule("test_data", str(dir_test_data), "test_data")
+    monkeypatch.setattr("os.path.isdir", no_stat)
+    monkeypatch.setattr("os.path.isfile", no_stat)
+    monkeypatch.setattr("os.path.exists", no_stat)
+    members = dict(mod.safe_getmembers())
+
+    assert isinstance(members["ClassExample"], MatClass)
+    assert isinstance(members["f_example"], MatFunction)
+
+
+def test_class_details_parsed_lazily(dir_test_data):
+    mfile = dir_test_data / "ClassExample.m"
+    obj = MatObject.parse_mfile(mfile, "ClassExample", "test_data")
+
+    assert "unparsed" in obj.__dict__
+    assert "properties" not in obj.__dict__
+    assert obj.bases == ["handle"]
+    assert "mymethod" in obj.method_names
+
+    assert obj.docstring
+    assert "unparsed" not in obj.__dict__
+    assert list(obj.methods) == obj.method_names
+    assert list(obj.properties) == obj.property_names
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "ClassExample",
+        "ClassWithEnumMethod",
+        "ClassWithEvent",
+        "ClassWithGetterSetter",
+        "ClassWithPropertyValidators",
+        "ClassWithTrailingCommentAfterBases",
+    ],
+)
+def test_class_header_matches_details(dir_test_data, name):
+    obj = MatObject.parse_mfile(dir_test_data / f"{name}.m", name, "test_data")
+    header = (obj.property_names, obj.method_names, obj.enumeration_names)
+
+    assert header == (list(obj.properties), list(obj.methods), list(obj.enumerations))
+
+
+def test_function_details_parsed_lazily(dir_test_data):
+    mfile = dir_test_data / "f_example.m"
+    obj = MatObject.parse_mfile(mfile, "f_example", "test_data")
+
+    assert obj.__dict__["unparsed"] == (source_digest(mfile), "utf-8")
+    assert obj.source_files() == [mfile]
+    assert "docstring" not in obj.__dict__
+    assert list(obj.args) == ["a1", "a2"]
+    assert "unparsed" not in obj.__dict__
+
+
+def test_unparsed_details_keep_no_source(dir_test_data):
+    mfile = dir_test_data / "ClassExample.m"
+    obj = MatObject.parse_mfile(mfile, "ClassExample", "test_data")
+    pickled = pickle.dumps(obj)
+
+    assert mfile.read_bytes() not in pickled
+    assert pickle.loads(pickled).docstring == obj.docstring
+
+
+def test_details_of_changed_file(tmp_path, monkeypatch):
+    mfile = tmp_path / "f.m"
+    mfile.write_text("function f(a)\n% Old docstring\nend\n")
+    obj = MatObject.parse_mfile(mfile, "f", "tmp")
+    mfile.write_text("function f(a, b)\n% New docstring\nend\n")
+    warnings = []
+    monkeypatch.setattr(
+        mat_types.logger, "warning", lambda *args: warnings.append(args)
+    )
+
+    assert list(obj.args) == ["a", "b"]
+    assert "changed since it was analyzed" in warnings[0][0]
+    assert warnings[0][1] == mfile
+
+
+def test_module_members(app, dir_test_data, monkeypatch):
+    mod = MatModule("test_data", str(dir_test_data), "test_data")
+    entities = mod.safe_getmembers()
+
+    assert entities == list(mod.members.items())
+    assert mod.getter("__all__") == entities
+
+    def no_matlabify(*args):
+        raise AssertionError(f"unexpected matlabify of {args}")
+
+    monkeypatch.setattr(MatObject, "matlabify", no_matlabify)
+    assert mod.getter("ClassExample") is mod.members["ClassExample"]
+
+
+def test_class_index(make_app, rootdir):
+    make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    bar = entities_table["target.+package.ClassBar"]
+
+    for name in ["target.+package.ClassBar", "target.package.ClassBar"]:
+        assert symbol_table.classes[name] is bar
+    assert symbol_table.classes["package.ClassBar"] is bar
+    assert "target.+package" not in symbol_table.classes
+    assert bar.__bases__ == {"handle": None}
+
+
+def test_symbol_table(make_app, rootdir):
+    make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    bar = symbol_table["target.+package.ClassBar"]
+
+    symbol = symbol_table.find_link("package.ClassBar", keep_package_prefix=False)
+    assert symbol.entity is bar
+    assert symbol.role == "class"
+    assert symbol.target == "package.ClassBar"
+    assert symbol_table.find_link("+package.ClassBar", False) is None
+    assert symbol_table.find_link("+package.ClassBar", True) is None
+    assert symbol_table.resolve("target.package.ClassBar", False) is bar
+    assert symbol_table.resolve("target.package.ClassBar", True) is None
+    assert symbol_table.module("target") is entities_table["target"]
+    assert symbol in symbol_table.link_symbols
+    assert bar in symbol_table.roles["class"].values()
+
+
+def test_symbol_table_conflicts():
+    table = MatSymbolTable()
+    first = MatModule("first", "", "first")
+    second = MatModule("second", "", "second")
+    table._add_alias("name", first)
+    table._add_alias("name", first)
+    assert table.conflicts == []
+    table._add_alias("name", second)
+    assert table.conflicts == [("name", first, second)]
+    assert table["name"] is second
+
+
+def test_member_records(dir_test_data):
+    mfile = dir_test_data / "ClassWithPropertyAttributes.m"
+    obj = MatObject.parse_mfile(mfile, "ClassWithPropertyAttributes", "test_data")
+    other = MatObject.parse_mfile(mfile, "ClassWithPropertyAttributes", "test_data")
+
+    record = obj.properties["testPublic"]
+    assert isinstance(record, PropertyRecord)
+    assert not hasattr(record, "__dict__")
+    assert record.docstring == record["docstring"]
+    assert dict(record.items()) == record
+    # Equal attribute dictionaries are shared, also between classes
+    assert record.attrs is other.properties["testPublic"].attrs
+    assert obj.properties["testNormal"].attrs is obj.attrs
+
+    prop = obj.getter("testPublic")
+    assert isinstance(prop, MatProperty)
+    assert not hasattr(prop, "__dict__")
+    copy = pickle.loads(pickle.dumps(prop))
+    assert (copy.name, copy.attrs, copy.docstring) == (
+        "testPublic",
+        {"Access": "public"},
+        "Public property",
+    )
+
+
+def test_enumeration_has_no_dict(dir_test_data):
+    mfile = dir_test_data / "ClassWithEnumMethod.m"
+    obj = MatObject.parse_mfile(mfile, "ClassWithEnumMethod", "test_data")
+
+    enum = obj.getter(obj.enumeration_names[0])
+    assert isinstance(enum, MatEnumeration)
+    assert not hasattr(enum, "__dict__")
+    copy = pickle.loads(pickle.dumps(enum))
+    assert (copy.name, copy.docstring) == (enum.name, enum.docstring)
+
+
+def test_attr_docs_by_namespace(make_app, rootdir):
+    make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    attr_docs = MatModuleAnalyzer.for_module("target").find_attr_docs()
+    cls = attr_docs.module.members["ClassExample"]
+    assert "unparsed" in cls.__dict__
+
+    # The folder members are not parsed for the members of a subfolder.
+    assert attr_docs.namespace("target.submodule.ClassMeow") == {}
+    assert "unparsed" in cls.__dict__
+
+    docs = attr_docs.namespace("target.ClassExample")
+    assert list(docs) == ["a", "b", "c", "ClassExample", "mymethod"]
+    assert docs["a"] == "a property"
+    assert ("target.ClassExample", "a") in attr_docs
+    assert ("target.ClassExample", "d") not in attr_docs
+    assert attr_docs.tag_number("ClassExample.c") == 2
+    assert attr_docs.tag_number("ClassExample.d") is None
+    assert attr_docs.tag_number("ClassExample") == 0
+
+    assert MatModuleAnalyzer.for_module("target").tagorder == {
+        "ClassExample": 0,
+        "ClassExample.a": 1,
+        "ClassExample.b": 2,
+        "ClassExample.c": 3,
+        "ClassExample.ClassExample": 4,
+        "ClassExample.mymethod": 5,
+    }
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        (b"function f\nend\n", "function_definition"),
+        (b"% header\n\n% more\nfunction f\nend\n", "function_definition"),
+        (b"% header\nclassdef A\nend\n", "class_definition"),
+        (b"x = 1;\n\nfunction y = f(x)\n  y = x;\nend\n", None),
+        (b"% only a comment\n", None),
+        (b"", None),
+    ],
+)
+def test_find_definition(code, expected):
+    definition = find_definition(parse_tree(code).root_node)
+    if expected is None:
+        assert definition is None
+    else:
+        assert definition.type == expected
+
+
+def test_match_classdef(dir_test_data):
+    # The same captures as running the query over the whole file.
+    def texts(match):
+        return {
+            key: [node.text for node in value]
+            if isinstance(value, list)
+            else value.text
+            for key, value in match.items()
+        }
+
+    classes = 0
+    for mfile in sorted(dir_test_data.rglob("*.m")):
+        root_node = parse_tree(mfile.read_bytes()).root_node
+        definition = find_definition(root_node)
+        if definition is None or definition.type != "class_definition":
+            continue
+        classes += 1
+        _, expected = q_classdef.matches(root_node)[0]
+        assert texts(match_classdef(definition)) == texts(expected), mfile
+    assert classes > 40
+
+
+def test_script_with_local_functions(tmp_path):
+    mfile = tmp_path / "script_with_local_function.m"
+    mfile.write_text(
+        "% Script docstring\nx = f(1);\n\nfunction y = f(x)\n  y = x;\nend\n"
+    )
+    obj = MatObject.parse_mfile(str(mfile), "script_with_local_function", "test_data")
+    assert isinstance(obj, MatScript)
+    assert obj.docstring == "Script docstring"
@@ -0,0 +1,71 @@
+"""Test parsing of MATLAB files with a pool of worker processes."""
+
+import pickle
+
+import pytest
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_types import MatClass, MatObject
+
+
+def describe(entity):
+    if isinstance(entity, dict):
+        return {role: describe(e) for role, e in entity.items()}
+    return (
+        type(entity).__name__,
+        entity.name,
+        getattr(entity, "module", None),
+        getattr(entity, "docstring", None),
+        list(getattr(entity, "methods", {})),
+        list(getattr(entity, "properties", {})),
+        [name for name, _ in getattr(entity, "entities", [])],
+    )
+
+
+def analyze_test_docs(make_app, rootdir, workers):
+    make_app(
+        srcdir=rootdir / "test_docs",
+        confoverrides={"matlab_parse_workers": workers},
+    )
+    return {name: describe(entity) for name, entity in mat_types.entities_table.items()}
+
+
+def test_parallel_parse_matches_serial(make_app, rootdir, monkeypatch):
+    monkeypatch.setattr(mat_types, "PARALLEL_PARSE_MIN_FILES", 0)
+
+    serial = analyze_test_docs(make_app, rootdir, 1)
+    parallel = analyze_test_docs(make_app, rootdir, 2)
+
+    assert list(parallel) == list(serial)
+    assert parallel == serial
+    assert not mat_types.preparsed_objects
+
+
+def test_find_source_files(dir_test_data):
+    files = mat_types.find_source_files(str(dir_test_data))
+    found = {(name, path) for _, name, path in files}
+
+    assert ("ClassExample", "") in found
+    assert ("Application", "") in found
+    assert ("ClassFolder", "@ClassFolder") in found
+    assert all(not filename.endswith(".txt") for filename, _, _ in files)
+
+
+def test_pickle_class(dir_test_data):
+    mfile = dir_test_data / "ClassExample.m"
+    obj = MatObject.parse_mfile(mfile, "ClassExample", "test_data")
+
+    copy = pickle.loads(pickle.dumps(obj))
+
+    assert isinstance(copy, MatClass)
+    assert copy.docstring == obj.docstring
+    assert copy.getter("__module__") == "test_data"
+    assert copy.methods["mymethod"].cls is copy
+
+
+@pytest.mark.parametrize("workers, expected", [(1, 1), (3, 3), (0, 1)])
+def test_parse_workers(workers, expected):
+    class Config:
+        matlab_parse_workers = workers
+
+    assert mat_types.parse_workers(Config) == expected
@@ -0,0 +1,72 @@
+"""Test reading documents in parallel, ``sphinx-build -j``."""
+
+import pickle
+import shutil
+
+import pytest
+
+from sphinxcontrib.mat_types import AnalysisState
+
+
+def build(make_app, rootdir, tmp_path, parallel):
+    srcdir = tmp_path / f"test_autodoc_{parallel}"
+    shutil.copytree(
+        rootdir / "roots" / "test_autodoc",
+        srcdir,
+        ignore=shutil.ignore_patterns("_build"),
+    )
+    app = make_app(
+        srcdir=srcdir, parallel=parallel, confoverrides={"matlab_auto_link": "all"}
+    )
+    app.builder.build_all()
+    doctrees = {
+        path.name: pickle.loads(path.read_bytes()).pformat().replace(str(srcdir), "")
+        for path in app.doctreedir.glob("*.doctree")
+    }
+    return app, doctrees
+
+
+def test_parallel_read_matches_serial(make_app, rootdir, tmp_path):
+    serial, serial_doctrees = build(make_app, rootdir, tmp_path, 0)
+    parallel, parallel_doctrees = build(make_app, rootdir, tmp_path, 2)
+
+    assert parallel.is_parallel_allowed("read")
+    assert parallel_doctrees == serial_doctrees
+    assert parallel.env.domaindata["mat"] == serial.env.domaindata["mat"]
+    assert parallel.env.matlab_analysis.keys() == {"key", "files"}
+
+
+def test_merge_domaindata(make_app, rootdir):
+    app = make_app(srcdir=rootdir / "roots" / "test_autodoc")
+    domain = app.env.domains["mat"]
+    domain.data["objects"] = {"first.f": ("first", "function")}
+    domain.data["modules"] = {}
+    other = {
+        "objects": {
+            "second.g": ("second", "function"),
+            "first.f": ("second", "function"),
+            "third.h": ("third", "function"),
+        },
+        "modules": {
+            "second": ("second", "", "", False),
+            "third": ("third", "", "", False),
+        },
+    }
+
+    domain.merge_domaindata({"second"}, other)
+    assert domain.data["objects"] == {
+        "first.f": ("second", "function"),
+        "second.g": ("second", "function"),
+    }
+    assert domain.data["modules"] == {"second": ("second", "", "", False)}
+    assert "duplicate object description of first.f" in app.warning.getvalue()
+
+
+@pytest.mark.parametrize("other_process", [False, True])
+def test_analysis_state_pickle(other_process):
+    state = AnalysisState(key=("basedir",), files={"a.m": None})
+    if other_process:
+        state.pid += 1
+    copy = pickle.loads(pickle.dumps(state))
+    assert isinstance(copy, AnalysisState)
+    assert copy == ({} if other_process else state)
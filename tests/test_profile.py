@@ -0,0 +1,91 @@
+"""Test the timing and counters report, ``matlab_profile``."""
+
+import json
+import pstats
+import shutil
+
+import pytest
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_auto_link import linked_docstrings
+from sphinxcontrib.mat_profile import REPORT_NAME, STATS_NAME, MatProfiler, profiler
+
+
+@pytest.fixture
+def autodoc_srcdir(rootdir, tmp_path):
+    srcdir = tmp_path / "test_autodoc"
+    shutil.copytree(
+        rootdir / "roots" / "test_autodoc",
+        srcdir,
+        ignore=shutil.ignore_patterns("_build"),
+    )
+    # Docstrings linked by other tests are still in memory.
+    linked_docstrings._entries.clear()
+    return srcdir
+
+
+def build(make_app, srcdir, **confoverrides):
+    app = make_app(srcdir=srcdir, confoverrides=confoverrides, freshenv=True)
+    # The report is written when the build is finished.
+    app.build(force_all=True)
+    return app
+
+
+def test_nested_phases_are_timed_once():
+    records = MatProfiler()
+    with records.phase("outer"):
+        pass
+    assert records.phases == {}
+
+    records.reset(True)
+    with records.phase("outer"), records.phase("inner"), records.phase("outer"):
+        records.count("things", 2)
+    records.count("things")
+    assert {name: calls for name, (calls, _) in records.phases.items()} == {
+        "inner": 1,
+        "outer": 1,
+    }
+    assert records.counters == {"things": 3}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_profile_report(make_app, autodoc_srcdir, monkeypatch, workers):
+    monkeypatch.setattr(mat_types, "PARALLEL_PARSE_MIN_FILES", 0)
+    app = build(
+        make_app,
+        autodoc_srcdir,
+        matlab_profile=True,
+        matlab_auto_link="all",
+        matlab_parse_workers=workers,
+    )
+    report = json.loads((app.outdir / REPORT_NAME).read_text(encoding="utf-8"))
+
+    assert {"analyze", "analyze.parse", "autodoc", "auto_link"} <= report[
+        "phases"
+    ].keys()
+    parsing = report["parsing"]
+    assert parsing["files"] == len(list(autodoc_srcdir.rglob("*.m")))
+    assert parsing["files_per_second"] > 0
+    assert len(parsing["slowest_files"]) == 10
+    seconds = [entry["seconds"] for entry in parsing["slowest_files"]]
+    assert seconds == sorted(seconds, reverse=True)
+    assert report["counters"]["auto_link.substitutions"] > 0
+    assert report["caches"]["auto_link"]["misses"] > 0
+    assert report["caches"]["environment"] == {"hits": 0, "misses": 10, "hit_rate": 0.0}
+    assert "[sphinxcontrib-matlabdomain] Profile: " in app.status.getvalue()
+    assert not (app.outdir / STATS_NAME).exists()
+
+
+def test_profile_cprofile(make_app, autodoc_srcdir):
+    app = build(make_app, autodoc_srcdir, matlab_profile="cprofile")
+    stats = pstats.Stats(str(app.outdir / STATS_NAME))
+    functions = {function for _, _, function in stats.stats}
+    assert "analyze" in functions
+    assert "generate" in functions
+
+
+def test_not_profiled_by_default(make_app, autodoc_srcdir):
+    app = build(make_app, autodoc_srcdir)
+    assert not profiler.enabled
+    assert profiler.phases == {}
+    assert not (app.outdir / REPORT_NAME).exists()
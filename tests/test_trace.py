@@ -0,0 +1,73 @@
+"""Test the debug messages and trace events of the analysis, ``matlab_trace``."""
+
+import json
+import shutil
+
+import pytest
+
+from sphinxcontrib import mat_types
+from sphinxcontrib.mat_trace import MatTracer, tracer
+
+
+@pytest.fixture
+def srcdir(rootdir, tmp_path):
+    srcdir = tmp_path / "test_autodoc"
+    shutil.copytree(
+        rootdir / "roots" / "test_autodoc",
+        srcdir,
+        ignore=shutil.ignore_patterns("_build"),
+    )
+    return srcdir
+
+
+def read_events(path):
+    with open(path, encoding="utf-8") as trace:
+        return [json.loads(line) for line in trace]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_trace_file(make_app, srcdir, tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(mat_types, "PARALLEL_PARSE_MIN_FILES", 0)
+    path = tmp_path / "trace" / "events.jsonl"
+    app = make_app(
+        srcdir=srcdir,
+        confoverrides={"matlab_trace": str(path), "matlab_parse_workers": workers},
+        freshenv=True,
+    )
+    assert tracer.enabled
+    assert not tracer.debug
+    app.build()
+    assert not tracer.enabled
+
+    events = read_events(path)
+    names = {event["event"] for event in events}
+    assert {"analyze", "matlabify", "module", "getmembers", "entity"} <= names
+    assert all(event["time"] >= 0 for event in events)
+    analyzed = next(event for event in events if event["event"] == "analyze")
+    assert analyzed["files"] > 0
+    parsed = {
+        event["filename"]
+        for event in events
+        if event["event"] in ("parse", "preparsed")
+    }
+    assert any(filename.endswith("ClassExample.m") for filename in parsed)
+    if workers > 1:
+        assert "preparse" in names
+
+
+def test_no_events_by_default(make_app, srcdir, monkeypatch):
+    def event(self, event, /, **fields):
+        raise AssertionError(f"unexpected event {event}")
+
+    monkeypatch.setattr(MatTracer, "event", event)
+    app = make_app(srcdir=srcdir, freshenv=True)
+    assert not tracer.enabled
+    app.build()
+
+
+def test_debug_messages(make_app, srcdir):
+    app = make_app(srcdir=srcdir, freshenv=True, verbosity=2)
+    assert tracer.enabled
+    assert tracer.debug
+    assert tracer.file is None
+    assert "[sphinxcontrib-matlabdomain] matlabify: " in app.status.getvalue()